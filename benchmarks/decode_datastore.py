@@ -0,0 +1,64 @@
+
+#   Copyright (c) 2022 Asif Arman Rahman
+#   Licensed under MIT (https://github.com/AsifArmanRahman/firebase/blob/main/LICENSE)
+
+# --------------------------------------------------------------------------------------
+
+
+"""
+Micro-benchmark of decoding Firestore documents, as returned by
+``runQuery`` and ``batchGet``, to native Python values.
+
+Run from the root of the repository, with the package installed::
+
+	python benchmarks/decode_datastore.py [documents] [repeat]
+"""
+
+import sys
+import timeit
+
+from firebase.firestore._utils import _from_datastore
+
+
+def make_document(i):
+	""" A document mixing every common value type, zero values and
+	nested maps and arrays.
+	"""
+
+	return {
+		'fields': {
+			'name': {'stringValue': 'Movie {0}'.format(i)},
+			'year': {'integerValue': str(2008 + i % 15)},
+			'rating': {'doubleValue': 7.5},
+			'views': {'integerValue': '0'},
+			'score': {'doubleValue': 0.0},
+			'released': {'booleanValue': i % 2 == 0},
+			'prequel': {'nullValue': None},
+			'poster': {'bytesValue': 'SmFydmlz'},
+			'premiere': {'timestampValue': '2008-04-14T19:00:00.000000Z'},
+			'location': {'geoPointValue': {'latitude': 34.1, 'longitude': -118.3}},
+			'lead': {'mapValue': {'fields': {
+				'name': {'stringValue': 'Robert Downey Jr.'},
+				'awards': {'integerValue': '3'},
+			}}},
+			'cast': {'arrayValue': {'values': [
+				{'stringValue': 'Gwyneth Paltrow'},
+				{'stringValue': 'Jeff Bridges'},
+				{'mapValue': {'fields': {'name': {'stringValue': 'Terrence Howard'}}}},
+			]}},
+			'producers': {'arrayValue': {}},
+		}
+	}
+
+
+def main(count=10000, repeat=5):
+	documents = [make_document(i) for i in range(count)]
+
+	timer = timeit.Timer(lambda: [_from_datastore(document) for document in documents])
+	best = min(timer.repeat(repeat=repeat, number=1))
+
+	print("decoded {0} documents in {1:.1f} ms, {2:.0f} documents/s".format(count, best * 1000, count / best))
+
+
+if __name__ == '__main__':
+	main(*[int(arg) for arg in sys.argv[1:3]])
@@ -12,8 +12,9 @@
 
 from .auth import Auth
 from .storage import Storage
-from .database import Database
+from .database import Database, AsyncDatabase
 from .firestore import Firestore
+from ._json_codec import get_json_codec
 from ._custom_requests import _custom_request
 from ._service_account_credentials import _service_account_creds_from_secret
 
@@ -48,7 +49,8 @@ class Firebase:
 		self.storage_bucket = config["storageBucket"]
 
 		self.credentials = None
-		self.requests = _custom_request()
+		self.requests = _custom_request(pool_size=config.get("poolSize", 10))
+		self.codec = get_json_codec(config.get("jsonCodec"))
 
 		if config.get("serviceAccount"):
 			self.credentials = _service_account_creds_from_secret(config['serviceAccount'])
@@ -67,17 +69,30 @@ class Firebase:
 		:rtype: Auth
 		"""
 
-		return Auth(self.api_key, self.credentials, self.requests, client_secret=client_secret)
+		return Auth(self.api_key, self.credentials, self.requests, client_secret=client_secret, codec=self.codec)
 
-	def database(self):
+	def database(self, is_async=False, silent_writes=False):
 		"""Initializes and returns a new Firebase Realtime Database
 		instance.
 
+		:type is_async: bool
+		:param is_async: (Optional) Whether to return an instance whose
+			requests are awaitable, defaults to :data:`False`.
+
+		:type silent_writes: bool
+		:param silent_writes: (Optional) Whether the server skips
+			sending the written data back to writes, unless a call
+			asks otherwise, defaults to :data:`False`.
+
+
 		:return: A newly initialized instance of Database.
-		:rtype: Database
+		:rtype: Database or AsyncDatabase
 		"""
 
-		return Database(self.credentials, self.database_url, self.requests)
+		if is_async:
+			return AsyncDatabase(self.credentials, self.database_url, self.requests, self.codec, silent_writes=silent_writes)
+
+		return Database(self.credentials, self.database_url, self.requests, self.codec, silent_writes=silent_writes)
 
 	def firestore(self):
 		"""Initializes and returns a new Firebase Cloud Firestore
@@ -87,7 +102,7 @@ class Firebase:
 		:rtype: Firestore
 		"""
 
-		return Firestore(self.api_key, self.credentials, self.project_id, self.requests)
+		return Firestore(self.api_key, self.credentials, self.project_id, self.requests, self.codec)
 
 	def storage(self):
 		"""Initializes and returns a new Firebase Storage instance.
@@ -9,7 +9,7 @@ from requests import Session
 from requests import adapters
 
 
-def _custom_request(max_retries=None):
+def _custom_request(max_retries=None, pool_size=adapters.DEFAULT_POOLSIZE):
 	""" Custom Session with N retries.
 
 	Incase a request was not completed successfully due to minor
@@ -20,14 +20,20 @@ def _custom_request(max_retries=None):
 	if no value is sent through the function,
 	`max_retries` is set to 3.
 
+	Connections are kept alive and reused, up to `pool_size`
+	connections for each host, which should be at least the number of
+	threads sending requests concurrently through the session.
+
 	:param max_retries: number of retries.
 	:type max_retries: int | None
+	:param pool_size: number of connections kept for each host.
+	:type pool_size: int
 	:return: custom session
 	:rtype: Session
 	"""
 
 	session = Session()
-	adapter = adapters.HTTPAdapter(max_retries=max_retries)
+	adapter = adapters.HTTPAdapter(max_retries=max_retries, pool_maxsize=pool_size)
 
 	for scheme in ('http://', 'https://'):
 		session.mount(scheme, adapter)
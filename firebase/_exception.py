@@ -15,3 +15,33 @@ def raise_detailed_error(request_object):
 		# raise detailed error message
 		# TODO: Check if we get a { "error" : "Permission denied." } and handle automatically
 		raise HTTPError(e, request_object.text)
+
+
+def raise_detailed_async_error(response_object):
+	if response_object.is_error:
+		try:
+			response_object.raise_for_status()
+		except Exception as e:
+			# raise detailed error message, same as the synchronous requests
+			raise HTTPError(e, response_object.text)
+
+
+class TransactionAbortedError(Exception):
+	""" Raised when a transaction wasn't committed, as the data kept
+	changing through all of its attempts.
+
+
+	:type path: str
+	:param path: Path the transaction was run on.
+
+	:type attempts: int
+	:param attempts: Number of attempts made.
+	"""
+
+	def __init__(self, path, attempts):
+		""" Constructor """
+
+		super(TransactionAbortedError, self).__init__("Transaction at '{0}' aborted after {1} attempts, the data kept changing".format(path, attempts))
+
+		self.path = path
+		self.attempts = attempts
@@ -0,0 +1,186 @@
+#   Copyright (c) 2022 Asif Arman Rahman
+#   Licensed under MIT (https://github.com/AsifArmanRahman/firebase/blob/main/LICENSE)
+
+# --------------------------------------------------------------------------------------
+
+
+import json
+
+
+class JSONCodec:
+	""" Serializer and deserializer of request and response bodies,
+	backed by the standard :mod:`json` module.
+	"""
+
+	name = 'json'
+
+	def dumps(self, obj, **json_kwargs):
+		""" Serialize ``obj`` to a UTF-8 encoded JSON document.
+
+
+		:type obj: dict or list or bool or int or float or str
+		:param obj: Data to be serialized.
+
+		:type json_kwargs: dict
+		:param json_kwargs: Keyword arguments to send to
+			:func:`json.dumps` method for serialization of data.
+
+
+		:return: Encoded JSON document.
+		:rtype: bytes
+		"""
+
+		return json.dumps(obj, **json_kwargs).encode("utf-8")
+
+	def loads(self, data, **json_kwargs):
+		""" Deserialize a JSON document.
+
+
+		:type data: bytes or str
+		:param data: JSON document to be deserialized.
+
+		:type json_kwargs: dict
+		:param json_kwargs: Keyword arguments to send to
+			:func:`json.loads` method for deserialization of data.
+
+
+		:return: Decoded data.
+		:rtype: dict or list or bool or int or float or str
+		"""
+
+		return json.loads(data, **json_kwargs)
+
+
+class _OrjsonCodec(JSONCodec):
+	""" Codec backed by :mod:`orjson`, calls with ``json_kwargs`` are
+	left to the standard :mod:`json` module.
+	"""
+
+	name = 'orjson'
+
+	def __init__(self):
+		import orjson
+
+		self._orjson = orjson
+
+	def dumps(self, obj, **json_kwargs):
+		if not json_kwargs:
+			try:
+				return self._orjson.dumps(obj, option=self._orjson.OPT_NON_STR_KEYS)
+
+			# types orjson can't serialize, such as integers beyond 64 bits
+			except TypeError:
+				pass
+
+		return super().dumps(obj, **json_kwargs)
+
+	def loads(self, data, **json_kwargs):
+		if json_kwargs:
+			return super().loads(data, **json_kwargs)
+
+		return self._orjson.loads(data)
+
+
+class _UjsonCodec(JSONCodec):
+	""" Codec backed by :mod:`ujson`, calls with ``json_kwargs`` are
+	left to the standard :mod:`json` module.
+	"""
+
+	name = 'ujson'
+
+	def __init__(self):
+		import ujson
+
+		self._ujson = ujson
+
+	def dumps(self, obj, **json_kwargs):
+		if not json_kwargs:
+			try:
+				return self._ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+
+			except (TypeError, OverflowError):
+				pass
+
+		return super().dumps(obj, **json_kwargs)
+
+	def loads(self, data, **json_kwargs):
+		if json_kwargs:
+			return super().loads(data, **json_kwargs)
+
+		return self._ujson.loads(data)
+
+
+class _CustomCodec(JSONCodec):
+	""" Codec backed by any object with ``dumps`` and ``loads``
+	functions, ``json_kwargs`` are passed on to them as they are.
+	"""
+
+	name = 'custom'
+
+	def __init__(self, codec):
+		self._codec = codec
+
+	def dumps(self, obj, **json_kwargs):
+		data = self._codec.dumps(obj, **json_kwargs)
+
+		if isinstance(data, str):
+			data = data.encode("utf-8")
+
+		return data
+
+	def loads(self, data, **json_kwargs):
+		return self._codec.loads(data, **json_kwargs)
+
+
+_CODECS = {
+	'json': JSONCodec,
+	'orjson': _OrjsonCodec,
+	'ujson': _UjsonCodec,
+}
+
+
+def get_json_codec(codec=None):
+	""" Returns the codec selected by the ``jsonCodec`` key of Firebase
+	configuration.
+
+
+	:type codec: str or object
+	:param codec: (Optional) Either ``'json'``, ``'orjson'``,
+		``'ujson'``, ``'auto'`` (the fastest one installed), a
+		:class:`JSONCodec`, or any object with ``dumps`` and ``loads``
+		functions, defaults to :data:`None` (``'json'``).
+
+
+	:return: The selected codec.
+	:rtype: JSONCodec
+
+	:raises ImportError: Raised when the selected library is not
+		installed.
+	:raises ValueError: Raised when the codec is not supported.
+	"""
+
+	if codec is None:
+		return JSONCodec()
+
+	if isinstance(codec, JSONCodec):
+		return codec
+
+	if codec == 'auto':
+		for name in ('orjson', 'ujson'):
+			try:
+				return _CODECS[name]()
+			except ImportError:
+				pass
+
+		return JSONCodec()
+
+	if isinstance(codec, str):
+		if codec not in _CODECS:
+			raise ValueError("Unsupported JSON codec '{0}', use one of: {1}, auto".format(codec, ", ".join(_CODECS)))
+
+		return _CODECS[codec]()
+
+	if callable(getattr(codec, 'dumps', None)) and callable(getattr(codec, 'loads', None)):
+		return _CustomCodec(codec)
+
+	raise ValueError("JSON codec must be a name, or an object with dumps and loads functions")
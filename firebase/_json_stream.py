@@ -0,0 +1,300 @@
+#   Copyright (c) 2022 Asif Arman Rahman
+#   Licensed under MIT (https://github.com/AsifArmanRahman/firebase/blob/main/LICENSE)
+
+# --------------------------------------------------------------------------------------
+
+
+import json
+import codecs
+
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER = '0123456789+-.eE'
+
+_START = 0
+_OBJECT_FIRST = 1
+_OBJECT_KEY = 2
+_OBJECT_COLON = 3
+_OBJECT_VALUE = 4
+_OBJECT_NEXT = 5
+_ARRAY_FIRST = 6
+_ARRAY_VALUE = 7
+_ARRAY_NEXT = 8
+_END = 9
+
+_MISSING = object()
+
+
+class JSONItemsParser:
+	""" Incremental parser for the children of a top-level JSON object
+	or array.
+
+	Chunks of the encoded document are fed as they arrive, and each
+	``(key, value)`` member of an object, or ``(index, value)`` element
+	of an array, is returned as soon as it is complete. Only the child
+	being parsed is kept in memory, and each child is decoded by
+	:meth:`json.JSONDecoder.raw_decode`. A top-level primitive has no
+	children, so nothing is returned for it.
+
+
+	:type json_kwargs: dict
+	:param json_kwargs: Keyword arguments to send to
+		:class:`json.JSONDecoder` for deserialization of data.
+	"""
+
+	def __init__(self, **json_kwargs):
+		""" Constructor """
+
+		self._decoder = json.JSONDecoder(**json_kwargs)
+		self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+
+		self._buf = ''
+		self._pos = 0
+
+		self._pending = []
+		self._pending_size = 0
+
+		# characters to wait for before trying to decode again
+		self._need = 0
+
+		self._state = _START
+		self._key = None
+		self._index = 0
+		self._eof = False
+
+	def feed(self, chunk):
+		""" Parse the next chunk of the document.
+
+
+		:type chunk: bytes
+		:param chunk: Next chunk of the encoded document.
+
+
+		:return: The children completed by this chunk.
+		:rtype: list
+		"""
+
+		text = self._text_decoder.decode(chunk)
+
+		if text:
+			self._pending.append(text)
+			self._pending_size += len(text)
+
+		if len(self._buf) - self._pos + self._pending_size < self._need:
+			return []
+
+		return list(self._parse())
+
+	def close(self):
+		""" Parse the end of the document.
+
+
+		:return: The children completed at the end of the document.
+		:rtype: list
+
+		:raises ValueError: Raised when the document is incomplete or
+			malformed.
+		"""
+
+		text = self._text_decoder.decode(b'', final=True)
+
+		if text:
+			self._pending.append(text)
+			self._pending_size += len(text)
+
+		self._eof = True
+
+		items = list(self._parse())
+
+		if self._state != _END:
+			raise json.JSONDecodeError("Unexpected end of document", self._buf, len(self._buf))
+
+		return items
+
+	def _parse(self):
+		if self._pending:
+			self._buf = self._buf[self._pos:] + ''.join(self._pending)
+			self._pos = 0
+
+			self._pending = []
+			self._pending_size = 0
+
+		while True:
+			char = self._skip_whitespace()
+
+			if char is None and self._state != _OBJECT_KEY and self._state != _OBJECT_VALUE and self._state != _ARRAY_VALUE:
+				return
+
+			if self._state == _START:
+				if char == '{':
+					self._pos += 1
+					self._state = _OBJECT_FIRST
+
+				elif char == '[':
+					self._pos += 1
+					self._state = _ARRAY_FIRST
+
+				else:
+					if self._decode() is _MISSING:
+						return
+
+					self._state = _END
+
+			elif self._state == _OBJECT_FIRST:
+				if char == '}':
+					self._pos += 1
+					self._state = _END
+
+				else:
+					self._state = _OBJECT_KEY
+
+			elif self._state == _OBJECT_KEY:
+				key = self._decode()
+
+				if key is _MISSING:
+					return
+
+				if not isinstance(key, str):
+					raise json.JSONDecodeError("Expecting property name enclosed in double quotes", self._buf, self._pos)
+
+				self._key = key
+				self._state = _OBJECT_COLON
+
+			elif self._state == _OBJECT_COLON:
+				self._expect(char, ':')
+				self._state = _OBJECT_VALUE
+
+			elif self._state == _OBJECT_VALUE:
+				value = self._decode()
+
+				if value is _MISSING:
+					return
+
+				yield self._key, value
+
+				self._key = None
+				self._state = _OBJECT_NEXT
+
+			elif self._state == _OBJECT_NEXT:
+				if char == '}':
+					self._pos += 1
+					self._state = _END
+
+				else:
+					self._expect(char, ',')
+					self._state = _OBJECT_KEY
+
+			elif self._state == _ARRAY_FIRST:
+				if char == ']':
+					self._pos += 1
+					self._state = _END
+
+				else:
+					self._state = _ARRAY_VALUE
+
+			elif self._state == _ARRAY_VALUE:
+				value = self._decode()
+
+				if value is _MISSING:
+					return
+
+				yield self._index, value
+
+				self._index += 1
+				self._state = _ARRAY_NEXT
+
+			elif self._state == _ARRAY_NEXT:
+				if char == ']':
+					self._pos += 1
+					self._state = _END
+
+				else:
+					self._expect(char, ',')
+					self._state = _ARRAY_VALUE
+
+			else:
+				raise json.JSONDecodeError("Extra data", self._buf, self._pos)
+
+	def _skip_whitespace(self):
+		buf = self._buf
+		pos = self._pos
+		end = len(buf)
+
+		while pos < end and buf[pos] in _WHITESPACE:
+			pos += 1
+
+		self._pos = pos
+
+		if pos < end:
+			return buf[pos]
+
+		return None
+
+	def _expect(self, char, expected):
+		if char != expected:
+			raise json.JSONDecodeError("Expecting '{0}' delimiter".format(expected), self._buf, self._pos)
+
+		self._pos += 1
+
+	def _decode(self):
+		""" Decode the value starting at the current position, or
+		return ``_MISSING`` if it isn't complete yet.
+		"""
+
+		remaining = len(self._buf) - self._pos
+
+		if not remaining:
+			if self._eof:
+				raise json.JSONDecodeError("Expecting value", self._buf, self._pos)
+
+			return _MISSING
+
+		try:
+			value, end = self._decoder.raw_decode(self._buf, self._pos)
+
+		except json.JSONDecodeError:
+			if self._eof:
+				raise
+
+			# wait for the buffer to double, so a large value is
+			# decoded only a logarithmic number of times
+			self._need = 2 * remaining
+			return _MISSING
+
+		# a number at the end of the buffer may continue in next chunk
+		if not self._eof and self._buf[self._pos] in '-0123456789' and (end == len(self._buf) or self._buf[end] in _NUMBER):
+			self._need = remaining + 1
+			return _MISSING
+
+		self._pos = end
+		self._need = 0
+
+		return value
+
+
+def iter_json_items(chunks, **json_kwargs):
+	""" Iterate over the children of a JSON document received in
+	chunks, see :class:`JSONItemsParser`.
+
+
+	:type chunks: iterable
+	:param chunks: Chunks of bytes of the encoded document.
+
+	:type json_kwargs: dict
+	:param json_kwargs: Keyword arguments to send to
+		:class:`json.JSONDecoder` for deserialization of data.
+
+
+	:return: ``(key, value)`` of each member of a top-level object, or
+		``(index, value)`` of each element of a top-level array.
+	:rtype: generator
+	"""
+
+	parser = JSONItemsParser(**json_kwargs)
+
+	for chunk in chunks:
+		for item in parser.feed(chunk):
+			yield item
+
+	for item in parser.close():
+		yield item
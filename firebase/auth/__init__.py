@@ -24,6 +24,7 @@ from urllib.parse import parse_qs
 from google.auth.transport.requests import Request
 from cryptography.hazmat.primitives.serialization import Encoding, NoEncryption, PrivateFormat
 
+from firebase._json_codec import JSONCodec
 from firebase._exception import raise_detailed_error
 
 
@@ -43,14 +44,19 @@ class Auth:
 	:param client_secret: (Optional) File path to or the dict object
 		from social client secret file, defaults to :data:`None`.
 
+	:type codec: :class:`~firebase._json_codec.JSONCodec`
+	:param codec: (Optional) Serializer of request and response
+		bodies, defaults to :data:`None` (standard :mod:`json`).
+
 	"""
 
-	def __init__(self, api_key, credentials, requests, client_secret=None):
+	def __init__(self, api_key, credentials, requests, client_secret=None, codec=None):
 		""" Constructor method """
 
 		self.api_key = api_key
 		self.credentials = credentials
 		self.requests = requests
+		self.codec = codec or JSONCodec()
 
 		self.provider_id = None
 		self.session_id = None
@@ -123,14 +129,16 @@ class Auth:
 			data['customParameter'] = {"code_challenge": code_challenge, "code_challenge_method": 'S256', "nonce": sha256(self.__nonce.encode('utf')).hexdigest()}
 
 		headers = {"content-type": "application/json; charset=UTF-8"}
-		request_object = self.requests.post(request_ref, headers=headers, json=data)
+		request_object = self.requests.post(request_ref, headers=headers, data=self.codec.dumps(data))
 
 		raise_detailed_error(request_object)
 
+		request_object_json = self.codec.loads(request_object.content)
+
 		self.provider_id = provider_id
-		self.session_id = request_object.json()['sessionId']
+		self.session_id = request_object_json['sessionId']
 
-		return request_object.json()['authUri']
+		return request_object_json['authUri']
 
 	def sign_in_with_email_and_password(self, email, password):
 		""" Sign in a user with an email and password.
@@ -153,12 +161,12 @@ class Auth:
 		request_ref = "https://www.googleapis.com/identitytoolkit/v3/relyingparty/verifyPassword?key={0}".format(self.api_key)
 
 		headers = {"content-type": "application/json; charset=UTF-8"}
-		data = json.dumps({"email": email, "password": password, "returnSecureToken": True})
+		data = self.codec.dumps({"email": email, "password": password, "returnSecureToken": True})
 		request_object = self.requests.post(request_ref, headers=headers, data=data)
 
 		raise_detailed_error(request_object)
 
-		return _token_expire_time(request_object.json())
+		return _token_expire_time(self.codec.loads(request_object.content))
 
 	def sign_in_anonymous(self):
 		""" Sign In Anonymously.
@@ -175,12 +183,12 @@ class Auth:
 		request_ref = "https://www.googleapis.com/identitytoolkit/v3/relyingparty/signupNewUser?key={0}".format(self.api_key)
 
 		headers = {"content-type": "application/json; charset=UTF-8"}
-		data = json.dumps({"returnSecureToken": True})
+		data = self.codec.dumps({"returnSecureToken": True})
 		request_object = self.requests.post(request_ref, headers=headers, data=data)
 
 		raise_detailed_error(request_object)
 
-		return _token_expire_time(request_object.json())
+		return _token_expire_time(self.codec.loads(request_object.content))
 
 	def create_custom_token(self, uid, additional_claims=None, expiry_minutes=60):
 		""" Create a Firebase Auth custom token.
@@ -244,12 +252,12 @@ class Auth:
 		request_ref = "https://www.googleapis.com/identitytoolkit/v3/relyingparty/verifyCustomToken?key={0}".format(self.api_key)  # noqa
 
 		headers = {"content-type": "application/json; charset=UTF-8"}
-		data = json.dumps({"returnSecureToken": True, "token": token})
+		data = self.codec.dumps({"returnSecureToken": True, "token": token})
 		request_object = self.requests.post(request_ref, headers=headers, data=data)
 
 		raise_detailed_error(request_object)
 
-		return _token_expire_time(request_object.json())
+		return _token_expire_time(self.codec.loads(request_object.content))
 
 	def refresh(self, refresh_token):
 		""" Refresh a Firebase ID token.
@@ -269,11 +277,11 @@ class Auth:
 		request_ref = "https://securetoken.googleapis.com/v1/token?key={0}".format(self.api_key)
 
 		headers = {"content-type": "application/json; charset=UTF-8"}
-		data = json.dumps({"grantType": "refresh_token", "refreshToken": refresh_token})
+		data = self.codec.dumps({"grantType": "refresh_token", "refreshToken": refresh_token})
 		request_object = self.requests.post(request_ref, headers=headers, data=data)
 
 		raise_detailed_error(request_object)
-		request_object_json = request_object.json()
+		request_object_json = self.codec.loads(request_object.content)
 
 		# handle weirdly formatted response
 		user = {
@@ -304,12 +312,12 @@ class Auth:
 		request_ref = "https://www.googleapis.com/identitytoolkit/v3/relyingparty/getAccountInfo?key={0}".format(self.api_key)
 
 		headers = {"content-type": "application/json; charset=UTF-8"}
-		data = json.dumps({"idToken": id_token})
+		data = self.codec.dumps({"idToken": id_token})
 		request_object = self.requests.post(request_ref, headers=headers, data=data)
 
 		raise_detailed_error(request_object)
 
-		return request_object.json()
+		return self.codec.loads(request_object.content)
 
 	def send_email_verification(self, id_token):
 		""" Send an email verification to verify email ownership.
@@ -330,12 +338,12 @@ class Auth:
 		request_ref = "https://www.googleapis.com/identitytoolkit/v3/relyingparty/getOobConfirmationCode?key={0}".format(self.api_key)
 
 		headers = {"content-type": "application/json; charset=UTF-8"}
-		data = json.dumps({"requestType": "VERIFY_EMAIL", "idToken": id_token})
+		data = self.codec.dumps({"requestType": "VERIFY_EMAIL", "idToken": id_token})
 		request_object = self.requests.post(request_ref, headers=headers, data=data)
 
 		raise_detailed_error(request_object)
 
-		return request_object.json()
+		return self.codec.loads(request_object.content)
 
 	def send_password_reset_email(self, email):
 		""" Send a password reset email.
@@ -355,12 +363,12 @@ class Auth:
 		request_ref = "https://www.googleapis.com/identitytoolkit/v3/relyingparty/getOobConfirmationCode?key={0}".format(self.api_key)
 
 		headers = {"content-type": "application/json; charset=UTF-8"}
-		data = json.dumps({"requestType": "PASSWORD_RESET", "email": email})
+		data = self.codec.dumps({"requestType": "PASSWORD_RESET", "email": email})
 		request_object = self.requests.post(request_ref, headers=headers, data=data)
 
 		raise_detailed_error(request_object)
 
-		return request_object.json()
+		return self.codec.loads(request_object.content)
 
 	def verify_password_reset_code(self, reset_code, new_password):
 		""" Reset password using code.
@@ -384,12 +392,12 @@ class Auth:
 		request_ref = "https://www.googleapis.com/identitytoolkit/v3/relyingparty/resetPassword?key={0}".format(self.api_key)
 
 		headers = {"content-type": "application/json; charset=UTF-8"}
-		data = json.dumps({"oobCode": reset_code, "newPassword": new_password})
+		data = self.codec.dumps({"oobCode": reset_code, "newPassword": new_password})
 		request_object = self.requests.post(request_ref, headers=headers, data=data)
 
 		raise_detailed_error(request_object)
 
-		return request_object.json()
+		return self.codec.loads(request_object.content)
 
 	def create_user_with_email_and_password(self, email, password):
 		""" Create a new user with email and password.
@@ -412,12 +420,12 @@ class Auth:
 		request_ref = "https://www.googleapis.com/identitytoolkit/v3/relyingparty/signupNewUser?key={0}".format(self.api_key)
 
 		headers = {"content-type": "application/json; charset=UTF-8"}
-		data = json.dumps({"email": email, "password": password, "returnSecureToken": True})
+		data = self.codec.dumps({"email": email, "password": password, "returnSecureToken": True})
 		request_object = self.requests.post(request_ref, headers=headers, data=data)
 
 		raise_detailed_error(request_object)
 
-		return request_object.json()
+		return self.codec.loads(request_object.content)
 
 	def delete_user_account(self, id_token):
 		""" Delete an existing user.
@@ -435,12 +443,12 @@ class Auth:
 		request_ref = "https://www.googleapis.com/identitytoolkit/v3/relyingparty/deleteAccount?key={0}".format(self.api_key)
 
 		headers = {"content-type": "application/json; charset=UTF-8"}
-		data = json.dumps({"idToken": id_token})
+		data = self.codec.dumps({"idToken": id_token})
 		request_object = self.requests.post(request_ref, headers=headers, data=data)
 
 		raise_detailed_error(request_object)
 
-		return request_object.json()
+		return self.codec.loads(request_object.content)
 
 	def sign_in_with_oauth_credential(self, oauth2callback_url):
 		""" Sign In With OAuth credential.
@@ -477,11 +485,11 @@ class Auth:
 		}
 
 		headers = {"content-type": "application/json; charset=UTF-8"}
-		request_object = self.requests.post(request_ref, headers=headers, json=data)
+		request_object = self.requests.post(request_ref, headers=headers, data=self.codec.dumps(data))
 
 		raise_detailed_error(request_object)
 
-		return _token_expire_time(request_object.json())
+		return _token_expire_time(self.codec.loads(request_object.content))
 
 	def _token_from_auth_url(self, url):
 		""" Fetch tokens using the authorization code from given URL.
@@ -519,7 +527,7 @@ class Auth:
 
 		return {
 			'type': 'id_token',
-			'value': request_object.json()['id_token'],
+			'value': self.codec.loads(request_object.content)['id_token'],
 		}
 	
 	def change_email(self, id_token, email):
@@ -543,12 +551,12 @@ class Auth:
 		request_ref = "https://www.googleapis.com/identitytoolkit/v3/relyingparty/setAccountInfo?key={0}".format(self.api_key)
 
 		headers = {"content-type": "application/json; charset=UTF-8"}
-		data = json.dumps({"idToken": id_token, "email": email, "returnSecureToken": True})
+		data = self.codec.dumps({"idToken": id_token, "email": email, "returnSecureToken": True})
 		request_object = self.requests.post(request_ref, headers=headers, data=data)
 
 		raise_detailed_error(request_object)
 
-		return request_object.json()
+		return self.codec.loads(request_object.content)
 	
 	def change_password(self, id_token, password):
 		""" Changes a user's password
@@ -571,12 +579,12 @@ class Auth:
 		request_ref = "https://www.googleapis.com/identitytoolkit/v3/relyingparty/setAccountInfo?key={0}".format(self.api_key)
 
 		headers = {"content-type": "application/json; charset=UTF-8"}
-		data = json.dumps({"idToken": id_token, "password": password, "returnSecureToken": True})
+		data = self.codec.dumps({"idToken": id_token, "password": password, "returnSecureToken": True})
 		request_object = self.requests.post(request_ref, headers=headers, data=data)
 
 		raise_detailed_error(request_object)
 
-		return request_object.json()
+		return self.codec.loads(request_object.content)
 
 	def update_profile(self, id_token, display_name=None, photo_url=None, delete_attribute=None):
 		""" Update a user's profile (display name / photo URL).
@@ -607,12 +615,12 @@ class Auth:
 		request_ref = "https://www.googleapis.com/identitytoolkit/v3/relyingparty/setAccountInfo?key={0}".format(self.api_key)
 
 		headers = {"content-type": "application/json; charset=UTF-8"}
-		data = json.dumps({"idToken": id_token, "displayName": display_name, "photoURL": photo_url, "deleteAttribute": delete_attribute, "returnSecureToken": True})
+		data = self.codec.dumps({"idToken": id_token, "displayName": display_name, "photoURL": photo_url, "deleteAttribute": delete_attribute, "returnSecureToken": True})
 		request_object = self.requests.post(request_ref, headers=headers, data=data)
 
 		raise_detailed_error(request_object)
 
-		return request_object.json()
+		return self.codec.loads(request_object.content)
 
 	def set_custom_user_claims(self, user_id, custom_claims):
 		""" Add or remove custom claims from/to an existing user.
@@ -638,7 +646,7 @@ class Auth:
 
 		headers = {"Authorization": "Bearer " + access_token, "content-type": "application/json; charset=UTF-8"}
 
-		data = json.dumps({"localId": user_id, "customAttributes":json.dumps(custom_claims), "returnSecureToken": False})
+		data = self.codec.dumps({"localId": user_id, "customAttributes":json.dumps(custom_claims), "returnSecureToken": False})
 		request_object = self.requests.post(request_ref, headers=headers, data=data)
 
 		raise_detailed_error(request_object)
@@ -662,7 +670,7 @@ class Auth:
 
 		response = self.requests.get('https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com')
 
-		pub_pem = response.json()[header['kid']]
+		pub_pem = self.codec.loads(response.content)[header['kid']]
 
 		pub_key = JWK.from_pem(bytes(pub_pem.encode('utf-8')))
 		_, claims = jwt.verify_jwt(id_token, pub_key, [header['alg']], checks_optional=True)
@@ -1,4 +1,3 @@
-
 #   Copyright (c) 2022 Asif Arman Rahman
 #   Licensed under MIT (https://github.com/AsifArmanRahman/firebase/blob/main/LICENSE)
 
@@ -8,53 +7,94 @@
 """
 A simple python wrapper for Google's `Firebase Database REST API`_
 
-.. _Firebase Database REST API: 
+.. _Firebase Database REST API:
 	https://firebase.google.com/docs/reference/rest/database
 """
 
-import math
-import json
-import time
-from random import randrange
+import asyncio
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlencode
-from google.auth.transport.requests import Request
+from requests.exceptions import RequestException
 
 from ._stream import Stream
+from ._stream_manager import StreamManager
+from ._batch import WriteBatch
+from ._backoff import ReconnectBackoff
+from ._mirror import Mirror
+from ._push_id import PushIdGenerator, decode_timestamp
+from ._server_values import server_timestamp, increment
+from ._cache import ReadCache
+from ._token_cache import TokenCache
+from ._transaction import TransactionStats
+from ._ordering import sort_items
 from ._db_convert import FirebaseResponse
-from firebase._exception import raise_detailed_error
-from ._db_convert import convert_to_firebase, convert_list_to_firebase
+from ._db_convert import build_firebase_response, convert_to_firebase
+from firebase._json_codec import JSONCodec
+from firebase._exception import raise_detailed_error, raise_detailed_async_error, TransactionAbortedError
+from firebase._json_stream import JSONItemsParser, iter_json_items
 
 
-class Database:
-	""" Firebase Database Service
+class Reference:
+	""" An immutable reference to a path, and optionally a query, in
+	the Firebase Realtime Database.
 
+	Building paths with :meth:`child` or queries with methods like
+	:meth:`order_by_key` never modifies a reference, a new one is
+	returned instead. A reference can therefore be shared between
+	threads and reused for any number of requests, while the request
+	URL it builds is cached on the first use.
 
-	:type credentials: :class:`~google.oauth2.service_account.Credentials`
-	:param credentials: Service Account Credentials.
 
-	:type database_url: str
-	:param database_url: ``databaseURL`` from Firebase configuration.
+	:type database: Database
+	:param database: Database service the requests are sent through.
 
-	:type requests: :class:`~requests.Session`
-	:param requests: Session to make HTTP requests.
+	:type path: str
+	:param path: (Optional) Path to data, defaults to ``""``
+		(root of the database).
+
+	:type query: dict
+	:param query: (Optional) Query parameters, defaults to
+		:data:`None`.
 	"""
 
-	def __init__(self, credentials, database_url, requests):
+	__slots__ = ('_database', '_path', '_query', '_url')
+
+	def __init__(self, database, path="", query=None):
 		""" Constructor """
 
-		if not database_url.endswith('/'):
-			url = ''.join([database_url, '/'])
-		else:
-			url = database_url
+		self._database = database
+		self._path = path
+		self._query = MappingProxyType(dict(query or {}))
+		self._url = None
 
-		self.credentials = credentials
-		self.database_url = url
-		self.requests = requests
+	@property
+	def path(self):
+		""" Path to data referred by this reference.
+
+		:rtype: str
+		"""
+
+		return self._path
+
+	@property
+	def query(self):
+		""" Read-only view of the query parameters.
+
+		:rtype: :class:`~types.MappingProxyType`
+		"""
 
-		self.path = ""
-		self.build_query = {}
-		self.last_push_time = 0
-		self.last_rand_chars = []
+		return self._query
+
+	def _with_query(self, param, value):
+		""" Returns a new reference to the same path with an additional
+		query parameter.
+		"""
+
+		query = dict(self._query)
+		query[param] = value
+
+		return Reference(self._database, self._path, query)
 
 	def order_by_key(self):
 		""" Filter data by their keys.
@@ -62,43 +102,39 @@ class Database:
 		| For more details:
 		| |filtering_by_key|_
 
-		.. |filtering_by_key| replace:: 
+		.. |filtering_by_key| replace::
 			Firebase Documentation | Retrieve Data | Filtering
 			Data | filtering_by_key
 
-		.. _filtering_by_key: 
+		.. _filtering_by_key:
 			https://firebase.google.com/docs/database/rest/retrieve-data#filtering-by-key
 
 
-		:return: A reference to the instance object.
-		:rtype: Database
+		:return: A new reference with the query applied.
+		:rtype: Reference
 		"""
 
-		self.build_query["orderBy"] = "$key"
-
-		return self
+		return self._with_query("orderBy", "$key")
 
 	def order_by_value(self):
 		""" Filter data by the value of their child keys.
 
 		| For more details:
 		| |filtering-by-value|_
-		
+
 		.. |filtering-by-value| replace::
 			Firebase Documentation | Retrieve Data | Filtering
 			Data | filtering-by-value
 
-		.. _filtering-by-value: 
+		.. _filtering-by-value:
 			https://firebase.google.com/docs/database/rest/retrieve-data#filtering-by-value
 
 
-		:return: A reference to the instance object.
-		:rtype: Database
+		:return: A new reference with the query applied.
+		:rtype: Reference
 		"""
 
-		self.build_query["orderBy"] = "$value"
-
-		return self
+		return self._with_query("orderBy", "$value")
 
 	def order_by_child(self, order):
 		""" Filter data by a common child key.
@@ -110,7 +146,7 @@ class Database:
 			Firebase Documentation | Retrieve Data | Filtering
 			Data | filtering-by-a-specified-child-key
 
-		.. _filtering-by-a-specified-child-key: 
+		.. _filtering-by-a-specified-child-key:
 			https://firebase.google.com/docs/database/rest/retrieve-data#filtering-by-a-specified-child-key
 
 
@@ -118,13 +154,11 @@ class Database:
 		:param order: Child key name.
 
 
-		:return: A reference to the instance object.
-		:rtype: Database
+		:return: A new reference with the query applied.
+		:rtype: Reference
 		"""
 
-		self.build_query["orderBy"] = order
-
-		return self
+		return self._with_query("orderBy", order)
 
 	def start_at(self, start):
 		""" Filter data where child key value starts from specified
@@ -137,7 +171,7 @@ class Database:
 			Firebase Documentation | Retrieve Data | Complex
 			Filtering | range-queries
 
-		.. _range-queries: 
+		.. _range-queries:
 			https://firebase.google.com/docs/database/rest/retrieve-data#range-queries
 
 
@@ -145,13 +179,11 @@ class Database:
 		:param start: Arbitrary starting points for queries.
 
 
-		:return: A reference to the instance object.
-		:rtype: Database
+		:return: A new reference with the query applied.
+		:rtype: Reference
 		"""
 
-		self.build_query["startAt"] = start
-
-		return self
+		return self._with_query("startAt", start)
 
 	def end_at(self, end):
 		""" Filter data where child key value ends at specified
@@ -165,13 +197,11 @@ class Database:
 		:param end: Arbitrary ending points for queries.
 
 
-		:return: A reference to the instance object.
-		:rtype: Database
+		:return: A new reference with the query applied.
+		:rtype: Reference
 		"""
 
-		self.build_query["endAt"] = end
-
-		return self
+		return self._with_query("endAt", end)
 
 	def equal_to(self, equal):
 		""" Filter data where child key value is equal to specified
@@ -185,13 +215,11 @@ class Database:
 		:param equal: Arbitrary point for queries.
 
 
-		:return: A reference to the instance object.
-		:rtype: Database
+		:return: A new reference with the query applied.
+		:rtype: Reference
 		"""
 
-		self.build_query["equalTo"] = equal
-
-		return self
+		return self._with_query("equalTo", equal)
 
 	def limit_to_first(self, limit_first):
 		""" Filter the number of data to receive from top.
@@ -203,7 +231,7 @@ class Database:
 			Firebase Documentation | Retrieve Data | Complex
 			Filtering | limit-queries
 
-		.. _limit-queries: 
+		.. _limit-queries:
 			https://firebase.google.com/docs/database/rest/retrieve-data#limit-queries
 
 
@@ -212,13 +240,11 @@ class Database:
 			from top.
 
 
-		:return: A reference to the instance object.
-		:rtype: Database
+		:return: A new reference with the query applied.
+		:rtype: Reference
 		"""
 
-		self.build_query["limitToFirst"] = limit_first
-
-		return self
+		return self._with_query("limitToFirst", limit_first)
 
 	def limit_to_last(self, limit_last):
 		""" Filter the number of data to receive from bottom.
@@ -232,13 +258,11 @@ class Database:
 			from bottom.
 
 
-		:return: A reference to the instance object.
-		:rtype: Database
+		:return: A new reference with the query applied.
+		:rtype: Reference
 		"""
 
-		self.build_query["limitToLast"] = limit_last
-
-		return self
+		return self._with_query("limitToLast", limit_last)
 
 	def shallow(self):
 		""" Limit the depth of the response.
@@ -254,13 +278,11 @@ class Database:
 			https://firebase.google.com/docs/reference/rest/database#section-param-shallow
 
 
-		:return: A reference to the instance object.
-		:rtype: Database
+		:return: A new reference with the query applied.
+		:rtype: Reference
 		"""
 
-		self.build_query["shallow"] = True
-
-		return self
+		return self._with_query("shallow", True)
 
 	def child(self, *args):
 		""" Build paths to your data.
@@ -270,22 +292,22 @@ class Database:
 		:param args: Positional arguments to build path to database.
 
 
-		:return: A reference to the instance object.
-		:rtype: Database
+		:return: A new reference to the child path.
+		:rtype: Reference
 		"""
 
 		new_path = "/".join([str(arg) for arg in args])
 
-		if self.path:
-			self.path += "/{}".format(new_path)
+		if self._path:
+			path = "{0}/{1}".format(self._path, new_path)
 
 		else:
 			if new_path.startswith("/"):
 				new_path = new_path[1:]
 
-			self.path = new_path
+			path = new_path
 
-		return self
+		return Reference(self._database, path, self._query)
 
 	def build_request_url(self, token):
 		""" Builds Request URL for query.
@@ -299,125 +321,197 @@ class Database:
 		:rtype: str
 		"""
 
-		parameters = {}
+		if self._url is None:
+			parameters = {}
 
-		if token:
-			parameters['auth'] = token
+			for param, value in self._query.items():
+				if type(value) is str:
+					parameters[param] = '"' + value + '"'
 
-		for param in list(self.build_query):
-			if type(self.build_query[param]) is str:
-				parameters[param] = '"' + self.build_query[param] + '"'
+				elif type(value) is bool:
+					parameters[param] = "true" if value else "false"
 
-			elif type(self.build_query[param]) is bool:
-				parameters[param] = "true" if self.build_query[param] else "false"
+				else:
+					parameters[param] = value
 
-			else:
-				parameters[param] = self.build_query[param]
+			self._url = '{0}{1}.json?{2}'.format(self._database.database_url, self._path, urlencode(parameters))
 
-		# reset path and build_query for next query
-		request_ref = '{0}{1}.json?{2}'.format(self.database_url, self.path, urlencode(parameters))
+		if not token:
+			return self._url
 
-		self.path = ""
-		self.build_query = {}
+		if self._query:
+			return '{0}&{1}'.format(self._url, urlencode({'auth': token}))
 
-		return request_ref
+		return '{0}{1}'.format(self._url, urlencode({'auth': token}))
+
+	def get(self, token=None, json_kwargs={}, ordered=True, export=False, pretty=False):
+		""" Read data from database.
+
+		| For more details:
+		| |section-get|_
+
+		.. |section-get| replace::
+			Firebase Database REST API | GET - Reading Data
+
+		.. _section-get:
+			https://firebase.google.com/docs/reference/rest/database#section-get
 
-	def build_headers(self, token=None):
-		""" Build Request Header.
 
 		:type token: str
-		:param token: (Optional) Firebase Auth User ID Token, defaults 
+		:param token: (Optional) Firebase Auth User ID Token, defaults
 			to :data:`None`.
 
+		:type json_kwargs: dict
+		:param json_kwargs: (Optional) Keyword arguments to send to
+			:func:`json.dumps` method for deserialization of data,
+			defaults to :data:`{}` (empty :class:`dict` object).
 
-		:return: Request Header.
+		:type ordered: bool
+		:param ordered: (Optional) Whether the children of an ordered
+			query are sorted the way the server orders them, defaults to
+			:data:`True`. Skip it when only the set of children
+			matters, as the server doesn't keep the order in JSON.
+
+		:type export: bool
+		:param export: (Optional) Whether priorities are included in
+			the data (``format=export``), defaults to :data:`False`.
+
+		:type pretty: bool
+		:param pretty: (Optional) Whether the server sends the data in
+			a human-readable format (``print=pretty``), defaults to
+			:data:`False`.
+
+
+		:return: The data associated with the path.
 		:rtype: dict
 		"""
 
-		headers = {"content-type": "application/json; charset=UTF-8"}
+		parameters = {}
 
-		if not token and self.credentials:
+		if export:
+			parameters['format'] = 'export'
 
-			if not self.credentials.valid:
-				self.credentials.refresh(Request())
+		if pretty:
+			parameters['print'] = 'pretty'
 
-			access_token = self.credentials.token
-			headers['Authorization'] = 'Bearer ' + access_token
+		return self._database._get(self, token, json_kwargs, ordered, parameters)
 
-		return headers
+	def iter_children(self, token=None, json_kwargs={}, chunk_size=64 * 1024):
+		""" Read the children of the data, one after the other, while
+		the response is being received.
 
-	def get(self, token=None, json_kwargs={}):
-		""" Read data from database.
+		Unlike :meth:`get`, the response is never held in memory as a
+		whole, which allows reading nodes too large to be decoded at
+		once. Children are yielded in the order they are received, so
+		the order of a query is not applied to them.
 
-		| For more details:
-		| |section-get|_
 
-		.. |section-get| replace::
-			Firebase Database REST API | GET - Reading Data
+		:type token: str
+		:param token: (Optional) Firebase Auth User ID Token, defaults
+			to :data:`None`.
 
-		.. _section-get:
-			https://firebase.google.com/docs/reference/rest/database#section-get
+		:type json_kwargs: dict
+		:param json_kwargs: (Optional) Keyword arguments to send to
+			:class:`json.JSONDecoder` for deserialization of data,
+			defaults to :data:`{}` (empty :class:`dict` object).
+
+		:type chunk_size: int
+		:param chunk_size: (Optional) Number of bytes read from the
+			response at once, defaults to ``64 KB``.
+
+
+		:return: ``(key, value)`` of each child, ``(index, value)`` if
+			the data is a list, nothing if it has no children.
+		:rtype: generator
+		"""
 
+		return self._database._iter_children(self, token, json_kwargs, chunk_size)
+
+	def scan(self, page_size=1000, order='key', token=None, json_kwargs={}):
+		""" Read every child of the data, page by page, ordered by
+		their keys.
+
+		Each page is requested with a query starting at the last key of
+		the previous page, and the next page is already requested in
+		the background while the current one is being iterated. Any
+		query of this reference is replaced.
+
+
+		:type page_size: int
+		:param page_size: (Optional) Number of children requested at
+			once, defaults to ``1000``.
+
+		:type order: str
+		:param order: (Optional) Order of the children, only ``key`` is
+			supported as it's the only one guaranteed to be unique,
+			defaults to ``key``.
 
 		:type token: str
-		:param token: (Optional) Firebase Auth User ID Token, defaults 
+		:param token: (Optional) Firebase Auth User ID Token, defaults
 			to :data:`None`.
 
 		:type json_kwargs: dict
-		:param json_kwargs: (Optional) Keyword arguments to send to 
-			:func:`json.dumps` method for deserialization of data, 
+		:param json_kwargs: (Optional) Keyword arguments to send to
+			:func:`json.loads` method for deserialization of data,
 			defaults to :data:`{}` (empty :class:`dict` object).
-				
 
-		:return: The data associated with the path.
-		:rtype: dict
+
+		:return: ``(key, value)`` of each child.
+		:rtype: generator
+
+		:raises ValueError: Raised when ``page_size`` is not positive or
+			``order`` is not supported.
 		"""
 
-		build_query = self.build_query
-		query_key = self.path.split("/")[-1]
-		request_ref = self.build_request_url(token)
+		if order != 'key':
+			raise ValueError("Unsupported order '{0}', only 'key' is supported".format(order))
 
-		# headers
-		headers = self.build_headers(token)
+		if page_size < 1:
+			raise ValueError("page_size must be a positive number")
 
-		# do request
-		request_object = self.requests.get(request_ref, headers=headers)
+		return self._database._scan(Reference(self._database, self._path, {"orderBy": "$key"}), page_size, token, json_kwargs)
 
-		raise_detailed_error(request_object)
-		request_dict = request_object.json(**json_kwargs)
+	def get_many(self, paths, max_workers=10, token=None, json_kwargs={}):
+		""" Read data from many paths concurrently.
 
-		# if primitive or simple query return
-		if isinstance(request_dict, list):
-			return FirebaseResponse(convert_list_to_firebase(request_dict), query_key)
+		Requests are sent over the pooled session from a pool of
+		``max_workers`` threads, which should not exceed the
+		``poolSize`` of the Firebase configuration (``10`` by default)
+		for connections to be reused.
 
-		if not isinstance(request_dict, dict):
-			return FirebaseResponse(request_dict, query_key)
 
-		if not build_query:
-			return FirebaseResponse(convert_to_firebase(request_dict.items()), query_key)
+		:type paths: list
+		:param paths: Paths to data, relative to this reference.
 
-		# return keys if shallow
-		if build_query.get("shallow"):
-			return FirebaseResponse(request_dict.keys(), query_key)
+		:type max_workers: int
+		:param max_workers: (Optional) Maximum number of requests sent
+			at once, defaults to ``10``.
 
-		# otherwise sort
-		sorted_response = None
+		:type token: str
+		:param token: (Optional) Firebase Auth User ID Token, defaults
+			to :data:`None`.
 
-		if build_query.get("orderBy"):
-			if build_query["orderBy"] == "$key":
-				sorted_response = sorted(request_dict.items(), key=lambda item: item[0])
-			elif build_query["orderBy"] == "$value":
-				sorted_response = sorted(request_dict.items(), key=lambda item: item[1])
-			else:
-				sorted_response = sorted(request_dict.items(), key=lambda item: (build_query["orderBy"] in item[1], item[1].get(build_query["orderBy"], "")))
+		:type json_kwargs: dict
+		:param json_kwargs: (Optional) Keyword arguments to send to
+			:func:`json.loads` method for deserialization of data,
+			defaults to :data:`{}` (empty :class:`dict` object).
+
+
+		:return: The data associated with each path, in the same order
+			as ``paths``. A failed request does not stop the others,
+			the error raised for it takes its place instead.
+		:rtype: list
+		"""
 
-		return FirebaseResponse(convert_to_firebase(sorted_response), query_key)
+		references = [self.child(path) for path in paths]
 
-	def push(self, data, token=None, json_kwargs={}):
+		return self._database._get_many(references, max_workers, token, json_kwargs)
+
+	def push(self, data, token=None, json_kwargs={}, silent=None):
 		""" Add data to database.
 
-		This method adds a Firebase Push ID at the end of the specified 
-		path, and then adds/stores the data in database, unlike 
+		This method adds a Firebase Push ID at the end of the specified
+		path, and then adds/stores the data in database, unlike
 		:meth:`set` which does not use a Firebase Push ID.
 
 		| For more details:
@@ -434,35 +528,32 @@ class Database:
 		:param data: Data to be stored in database.
 
 		:type token: str
-		:param token: (Optional) Firebase Auth User ID Token, defaults 
+		:param token: (Optional) Firebase Auth User ID Token, defaults
 			to :data:`None`.
 
 		:type json_kwargs: dict
-		:param json_kwargs: (Optional) Keyword arguments to send to 
-			:func:`json.dumps` method for serialization of data, 
+		:param json_kwargs: (Optional) Keyword arguments to send to
+			:func:`json.dumps` method for serialization of data,
 			defaults to :data:`{}` (empty :class:`dict` object).
 
+		:type silent: bool
+		:param silent: (Optional) Whether the server skips sending a
+			response body, in which case the push ID is generated on
+			the client, defaults to :data:`None` (the ``silent_writes``
+			setting of the database).
+
 
 		:return: Child key (Firebase Push ID) name of the data.
 		:rtype: dict
 		"""
 
-		request_ref = self.check_token(self.database_url, self.path, token)
-
-		self.path = ""
-
-		headers = self.build_headers(token)
-		request_object = self.requests.post(request_ref, headers=headers, data=json.dumps(data, **json_kwargs).encode("utf-8"))
-
-		raise_detailed_error(request_object)
-
-		return request_object.json()
+		return self._database._push(self, data, token, json_kwargs, silent)
 
-	def set(self, data, token=None, json_kwargs={}):
+	def set(self, data, token=None, json_kwargs={}, silent=None):
 		""" Add data to database.
 
-		This method writes the data in database in the specified 
-		path, unlike :meth:`push` which creates a Firebase Push ID then 
+		This method writes the data in database in the specified
+		path, unlike :meth:`push` which creates a Firebase Push ID then
 		writes the data to database.
 
 		| For more details:
@@ -479,41 +570,37 @@ class Database:
 		:param data: Data to be stored in database.
 
 		:type token: str
-		:param token: (Optional) Firebase Auth User ID Token, defaults 
+		:param token: (Optional) Firebase Auth User ID Token, defaults
 			to :data:`None`.
 
 		:type json_kwargs: dict
-		:param json_kwargs: (Optional) Keyword arguments to send to 
-			:func:`json.dumps` method for serialization of data, 
+		:param json_kwargs: (Optional) Keyword arguments to send to
+			:func:`json.dumps` method for serialization of data,
 			defaults to :data:`{}` (empty :class:`dict` object).
 
+		:type silent: bool
+		:param silent: (Optional) Whether the server skips sending the
+			written data back, defaults to :data:`None` (the
+			``silent_writes`` setting of the database).
 
-		:return: Successful attempt returns the ``data`` specified to 
-			add to database.
+
+		:return: Successful attempt returns the ``data`` specified to
+			add to database, or :data:`None` when ``silent``.
 		:rtype: dict
 		"""
 
-		request_ref = self.check_token(self.database_url, self.path, token)
-
-		self.path = ""
-
-		headers = self.build_headers(token)
-		request_object = self.requests.put(request_ref, headers=headers, data=json.dumps(data, **json_kwargs).encode("utf-8"))
-
-		raise_detailed_error(request_object)
-
-		return request_object.json()
+		return self._database._write(self, 'PUT', data, token, json_kwargs, silent=silent)
 
-	def update(self, data, token=None, json_kwargs={}):
+	def update(self, data, token=None, json_kwargs={}, silent=None):
 		""" Update stored data of database.
 
 		| For more details:
 		| |section-patch|_
 
-		.. |section-patch| replace:: 
+		.. |section-patch| replace::
 			Firebase Database REST API | PATCH - Updating Data
 
-		.. _section-patch: 
+		.. _section-patch:
 			https://firebase.google.com/docs/reference/rest/database#section-patch
 
 
@@ -521,30 +608,56 @@ class Database:
 		:param data: Data to be updated.
 
 		:type token: str
-		:param token: (Optional) Firebase Auth User ID Token, defaults 
+		:param token: (Optional) Firebase Auth User ID Token, defaults
 			to :data:`None`.
 
 		:type json_kwargs: dict
-		:param json_kwargs: (Optional) Keyword arguments to send to 
-			:func:`json.dumps` method for serialization of data, 
+		:param json_kwargs: (Optional) Keyword arguments to send to
+			:func:`json.dumps` method for serialization of data,
 			defaults to :data:`{}` (empty :class:`dict` object).
 
+		:type silent: bool
+		:param silent: (Optional) Whether the server skips sending the
+			written data back, defaults to :data:`None` (the
+			``silent_writes`` setting of the database).
+
 
-		:return: Successful attempt returns the data specified to 
-			update.
+		:return: Successful attempt returns the data specified to
+			update, or :data:`None` when ``silent``.
 		:rtype: dict
 		"""
 
-		request_ref = self.check_token(self.database_url, self.path, token)
+		return self._database._write(self, 'PATCH', data, token, json_kwargs, silent=silent)
 
-		self.path = ""
+	def increment(self, delta=1, token=None):
+		""" Atomically add ``delta`` to the number stored at the path,
+		in a single request.
 
-		headers = self.build_headers(token)
-		request_object = self.requests.patch(request_ref, headers=headers, data=json.dumps(data, **json_kwargs).encode("utf-8"))
+		| For more details:
+		| |section-server-values|_
 
-		raise_detailed_error(request_object)
+		.. |section-server-values| replace::
+			Firebase Database REST API | Server Values
+
+		.. _section-server-values:
+			https://firebase.google.com/docs/reference/rest/database#section-server-values
+
+
+		:type delta: int or float
+		:param delta: (Optional) Amount to add, negative to subtract,
+			defaults to ``1``.
+
+		:type token: str
+		:param token: (Optional) Firebase Auth User ID Token, defaults
+			to :data:`None`.
+
+
+		:return: The number stored after the increment, even when
+			``silent_writes`` is set on the database.
+		:rtype: int or float
+		"""
 
-		return request_object.json()
+		return self._database._write(self, 'PUT', increment(delta), token, {}, silent=False)
 
 	def remove(self, token=None):
 		""" Delete data from database.
@@ -555,12 +668,12 @@ class Database:
 		.. |section-delete| replace::
 			Firebase Database REST API | DELETE - Removing Data
 
-		.. _section-delete: 
+		.. _section-delete:
 			https://firebase.google.com/docs/reference/rest/database#section-delete
 
 
 		:type token: str
-		:param token: (Optional) Firebase Auth User ID Token, defaults 
+		:param token: (Optional) Firebase Auth User ID Token, defaults
 			to :data:`None`.
 
 
@@ -568,125 +681,146 @@ class Database:
 		:rtype: :data:`None`
 		"""
 
-		request_ref = self.check_token(self.database_url, self.path, token)
+		return self._database._write(self, 'DELETE', None, token, {})
 
-		self.path = ""
+	def batch(self, max_payload_size=16 * 1024 * 1024, max_writes=None):
+		""" Create a batch to write data to many paths below this
+		reference with multi-location updates.
 
-		headers = self.build_headers(token)
-		request_object = self.requests.delete(request_ref, headers=headers)
+		The batch can be used as a context manager, which commits the
+		writes on exit and keeps the results in ``results``.
 
-		raise_detailed_error(request_object)
+		.. code-block:: python
 
-		return request_object.json()
+			with db.child("users").batch() as batch:
+				batch.set("Edward/name", "Tony Stark")
+				batch.update("Pepper", {"name": "Pepper Potts"})
+				batch.remove("Happy")
+		..
 
-	def stream(self, stream_handler, token=None, stream_id=None, is_async=True):
-		request_ref = self.build_request_url(token)
 
-		return Stream(request_ref, stream_handler, self.build_headers, stream_id, is_async)
+		:type max_payload_size: int
+		:param max_payload_size: (Optional) Maximum size in bytes of
+			the body of a single request, defaults to ``16 MB``.
 
-	def check_token(self, database_url, path, token):
-		""" Builds Request URL to write/update/remove data.
+		:type max_writes: int
+		:param max_writes: (Optional) Maximum number of paths written
+			by a single request, defaults to :data:`None` (no limit).
 
 
-		:type database_url: str
-		:param database_url: ``databaseURL`` from Firebase 
-			configuration.
+		:return: A new, empty, batch.
+		:rtype: :class:`~firebase.database._batch.WriteBatch`
+		"""
 
-		:type path: str
-		:param path: Path to data.
+		return WriteBatch(self, max_payload_size=max_payload_size, max_writes=max_writes)
 
-		:type token: str
-		:param token: Firebase Auth User ID Token
+	def update_many(self, data, token=None, json_kwargs={}, max_payload_size=16 * 1024 * 1024, max_writes=None, silent=None):
+		""" Update data at many paths below this reference, splitting
+		it into as many multi-location updates as required.
 
 
-		:return: Request URL
-		:rtype: str
-		"""
+		:type data: dict
+		:param data: Data to be updated, keyed by paths relative to
+			this reference.
 
-		if token:
-			return '{0}{1}.json?auth={2}'.format(database_url, path, token)
-		else:
-			return '{0}{1}.json'.format(database_url, path)
+		:type token: str
+		:param token: (Optional) Firebase Auth User ID Token, defaults
+			to :data:`None`.
 
-	def generate_key(self):
-		""" Generate Firebase's push IDs.
+		:type json_kwargs: dict
+		:param json_kwargs: (Optional) Keyword arguments to send to
+			:func:`json.dumps` method for serialization of data,
+			defaults to :data:`{}` (empty :class:`dict` object).
 
-		| For more details:
-		| |firebase-push-id|_
+		:type max_payload_size: int
+		:param max_payload_size: (Optional) Maximum size in bytes of
+			the body of a single request, defaults to ``16 MB``.
 
-		.. |firebase-push-id| replace::
-			Firebase Blog | The 2^120 Ways to Ensure Unique Identifiers
+		:type max_writes: int
+		:param max_writes: (Optional) Maximum number of paths written
+			by a single request, defaults to :data:`None` (no limit).
 
-		.. _firebase-push-id:
-			https://firebase.blog/posts/2015/02/the-2120-ways-to-ensure-unique_68
+		:type silent: bool
+		:param silent: (Optional) Whether the server skips sending the
+			written data back, defaults to :data:`None` (the
+			``silent_writes`` setting of the database).
 
 
-		:return: Firebase's push IDs
-		:rtype: str
+		:return: Result of each request, see :meth:`WriteBatch.commit`.
+		:rtype: list
 		"""
 
-		push_chars = '-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz'
-
-		now = int(time.time() * 1000)
-		duplicate_time = now == self.last_push_time
-
-		self.last_push_time = now
-		time_stamp_chars = [0] * 8
+		batch = self.batch(max_payload_size=max_payload_size, max_writes=max_writes)
+		batch.update("", data)
 
-		for i in reversed(range(0, 8)):
-			time_stamp_chars[i] = push_chars[now % 64]
-			now = int(math.floor(now / 64))
+		return batch.commit(token=token, json_kwargs=json_kwargs, silent=silent)
 
-		new_id = "".join(time_stamp_chars)
+	def stream(self, stream_handler, token=None, stream_id=None, is_async=True, backoff=None, on_reconnect=None, coalesce_window=None):
+		""" Listen to the changes of the data.
 
-		if not duplicate_time:
-			self.last_rand_chars = [randrange(64) for _ in range(12)]
-		else:
-			for i in range(0, 11):
-
-				if self.last_rand_chars[i] == 63:
-					self.last_rand_chars[i] = 0
 
-				self.last_rand_chars[i] += 1
+		:type stream_handler: function
+		:param stream_handler: Function called with each event, or
+			with a list of them when ``coalesce_window`` is set.
 
-		for i in range(0, 12):
-			new_id += push_chars[self.last_rand_chars[i]]
+		:type token: str
+		:param token: (Optional) Firebase Auth User ID Token, defaults
+			to :data:`None`.
 
-		return new_id
+		:type stream_id: str
+		:param stream_id: (Optional) ID added to each event to identify
+			the stream, defaults to :data:`None`.
+
+		:type is_async: bool
+		:param is_async: (Optional) Whether the stream runs in its own
+			thread, defaults to :data:`True`.
+
+		:type backoff: :class:`~firebase.database.ReconnectBackoff`
+		:param backoff: (Optional) Delays between attempts to
+			reconnect, defaults to :data:`None` (exponential with
+			jitter, from the retry delay requested by the server up to
+			a minute).
+
+		:type on_reconnect: function
+		:param on_reconnect: (Optional) Function called after each
+			reconnection, with the number of ``reconnects`` so far, the
+			``attempts`` and ``seconds`` it took, the
+			``discarded_bytes`` of the half received event and the
+			``error`` which dropped the connection, defaults to
+			:data:`None`.
+
+		:type coalesce_window: int or float
+		:param coalesce_window: (Optional) Seconds events are queued
+			for, merging consecutive patches to the same path, before
+			the handler is called with them from another thread,
+			defaults to :data:`None` (each event is handled as soon as
+			it is received).
+
+
+		:return: The started stream.
+		:rtype: Stream
+		"""
 
-	def sort(self, origin, by_key, reverse=False):
-		""" Further sort data based on a child key value.
+		request_ref = self.build_request_url(token)
 
+		return Stream(request_ref, stream_handler, self._database.build_headers, stream_id, is_async, backoff=backoff, on_reconnect=on_reconnect, coalesce_window=coalesce_window)
 
-		:type origin: dict
-		:param origin: Data to be sorted (generally the output from 
-			:meth:`get` method).
+	def mirror(self, token=None):
+		""" Keep an in-memory copy of the data, updated by a stream of
+		its changes, to answer reads without any request.
 
-		:type by_key: str
-		:param by_key: Child key name to sort by.
 
-		:type reverse: bool
-		:param reverse: (Optional) Whether to return data in descending 
-			order, defaults to :data:`False` (data is returned in 
-			ascending order).
+		:type token: str
+		:param token: (Optional) Firebase Auth User ID Token, defaults
+			to :data:`None`.
 
 
-		:return: Sorted version of the data.
-		:rtype: dict
+		:return: The mirror, which can be waited for until the initial
+			data has been received.
+		:rtype: Mirror
 		"""
 
-		# unpack firebase objects
-		firebases = origin.each()
-
-		new_list = []
-
-		for firebase in firebases:
-			new_list.append(firebase.item)
-
-		# sort
-		data = sorted(dict(new_list).items(), key=lambda item: item[1][by_key], reverse=reverse)
-
-		return FirebaseResponse(convert_to_firebase(data), origin.key())
+		return Mirror(self, token=token)
 
 	def get_etag(self, token=None):
 		""" Fetches Firebase ETag at a specified location.
@@ -695,15 +829,15 @@ class Database:
 		| |section-cond-etag|_
 
 		.. |section-cond-etag| replace::
-			Firebase Database REST API | Conditional Requests | 
+			Firebase Database REST API | Conditional Requests |
 			#section-cond-etag
 
-		.. _section-cond-etag: 
+		.. _section-cond-etag:
 			https://firebase.google.com/docs/reference/rest/database#section-cond-etag
 
 
 		:type token: str
-		:param token: (Optional) Firebase Auth User ID Token, defaults 
+		:param token: (Optional) Firebase Auth User ID Token, defaults
 			to :data:`None`.
 
 
@@ -711,16 +845,7 @@ class Database:
 		:rtype: str
 		"""
 
-		request_ref = self.build_request_url(token)
-
-		headers = self.build_headers(token)
-		# extra header to get ETag
-		headers['X-Firebase-ETag'] = 'true'
-		request_object = self.requests.get(request_ref, headers=headers)
-
-		raise_detailed_error(request_object)
-
-		return request_object.headers['ETag']
+		return self._database._get_etag(self, token)
 
 	def conditional_set(self, data, etag, token=None, json_kwargs={}):
 		""" Conditionally add data to database.
@@ -729,7 +854,7 @@ class Database:
 		| |section-expected-responses|_
 
 		.. |section-expected-responses| replace::
-			Firebase Database REST API | Conditional Requests | 
+			Firebase Database REST API | Conditional Requests |
 			section-expected-responses
 
 		.. _section-expected-responses:
@@ -738,43 +863,28 @@ class Database:
 
 		:type data: dict
 		:param data: Data to be stored in database.
-		
+
 		:type etag: str
 		:param etag: Unique identifier for specific data at a
 			specified location.
-		
+
 		:type token: str
-		:param token: (Optional) Firebase Auth User ID Token, defaults 
+		:param token: (Optional) Firebase Auth User ID Token, defaults
 			to :data:`None`.
-		
+
 		:type json_kwargs: dict
-		:param json_kwargs: (Optional) Keyword arguments to send to 
-			:meth:`json.dumps` methods for serialization of data, 
+		:param json_kwargs: (Optional) Keyword arguments to send to
+			:meth:`json.dumps` methods for serialization of data,
 			defaults to ``{}`` (empty :class:`dict` object).
 
 
 		:return: Successful attempt returns the data specified to store,
-			failed attempt (due to ETag mismatch) returns the current 
+			failed attempt (due to ETag mismatch) returns the current
 			``ETag`` for the specified path.
 		:rtype: dict
 		"""
 
-		request_ref = self.check_token(self.database_url, self.path, token)
-
-		self.path = ""
-
-		headers = self.build_headers(token)
-		headers['if-match'] = etag
-
-		request_object = self.requests.put(request_ref, headers=headers, data=json.dumps(data, **json_kwargs).encode("utf-8"))
-
-		# ETag didn't match, so we should return the correct one for the user to try again
-		if request_object.status_code == 412:
-			return {'ETag': request_object.headers['ETag']}
-
-		raise_detailed_error(request_object)
-
-		return request_object.json()
+		return self._database._write(self, 'PUT', data, token, json_kwargs, etag=etag)
 
 	def conditional_remove(self, etag, token=None):
 		""" Conditionally delete data from database.
@@ -788,7 +898,7 @@ class Database:
 			specified location.
 
 		:type token: str
-		:param token: (Optional) Firebase Auth User ID Token, defaults 
+		:param token: (Optional) Firebase Auth User ID Token, defaults
 			to :data:`None`.
 
 
@@ -798,18 +908,865 @@ class Database:
 		:rtype: :data:`None`
 		"""
 
-		request_ref = self.check_token(self.database_url, self.path, token)
+		return self._database._write(self, 'DELETE', None, token, {}, etag=etag)
 
-		self.path = ""
+	def transaction(self, update_fn, token=None, max_retries=25, json_kwargs={}):
+		""" Atomically update data with a function of its current value.
 
-		headers = self.build_headers(token)
-		headers['if-match'] = etag
-		request_object = self.requests.delete(request_ref, headers=headers)
+		The data and its ETag are read together, and the value returned
+		by ``update_fn`` is written only if the data hasn't changed
+		since. Otherwise the rejected write already returns the new data
+		and ETag, so ``update_fn`` is applied to them and written again,
+		without another read.
 
-		# ETag didn't match, so we should return the correct one for the user to try again
-		if request_object.status_code == 412:
-			return {'ETag': request_object.headers['ETag']}
+		| For more details:
+		| |section-cond-etag|_
 
-		raise_detailed_error(request_object)
 
-		return request_object.json()
+		:type update_fn: function
+		:param update_fn: Function called with the current data, which
+			returns the data to write. It may be called several times,
+			and can raise an exception to abort the transaction.
+
+		:type token: str
+		:param token: (Optional) Firebase Auth User ID Token, defaults
+			to :data:`None`.
+
+		:type max_retries: int
+		:param max_retries: (Optional) Number of times the write is
+			attempted again after the data changed, defaults to ``25``.
+
+		:type json_kwargs: dict
+		:param json_kwargs: (Optional) Keyword arguments to send to
+			:meth:`json.dumps` methods for serialization of data,
+			defaults to ``{}`` (empty :class:`dict` object).
+
+
+		:return: The data written.
+		:rtype: dict or list or bool or int or float or str
+
+		:raises TransactionAbortedError: Raised when the data changed
+			before every attempt to write it.
+		"""
+
+		return self._database._transaction(self, update_fn, token, max_retries, json_kwargs)
+
+
+class Database(Reference):
+	""" Firebase Database Service
+
+	The service itself is a :class:`Reference` to the root of the
+	database, every path or query built from it is a new
+	:class:`Reference`, so a single instance can be shared between
+	threads.
+
+
+	:type credentials: :class:`~google.oauth2.service_account.Credentials`
+	:param credentials: Service Account Credentials.
+
+	:type database_url: str
+	:param database_url: ``databaseURL`` from Firebase configuration.
+
+	:type requests: :class:`~requests.Session`
+	:param requests: Session to make HTTP requests.
+
+	:type codec: :class:`~firebase._json_codec.JSONCodec`
+	:param codec: (Optional) Serializer of request and response
+		bodies, defaults to :data:`None` (standard :mod:`json`).
+
+	:type silent_writes: bool
+	:param silent_writes: (Optional) Whether the server skips sending
+		the written data back by default, defaults to :data:`False`.
+	"""
+
+	def __init__(self, credentials, database_url, requests, codec=None, silent_writes=False):
+		""" Constructor """
+
+		if not database_url.endswith('/'):
+			url = ''.join([database_url, '/'])
+		else:
+			url = database_url
+
+		self.credentials = credentials
+		self.database_url = url
+		self.requests = requests
+		self.codec = codec or JSONCodec()
+		self.silent_writes = silent_writes
+
+		self.cache = None
+		self.transactions = TransactionStats()
+
+		# access tokens of the service account, shared by all threads
+		self.token_cache = None
+
+		if credentials:
+			self.token_cache = TokenCache(credentials, headers={"content-type": "application/json; charset=UTF-8"})
+
+		self.push_ids = PushIdGenerator()
+
+		super(Database, self).__init__(self)
+
+	def build_headers(self, token=None):
+		""" Build Request Header.
+
+		:type token: str
+		:param token: (Optional) Firebase Auth User ID Token, defaults
+			to :data:`None`.
+
+
+		:return: Request Header.
+		:rtype: dict
+		"""
+
+		if not token and self.token_cache:
+			return self.token_cache.headers()
+
+		return {"content-type": "application/json; charset=UTF-8"}
+
+	def enable_cache(self, max_entries=1024, ttl=30, revalidate=True):
+		""" Cache the responses of :meth:`~Reference.get` requests.
+
+		Responses are kept for each request URL (path, query and
+		token), and served without any request for ``ttl`` seconds.
+		Once expired, a response is revalidated with its ETag, sent as
+		``if-none-match``. The REST API only documents ETags for
+		conditional writes, so if the server sends the data again
+		instead of ``304 Not Modified``, the response is still kept as
+		unchanged when its ETag matches, but it has been downloaded.
+		Queries have no ETag, so their responses are downloaded again
+		once expired.
+
+		Writes sent through this instance drop the cached responses of
+		the written path, but changes made by any other client are only
+		seen once the cached response has expired.
+
+
+		:type max_entries: int
+		:param max_entries: (Optional) Maximum number of responses kept,
+			least recently used ones are evicted first, defaults to
+			``1024``.
+
+		:type ttl: int or float
+		:param ttl: (Optional) Seconds a response is served without
+			any request, defaults to ``30``.
+
+		:type revalidate: bool
+		:param revalidate: (Optional) Whether expired responses are
+			revalidated instead of downloaded again, defaults to
+			:data:`True`.
+
+
+		:return: The cache, holding its hit/miss counters.
+		:rtype: :class:`~firebase.database._cache.ReadCache`
+		"""
+
+		self.cache = ReadCache(max_entries=max_entries, ttl=ttl, revalidate=revalidate)
+
+		return self.cache
+
+	def disable_cache(self):
+		""" Stop caching the responses of :meth:`~Reference.get`
+		requests, and drop the cached ones.
+		"""
+
+		self.cache = None
+
+	def transaction_stats(self, top=10):
+		""" Contention counters of the transactions run through this
+		instance, see :meth:`~Reference.transaction`.
+
+
+		:type top: int
+		:param top: (Optional) Number of most contended paths reported,
+			defaults to ``10``.
+
+
+		:return: Number of transactions ``started``, ``committed`` and
+			``aborted``, total number of ``conflicts``, the most a
+			committed transaction had (``max_conflicts``), and the
+			paths with the most conflicts (``contended_paths``).
+		:rtype: dict
+		"""
+
+		return self.transactions.stats(top)
+
+	def stream_manager(self, max_workers=8, max_queue_size=1000, backoff=None):
+		""" Create a manager driving many streams from a single thread,
+		with their handlers called from a bounded pool of threads.
+
+		.. note::
+			Requires the ``async`` extra, i.e.
+			``pip install firebase-rest-api[async]``.
+
+
+		:type max_workers: int
+		:param max_workers: (Optional) Number of threads calling the
+			stream handlers, defaults to ``8``.
+
+		:type max_queue_size: int
+		:param max_queue_size: (Optional) Number of events each stream
+			queues before it stops reading from its connection,
+			defaults to ``1000``.
+
+		:type backoff: :class:`ReconnectBackoff`
+		:param backoff: (Optional) Delays between attempts to
+			reconnect, shared by every stream of the manager, defaults
+			to :data:`None` (exponential with jitter).
+
+
+		:return: A new stream manager.
+		:rtype: StreamManager
+		"""
+
+		return StreamManager(self, max_workers=max_workers, max_queue_size=max_queue_size, backoff=backoff)
+
+	def _get(self, reference, token, json_kwargs, ordered=True, parameters=None):
+		""" Sends a ``GET`` request for the reference, and wraps the
+		decoded data in a :class:`FirebaseResponse`.
+		"""
+
+		request_ref = _add_parameters(reference.build_request_url(token), parameters)
+
+		if self.cache is not None:
+			return self._get_cached(reference, request_ref, token, json_kwargs, ordered)
+
+		# headers
+		headers = self.build_headers(token)
+
+		# do request
+		request_object = self.requests.get(request_ref, headers=headers)
+
+		raise_detailed_error(request_object)
+
+		return build_firebase_response(self.codec.loads(request_object.content, **json_kwargs), reference.query, reference.path.split("/")[-1], ordered)
+
+	def _get_cached(self, reference, request_ref, token, json_kwargs, ordered=True):
+		""" Serves a ``GET`` request from the cache, revalidating or
+		downloading the data when required.
+		"""
+
+		entry, fresh, generation = self.cache.lookup(request_ref)
+
+		if not fresh:
+			headers = self.cache.request_headers(reference, entry, self.build_headers(token))
+			request_object = self.requests.get(request_ref, headers=headers)
+
+			raise_detailed_error(request_object)
+
+			entry = self.cache.response(request_ref, reference.path, entry, request_object.status_code, request_object.headers.get('ETag'), request_object.content, generation)
+
+		return build_firebase_response(self.codec.loads(entry.content, **json_kwargs), reference.query, reference.path.split("/")[-1], ordered)
+
+	def _iter_children(self, reference, token, json_kwargs, chunk_size):
+		""" Sends a ``GET`` request for the reference, and decodes the
+		children of the data as the response is received.
+		"""
+
+		request_ref = reference.build_request_url(token)
+
+		headers = self.build_headers(token)
+		request_object = self.requests.get(request_ref, headers=headers, stream=True)
+
+		try:
+			raise_detailed_error(request_object)
+
+			for item in iter_json_items(request_object.iter_content(chunk_size=chunk_size), **json_kwargs):
+				yield item
+
+		finally:
+			request_object.close()
+
+	def _scan(self, reference, page_size, token, json_kwargs):
+		""" Requests the pages of a key ordered scan, fetching the next
+		page in the background.
+		"""
+
+		with ThreadPoolExecutor(max_workers=1) as executor:
+			page = executor.submit(self._scan_page, reference.limit_to_first(page_size), None, token, json_kwargs)
+
+			while page is not None:
+				items, is_last = page.result()
+
+				if is_last or not items:
+					page = None
+				else:
+					page = executor.submit(self._scan_page, reference.start_at(items[-1][0]).limit_to_first(page_size + 1), items[-1][0], token, json_kwargs)
+
+				for item in items:
+					yield item
+
+	def _scan_page(self, reference, start_key, token, json_kwargs):
+		""" Requests a page of a key ordered scan. """
+
+		return _scan_items(self._get(reference, token, json_kwargs, False).val(), start_key, reference.query["limitToFirst"])
+
+	def _get_many(self, references, max_workers, token, json_kwargs):
+		""" Sends a ``GET`` request for each reference from a pool of
+		threads.
+		"""
+
+		# any error is returned in place of the response, the same as
+		# the results of asyncio.gather in AsyncDatabase
+		def get(reference):
+			try:
+				return self._get(reference, token, json_kwargs)
+			except Exception as e:
+				return e
+
+		with ThreadPoolExecutor(max_workers=max_workers) as executor:
+			return list(executor.map(get, references))
+
+	def _silent(self, silent):
+		""" Whether a write skips the response body. """
+
+		return self.silent_writes if silent is None else silent
+
+	def _write(self, reference, method, data, token, json_kwargs, etag=None, silent=None):
+		""" Sends a ``POST``, ``PUT``, ``PATCH`` or ``DELETE`` request
+		to the path of the reference, conditionally if an ``etag`` is
+		given.
+		"""
+
+		body = None
+
+		if method != 'DELETE':
+			body = self.codec.dumps(data, **json_kwargs)
+
+		return self._send(method, reference.path, body, token, etag=etag, silent=self._silent(silent))
+
+	def _push(self, reference, data, token, json_kwargs, silent):
+		""" Sends a ``POST`` request, or when ``silent`` a ``PUT``
+		request to a push ID generated here, as the response holding
+		the one generated by the server is skipped.
+		"""
+
+		if not self._silent(silent):
+			return self._write(reference, 'POST', data, token, json_kwargs, silent=False)
+
+		key = self.generate_key()
+		self._write(reference.child(key), 'PUT', data, token, json_kwargs, silent=True)
+
+		return {"name": key}
+
+	def _send(self, method, path, body, token, etag=None, silent=False):
+		""" Sends an already serialized ``body`` to ``path``. """
+
+		request_ref = self.check_token(self.database_url, path, token)
+
+		if silent:
+			request_ref = _add_parameters(request_ref, {'print': 'silent'})
+
+		headers = self.build_headers(token)
+
+		if etag:
+			headers['if-match'] = etag
+
+		request_object = self.requests.request(method, request_ref, headers=headers, data=body)
+
+		if self.cache is not None:
+			self.cache.invalidate(path)
+
+		# ETag didn't match, so we should return the correct one for the user to try again
+		if etag and request_object.status_code == 412:
+			return {'ETag': request_object.headers['ETag']}
+
+		raise_detailed_error(request_object)
+
+		if request_object.status_code == 204:
+			return None
+
+		return self.codec.loads(request_object.content)
+
+	def _commit_batch(self, chunks, token, silent=None):
+		""" Sends the chunks of a :class:`WriteBatch` one after the
+		other.
+		"""
+
+		silent = self._silent(silent)
+
+		results = []
+
+		for chunk in chunks:
+			result = {'path': chunk['path'], 'writes': len(chunk['paths']), 'size': len(chunk['body']), 'response': None, 'error': None}
+
+			try:
+				result['response'] = self._send(chunk['method'], chunk['path'], chunk['body'], token, silent=silent)
+			except RequestException as e:
+				result['error'] = e
+
+			results.append(result)
+
+		return results
+
+	def _get_etag(self, reference, token):
+		""" Sends a ``GET`` request for the reference asking for its
+		ETag.
+		"""
+
+		request_ref = reference.build_request_url(token)
+
+		headers = self.build_headers(token)
+		# extra header to get ETag
+		headers['X-Firebase-ETag'] = 'true'
+		request_object = self.requests.get(request_ref, headers=headers)
+
+		raise_detailed_error(request_object)
+
+		return request_object.headers['ETag']
+
+	def _transaction(self, reference, update_fn, token, max_retries, json_kwargs):
+		""" Reads the data of the reference with its ETag, and writes
+		the result of ``update_fn`` conditionally until it succeeds.
+		"""
+
+		request_ref = self.check_token(self.database_url, reference.path, token)
+
+		headers = self.build_headers(token)
+		headers['X-Firebase-ETag'] = 'true'
+		request_object = self.requests.get(request_ref, headers=headers)
+
+		raise_detailed_error(request_object)
+
+		conflicts = 0
+
+		while True:
+			etag = request_object.headers['ETag']
+
+			try:
+				data = update_fn(self.codec.loads(request_object.content))
+			except Exception:
+				self.transactions.record(reference.path, conflicts, False)
+				raise
+
+			headers = self.build_headers(token)
+			headers['if-match'] = etag
+			request_object = self.requests.put(request_ref, headers=headers, data=self.codec.dumps(data, **json_kwargs))
+
+			# the data changed, the response holds the new data and ETag
+			if request_object.status_code != 412:
+				break
+
+			conflicts += 1
+
+			if conflicts > max_retries:
+				self.transactions.record(reference.path, conflicts, False)
+				raise TransactionAbortedError(reference.path, conflicts)
+
+		if self.cache is not None:
+			self.cache.invalidate(reference.path)
+
+		self.transactions.record(reference.path, conflicts, request_object.ok)
+
+		raise_detailed_error(request_object)
+
+		return self.codec.loads(request_object.content)
+
+	def check_token(self, database_url, path, token):
+		""" Builds Request URL to write/update/remove data.
+
+
+		:type database_url: str
+		:param database_url: ``databaseURL`` from Firebase
+			configuration.
+
+		:type path: str
+		:param path: Path to data.
+
+		:type token: str
+		:param token: Firebase Auth User ID Token
+
+
+		:return: Request URL
+		:rtype: str
+		"""
+
+		if token:
+			return '{0}{1}.json?auth={2}'.format(database_url, path, token)
+		else:
+			return '{0}{1}.json'.format(database_url, path)
+
+	def generate_key(self):
+		""" Generate Firebase's push IDs.
+
+		| For more details:
+		| |firebase-push-id|_
+
+		.. |firebase-push-id| replace::
+			Firebase Blog | The 2^120 Ways to Ensure Unique Identifiers
+
+		.. _firebase-push-id:
+			https://firebase.blog/posts/2015/02/the-2120-ways-to-ensure-unique_68
+
+
+		:return: Firebase's push IDs
+		:rtype: str
+		"""
+
+		return self.push_ids.generate()
+
+	def generate_keys(self, n):
+		""" Generate many of Firebase's push IDs at once, e.g. to write
+		them with a single :meth:`update`.
+
+
+		:type n: int
+		:param n: Number of push IDs to generate.
+
+
+		:return: Firebase's push IDs, in ascending order.
+		:rtype: list
+		"""
+
+		return self.push_ids.generate_many(n)
+
+	def key_timestamp(self, key):
+		""" Time a push ID was generated at.
+
+
+		:type key: str
+		:param key: Firebase's push ID.
+
+
+		:return: Milliseconds since the epoch.
+		:rtype: int
+
+		:raises ValueError: Raised when ``key`` is not a push ID.
+		"""
+
+		return decode_timestamp(key)
+
+	def sort(self, origin, by_key, reverse=False):
+		""" Further sort data based on a child key value.
+
+
+		:type origin: dict
+		:param origin: Data to be sorted (generally the output from
+			:meth:`get` method).
+
+		:type by_key: str
+		:param by_key: Child key name to sort by.
+
+		:type reverse: bool
+		:param reverse: (Optional) Whether to return data in descending
+			order, defaults to :data:`False` (data is returned in
+			ascending order).
+
+
+		:return: Sorted version of the data.
+		:rtype: dict
+		"""
+
+		# unpack firebase objects
+		new_list = [firebase.item for firebase in origin.each()]
+
+		# sort
+		data = sorted(dict(new_list).items(), key=lambda item: item[1][by_key], reverse=reverse)
+
+		return FirebaseResponse(convert_to_firebase(data), origin.key())
+
+
+class AsyncDatabase(Database):
+	""" Firebase Database Service with awaitable requests.
+
+	Paths and queries are built the same way as :class:`Database`,
+	but :meth:`~Reference.get`, :meth:`~Reference.push`,
+	:meth:`~Reference.set`, :meth:`~Reference.update`,
+	:meth:`~Reference.remove`, :meth:`~Reference.get_etag`,
+	:meth:`~Reference.conditional_set` and
+	:meth:`~Reference.conditional_remove` return coroutines, which are
+	sent through a pooled :class:`httpx.AsyncClient`. Any number of
+	requests can be built and then awaited together.
+
+	.. note::
+		Requires the ``async`` extra, i.e.
+		``pip install firebase-rest-api[async]``.
+
+
+	:type credentials: :class:`~google.oauth2.service_account.Credentials`
+	:param credentials: Service Account Credentials.
+
+	:type database_url: str
+	:param database_url: ``databaseURL`` from Firebase configuration.
+
+	:type requests: :class:`~requests.Session`
+	:param requests: Session to make HTTP requests.
+
+	:type codec: :class:`~firebase._json_codec.JSONCodec`
+	:param codec: (Optional) Serializer of request and response
+		bodies, defaults to :data:`None` (standard :mod:`json`).
+
+	:type max_connections: int
+	:param max_connections: (Optional) Maximum number of connections
+		kept open by the async transport, defaults to ``100``.
+
+	:type silent_writes: bool
+	:param silent_writes: (Optional) Whether the server skips sending
+		the written data back by default, defaults to :data:`False`.
+	"""
+
+	def __init__(self, credentials, database_url, requests, codec=None, max_connections=100, silent_writes=False):
+		""" Constructor """
+
+		try:
+			import httpx
+		except ImportError:
+			raise ImportError("AsyncDatabase requires httpx, install it with 'pip install firebase-rest-api[async]'")
+
+		super(AsyncDatabase, self).__init__(credentials, database_url, requests, codec, silent_writes=silent_writes)
+
+		limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+		self.client = httpx.AsyncClient(limits=limits)
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, exc_type, exc_value, traceback):
+		await self.close()
+
+	async def close(self):
+		""" Close the connections held by the async transport. """
+
+		await self.client.aclose()
+
+	async def _build_headers(self, token=None):
+		""" Build Request Header, refreshing the service account
+		credentials in an executor so the event loop is never blocked.
+
+		:type token: str
+		:param token: (Optional) Firebase Auth User ID Token, defaults
+			to :data:`None`.
+
+
+		:return: Request Header.
+		:rtype: dict
+		"""
+
+		if not token and self.token_cache and self.token_cache.expired():
+			loop = asyncio.get_event_loop()
+			await loop.run_in_executor(None, self.token_cache.refresh)
+
+		return self.build_headers(token)
+
+	async def _get(self, reference, token, json_kwargs, ordered=True, parameters=None):
+		request_ref = _add_parameters(reference.build_request_url(token), parameters)
+
+		if self.cache is not None:
+			return await self._get_cached(reference, request_ref, token, json_kwargs, ordered)
+
+		headers = await self._build_headers(token)
+		request_object = await self.client.get(request_ref, headers=headers)
+
+		raise_detailed_async_error(request_object)
+
+		return build_firebase_response(self.codec.loads(request_object.content, **json_kwargs), reference.query, reference.path.split("/")[-1], ordered)
+
+	async def _get_cached(self, reference, request_ref, token, json_kwargs, ordered=True):
+		entry, fresh, generation = self.cache.lookup(request_ref)
+
+		if not fresh:
+			headers = self.cache.request_headers(reference, entry, await self._build_headers(token))
+			request_object = await self.client.get(request_ref, headers=headers)
+
+			raise_detailed_async_error(request_object)
+
+			entry = self.cache.response(request_ref, reference.path, entry, request_object.status_code, request_object.headers.get('ETag'), request_object.content, generation)
+
+		return build_firebase_response(self.codec.loads(entry.content, **json_kwargs), reference.query, reference.path.split("/")[-1], ordered)
+
+	async def _iter_children(self, reference, token, json_kwargs, chunk_size):
+		request_ref = reference.build_request_url(token)
+
+		headers = await self._build_headers(token)
+
+		async with self.client.stream('GET', request_ref, headers=headers) as request_object:
+			if request_object.is_error:
+				await request_object.aread()
+
+			raise_detailed_async_error(request_object)
+
+			parser = JSONItemsParser(**json_kwargs)
+
+			async for chunk in request_object.aiter_bytes(chunk_size):
+				for item in parser.feed(chunk):
+					yield item
+
+			for item in parser.close():
+				yield item
+
+	async def _scan(self, reference, page_size, token, json_kwargs):
+		page = asyncio.ensure_future(self._scan_page(reference.limit_to_first(page_size), None, token, json_kwargs))
+
+		try:
+			while page is not None:
+				items, is_last = await page
+
+				if is_last or not items:
+					page = None
+				else:
+					page = asyncio.ensure_future(self._scan_page(reference.start_at(items[-1][0]).limit_to_first(page_size + 1), items[-1][0], token, json_kwargs))
+
+				for item in items:
+					yield item
+
+		finally:
+			if page is not None:
+				page.cancel()
+
+	async def _scan_page(self, reference, start_key, token, json_kwargs):
+		response = await self._get(reference, token, json_kwargs, False)
+
+		return _scan_items(response.val(), start_key, reference.query["limitToFirst"])
+
+	async def _get_many(self, references, max_workers, token, json_kwargs):
+		semaphore = asyncio.Semaphore(max_workers)
+
+		async def get(reference):
+			async with semaphore:
+				return await self._get(reference, token, json_kwargs)
+
+		return await asyncio.gather(*[get(reference) for reference in references], return_exceptions=True)
+
+	async def _push(self, reference, data, token, json_kwargs, silent):
+		if not self._silent(silent):
+			return await self._write(reference, 'POST', data, token, json_kwargs, silent=False)
+
+		key = self.generate_key()
+		await self._write(reference.child(key), 'PUT', data, token, json_kwargs, silent=True)
+
+		return {"name": key}
+
+	async def _send(self, method, path, body, token, etag=None, silent=False):
+		request_ref = self.check_token(self.database_url, path, token)
+
+		if silent:
+			request_ref = _add_parameters(request_ref, {'print': 'silent'})
+
+		headers = await self._build_headers(token)
+
+		if etag:
+			headers['if-match'] = etag
+
+		request_object = await self.client.request(method, request_ref, headers=headers, content=body)
+
+		if self.cache is not None:
+			self.cache.invalidate(path)
+
+		# ETag didn't match, so we should return the correct one for the user to try again
+		if etag and request_object.status_code == 412:
+			return {'ETag': request_object.headers['ETag']}
+
+		raise_detailed_async_error(request_object)
+
+		if request_object.status_code == 204:
+			return None
+
+		return self.codec.loads(request_object.content)
+
+	async def _commit_batch(self, chunks, token, silent=None):
+		silent = self._silent(silent)
+
+		# paths of the chunks are disjoint, so they can be sent at once
+		responses = await asyncio.gather(*[self._send(chunk['method'], chunk['path'], chunk['body'], token, silent=silent) for chunk in chunks], return_exceptions=True)
+
+		results = []
+
+		for chunk, response in zip(chunks, responses):
+			result = {'path': chunk['path'], 'writes': len(chunk['paths']), 'size': len(chunk['body']), 'response': None, 'error': None}
+
+			if isinstance(response, Exception):
+				result['error'] = response
+			else:
+				result['response'] = response
+
+			results.append(result)
+
+		return results
+
+	async def _get_etag(self, reference, token):
+		request_ref = reference.build_request_url(token)
+
+		headers = await self._build_headers(token)
+		# extra header to get ETag
+		headers['X-Firebase-ETag'] = 'true'
+		request_object = await self.client.get(request_ref, headers=headers)
+
+		raise_detailed_async_error(request_object)
+
+		return request_object.headers['ETag']
+
+	async def _transaction(self, reference, update_fn, token, max_retries, json_kwargs):
+		request_ref = self.check_token(self.database_url, reference.path, token)
+
+		headers = await self._build_headers(token)
+		headers['X-Firebase-ETag'] = 'true'
+		request_object = await self.client.get(request_ref, headers=headers)
+
+		raise_detailed_async_error(request_object)
+
+		conflicts = 0
+
+		while True:
+			etag = request_object.headers['ETag']
+
+			try:
+				data = update_fn(self.codec.loads(request_object.content))
+			except Exception:
+				self.transactions.record(reference.path, conflicts, False)
+				raise
+
+			headers = await self._build_headers(token)
+			headers['if-match'] = etag
+			request_object = await self.client.put(request_ref, headers=headers, content=self.codec.dumps(data, **json_kwargs))
+
+			# the data changed, the response holds the new data and ETag
+			if request_object.status_code != 412:
+				break
+
+			conflicts += 1
+
+			if conflicts > max_retries:
+				self.transactions.record(reference.path, conflicts, False)
+				raise TransactionAbortedError(reference.path, conflicts)
+
+		if self.cache is not None:
+			self.cache.invalidate(reference.path)
+
+		self.transactions.record(reference.path, conflicts, not request_object.is_error)
+
+		raise_detailed_async_error(request_object)
+
+		return self.codec.loads(request_object.content)
+
+
+def _add_parameters(url, parameters):
+	""" Returns ``url`` with the query ``parameters`` added. """
+
+	if not parameters:
+		return url
+
+	if url.endswith('?'):
+		return url + urlencode(parameters)
+
+	return '{0}{1}{2}'.format(url, '&' if '?' in url else '?', urlencode(parameters))
+
+
+def _scan_items(data, start_key, limit):
+	""" Returns the children of a page of a scan in key order, without
+	the child the page started at, and whether it was the last page.
+	"""
+
+	if isinstance(data, dict):
+		items = list(data.items())
+	elif isinstance(data, list):
+		items = [(str(index), value) for index, value in enumerate(data) if value is not None]
+	else:
+		items = []
+
+	is_last = len(items) < limit
+
+	items = sort_items(items, '$key')
+
+	if items and start_key is not None and items[0][0] == start_key:
+		items.pop(0)
+
+	return items, is_last
@@ -0,0 +1,87 @@
+#   Copyright (c) 2022 Asif Arman Rahman
+#   Licensed under MIT (https://github.com/AsifArmanRahman/firebase/blob/main/LICENSE)
+
+# --------------------------------------------------------------------------------------
+
+
+import time
+import random
+import threading
+
+
+class ReconnectBackoff:
+	""" Delays between the attempts to reconnect a stream.
+
+	The delay grows exponentially from the ``retry`` delay of the
+	stream with each failed attempt, up to ``max_retry``. With
+	``jitter``, a random delay up to that value is used instead, so
+	streams dropped at the same time don't reconnect in lockstep. An
+	instance can be shared by many streams, to bound the rate at which
+	they reconnect altogether.
+
+
+	:type max_retry: int
+	:param max_retry: (Optional) Maximum delay in milliseconds,
+		defaults to ``60000``.
+
+	:type multiplier: int or float
+	:param multiplier: (Optional) Growth of the delay after each failed
+		attempt, defaults to ``2``.
+
+	:type jitter: bool
+	:param jitter: (Optional) Whether the delay is randomized, defaults
+		to :data:`True`.
+
+	:type max_reconnects_per_minute: int
+	:param max_reconnects_per_minute: (Optional) Maximum number of
+		attempts per minute, which are spread evenly, defaults to
+		:data:`None` (no limit).
+	"""
+
+	def __init__(self, max_retry=60000, multiplier=2, jitter=True, max_reconnects_per_minute=None):
+		""" Constructor """
+
+		self.max_retry = max_retry
+		self.multiplier = multiplier
+		self.jitter = jitter
+		self.max_reconnects_per_minute = max_reconnects_per_minute
+
+		self._next_attempt = 0.0
+		self._lock = threading.Lock()
+
+	def delay(self, retry, attempt):
+		""" Seconds to wait before an attempt to reconnect.
+
+
+		:type retry: int
+		:param retry: Retry delay of the stream in milliseconds, as
+			last requested by the server.
+
+		:type attempt: int
+		:param attempt: Number of failed attempts since the stream was
+			last connected.
+
+
+		:return: Seconds to wait.
+		:rtype: float
+		"""
+
+		# the delay stops growing long before the exponent overflows
+		delay = min(retry * self.multiplier ** min(attempt, 64), self.max_retry) / 1000.0
+
+		if self.jitter:
+			delay = random.uniform(0, delay)
+
+		if not self.max_reconnects_per_minute:
+			return delay
+
+		# attempts are spread at least this far apart
+		interval = 60.0 / self.max_reconnects_per_minute
+
+		with self._lock:
+			now = time.monotonic()
+			attempt_at = max(now + delay, self._next_attempt)
+
+			self._next_attempt = attempt_at + interval
+
+		return attempt_at - now
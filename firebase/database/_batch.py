@@ -0,0 +1,304 @@
+#   Copyright (c) 2022 Asif Arman Rahman
+#   Licensed under MIT (https://github.com/AsifArmanRahman/firebase/blob/main/LICENSE)
+
+# --------------------------------------------------------------------------------------
+
+
+import json
+
+from ._server_values import increment, is_server_value
+
+
+class WriteBatch:
+	""" Collects writes to any number of paths, and sends them as
+	multi-location updates.
+
+	Writes are grouped into chunks bounded by ``max_payload_size``
+	(and optionally ``max_writes``), and each chunk is sent as a single
+	``PATCH`` request to the deepest path common to all of its writes.
+
+	A write to a path which is an ancestor of a previous write in the
+	batch replaces it, while a write to a path below a previous write
+	is merged into its value, so the batch always holds disjoint paths.
+
+
+	:type reference: :class:`~firebase.database.Reference`
+	:param reference: Reference the paths of the batch are relative to.
+
+	:type max_payload_size: int
+	:param max_payload_size: (Optional) Maximum size in bytes of the
+		body of a single request, defaults to ``16 MB``.
+
+	:type max_writes: int
+	:param max_writes: (Optional) Maximum number of paths written by a
+		single request, defaults to :data:`None` (no limit).
+	"""
+
+	def __init__(self, reference, max_payload_size=16 * 1024 * 1024, max_writes=None):
+		""" Constructor """
+
+		self._reference = reference
+		self._max_payload_size = max_payload_size
+		self._max_writes = max_writes
+
+		self._writes = {}
+		self._ancestors = {}
+
+		self.results = None
+
+	def __len__(self):
+		return len(self._writes)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		if exc_type is None:
+			self.results = self.commit()
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, exc_type, exc_value, traceback):
+		if exc_type is None:
+			self.results = await self.commit()
+
+	def set(self, path, data):
+		""" Add a write of ``data`` at ``path`` to the batch.
+
+
+		:type path: str
+		:param path: Path to data, relative to the reference the batch
+			was created from.
+
+		:type data: dict
+		:param data: Data to be stored in database.
+
+
+		:return: A reference to the instance object.
+		:rtype: WriteBatch
+		"""
+
+		segments = _split_path(self._reference.path) + _split_path(path)
+
+		self._add(segments, data)
+
+		return self
+
+	def update(self, path, data):
+		""" Add a write of every child of ``data`` below ``path`` to the
+		batch, same as :meth:`~firebase.database.Reference.update`.
+
+
+		:type path: str
+		:param path: Path to data, relative to the reference the batch
+			was created from.
+
+		:type data: dict
+		:param data: Data to be updated, keys may be paths themselves.
+
+
+		:return: A reference to the instance object.
+		:rtype: WriteBatch
+		"""
+
+		for key, value in data.items():
+			self.set("{0}/{1}".format(path, key), value)
+
+		return self
+
+	def remove(self, path):
+		""" Add a removal of ``path`` to the batch.
+
+
+		:type path: str
+		:param path: Path to data, relative to the reference the batch
+			was created from.
+
+
+		:return: A reference to the instance object.
+		:rtype: WriteBatch
+		"""
+
+		return self.set(path, None)
+
+	def increment(self, path, delta=1):
+		""" Add an increment of the number at ``path`` by ``delta`` to
+		the batch, computed by the server.
+
+
+		:type path: str
+		:param path: Path to data, relative to the reference the batch
+			was created from.
+
+		:type delta: int or float
+		:param delta: (Optional) Amount to add, negative to subtract,
+			defaults to ``1``.
+
+
+		:return: A reference to the instance object.
+		:rtype: WriteBatch
+		"""
+
+		return self.set(path, increment(delta))
+
+	def commit(self, token=None, json_kwargs={}, silent=None):
+		""" Send the writes of the batch, and empty it.
+
+		A failed chunk does not stop the remaining ones from being
+		sent, its error is reported in the results instead.
+
+
+		:type token: str
+		:param token: (Optional) Firebase Auth User ID Token, defaults
+			to :data:`None`.
+
+		:type json_kwargs: dict
+		:param json_kwargs: (Optional) Keyword arguments to send to
+			:func:`json.dumps` method for serialization of data,
+			defaults to :data:`{}` (empty :class:`dict` object).
+
+		:type silent: bool
+		:param silent: (Optional) Whether the server skips sending the
+			written data back, defaults to :data:`None` (the
+			``silent_writes`` setting of the database).
+
+
+		:return: A result for each request sent, containing the
+			``path`` it was sent to, the number of ``writes`` and the
+			``size`` of its body, along with the ``response`` of a
+			successful attempt (:data:`None` when ``silent``) or the
+			``error`` of a failed one.
+		:rtype: list
+		"""
+
+		chunks = self._chunks(json_kwargs)
+
+		self._writes = {}
+		self._ancestors = {}
+
+		return self._reference._database._commit_batch(chunks, token, silent)
+
+	def _add(self, segments, data):
+		""" Add a write, keeping the paths of the batch disjoint. """
+
+		path = "/".join(segments)
+
+		# merge into a previous write to an ancestor path
+		for i in range(len(segments)):
+			ancestor = "/".join(segments[:i])
+
+			if ancestor in self._writes:
+				self._writes[ancestor] = _merge(self._writes[ancestor], segments[i:], data)
+				return
+
+		# replace previous writes to descendant paths
+		if path in self._ancestors:
+			prefix = path + "/" if path else ""
+
+			for descendant in [key for key in self._writes if key.startswith(prefix)]:
+				self._discard(descendant)
+
+		if path not in self._writes:
+			for i in range(len(segments)):
+				ancestor = "/".join(segments[:i])
+				self._ancestors[ancestor] = self._ancestors.get(ancestor, 0) + 1
+
+		self._writes[path] = data
+
+	def _discard(self, path):
+		del self._writes[path]
+
+		segments = path.split("/")
+
+		for i in range(len(segments)):
+			ancestor = "/".join(segments[:i])
+			self._ancestors[ancestor] -= 1
+
+			if not self._ancestors[ancestor]:
+				del self._ancestors[ancestor]
+
+	def _chunks(self, json_kwargs):
+		""" Split the writes of the batch into request bodies. """
+
+		chunks = []
+
+		paths = []
+		values = []
+		size = 2
+
+		codec = self._reference._database.codec
+
+		for path, data in self._writes.items():
+			value = codec.dumps(data, **json_kwargs)
+
+			# the absolute path bounds the size of the relative one
+			entry_size = len(path.encode("utf-8")) + len(value) + 4
+
+			if paths and (size + entry_size > self._max_payload_size or len(paths) == self._max_writes):
+				chunks.append(_build_chunk(paths, values))
+
+				paths = []
+				values = []
+				size = 2
+
+			paths.append(path)
+			values.append(value)
+			size += entry_size
+
+		if paths:
+			chunks.append(_build_chunk(paths, values))
+
+		return chunks
+
+
+def _split_path(path):
+	return [segment for segment in str(path).split("/") if segment]
+
+
+def _merge(value, segments, data):
+	""" Returns a copy of ``value`` with ``data`` set at the path of
+	``segments`` below it.
+	"""
+
+	root = dict(value) if isinstance(value, dict) and not is_server_value(value) else {}
+	node = root
+
+	for segment in segments[:-1]:
+		child = node.get(segment)
+		child = dict(child) if isinstance(child, dict) and not is_server_value(child) else {}
+
+		node[segment] = child
+		node = child
+
+	node[segments[-1]] = data
+
+	return root
+
+
+def _build_chunk(paths, values):
+	""" Builds the body of a multi-location update, sent to the
+	deepest common ancestor of ``paths``.
+	"""
+
+	split_paths = [path.split("/") if path else [] for path in paths]
+
+	# a write to the root of database can only be sent as it is
+	if len(paths) == 1 and not split_paths[0]:
+		return {'method': 'PUT', 'path': "", 'paths': paths, 'body': values[0]}
+
+	common = min(len(segments) for segments in split_paths) - 1
+
+	for i in range(common):
+		if any(segments[i] != split_paths[0][i] for segments in split_paths):
+			common = i
+			break
+
+	ancestor = "/".join(split_paths[0][:common])
+
+	body = b",".join(
+		json.dumps("/".join(segments[common:])).encode("utf-8") + b":" + value
+		for segments, value in zip(split_paths, values)
+	)
+
+	return {'method': 'PATCH', 'path': ancestor, 'paths': paths, 'body': b"{" + body + b"}"}
@@ -0,0 +1,216 @@
+#   Copyright (c) 2022 Asif Arman Rahman
+#   Licensed under MIT (https://github.com/AsifArmanRahman/firebase/blob/main/LICENSE)
+
+# --------------------------------------------------------------------------------------
+
+
+import time
+import threading
+from collections import OrderedDict
+
+
+class _CacheEntry:
+
+	__slots__ = ('path', 'etag', 'content', 'stored_at')
+
+	def __init__(self, path, etag, content, stored_at):
+		self.path = path
+		self.etag = etag
+		self.content = content
+		self.stored_at = stored_at
+
+
+class ReadCache:
+	""" Least recently used cache of responses to ``GET`` requests,
+	keyed by their request URL.
+
+	Responses younger than ``ttl`` are served without any request,
+	older ones are revalidated with their ETag when available, or
+	downloaded again otherwise. Writes sent through the database drop
+	every cached response overlapping with the written path.
+
+	The REST API only documents ETags for conditional writes, so a
+	server may ignore ``if-none-match`` and send the data again instead
+	of ``304 Not Modified``. Such a response is still recognised as
+	unchanged by its ETag, and counted apart from revalidations.
+
+	A response received after a write invalidated the cache, while its
+	request was running, may predate the write. It is served to its
+	caller but not cached.
+
+
+	:type max_entries: int
+	:param max_entries: (Optional) Maximum number of responses kept,
+		defaults to ``1024``.
+
+	:type ttl: int or float
+	:param ttl: (Optional) Seconds a response is served without being
+		revalidated, defaults to ``30``.
+
+	:type revalidate: bool
+	:param revalidate: (Optional) Whether expired responses are
+		revalidated with their ETag instead of being downloaded again,
+		defaults to :data:`True`.
+	"""
+
+	def __init__(self, max_entries=1024, ttl=30, revalidate=True):
+		""" Constructor """
+
+		self.max_entries = max_entries
+		self.ttl = ttl
+		self.revalidate = revalidate
+
+		self._entries = OrderedDict()
+		self._lock = threading.Lock()
+
+		# bumped on every invalidation, to detect the responses to
+		# requests which were running at the time
+		self._generation = 0
+
+		self.hits = 0
+		self.misses = 0
+		self.revalidations = 0
+		self.unchanged = 0
+		self.evictions = 0
+
+	def __len__(self):
+		return len(self._entries)
+
+	def lookup(self, url):
+		""" Returns the cached entry for ``url``, whether it can be
+		served without a request, and the generation of the cache to be
+		passed on to :meth:`response`.
+		"""
+
+		with self._lock:
+			generation = self._generation
+			entry = self._entries.get(url)
+
+			if entry is None:
+				return None, False, generation
+
+			self._entries.move_to_end(url)
+
+			if time.monotonic() - entry.stored_at < self.ttl:
+				self.hits += 1
+				return entry, True, generation
+
+			if not (self.revalidate and entry.etag):
+				return None, False, generation
+
+			return entry, False, generation
+
+	def request_headers(self, reference, entry, headers):
+		""" Adds the headers asking for the ETag of the response, and
+		for revalidation of the cached ``entry`` if any.
+		"""
+
+		# ETags are not available for queries
+		if not reference.query:
+			headers['X-Firebase-ETag'] = 'true'
+
+			if entry is not None:
+				headers['if-none-match'] = entry.etag
+
+		return headers
+
+	def response(self, url, path, entry, status_code, etag, content, generation):
+		""" Caches the ``content`` of a response for ``url``, or marks
+		the cached ``entry`` as fresh again if the server confirmed it
+		hasn't changed.
+
+		Nothing is cached if the cache was invalidated since
+		``generation`` was returned by :meth:`lookup`.
+
+
+		:return: The entry to be served.
+		:rtype: _CacheEntry
+		"""
+
+		with self._lock:
+			current = generation == self._generation
+
+			if entry is not None and status_code == 304:
+				self.revalidations += 1
+
+				if current:
+					entry.stored_at = time.monotonic()
+
+				return entry
+
+			# the data was sent again, though it hasn't changed
+			if entry is not None and etag is not None and etag == entry.etag:
+				self.unchanged += 1
+
+				if current:
+					entry.stored_at = time.monotonic()
+
+				return entry
+
+			self.misses += 1
+
+			entry = _CacheEntry(path, etag, content, time.monotonic())
+
+			if not current:
+				return entry
+
+			self._entries[url] = entry
+			self._entries.move_to_end(url)
+
+			while len(self._entries) > self.max_entries:
+				self._entries.popitem(last=False)
+				self.evictions += 1
+
+			return entry
+
+	def invalidate(self, path):
+		""" Drops every cached response for ``path``, its ancestors or
+		its descendants.
+		"""
+
+		with self._lock:
+			self._generation += 1
+
+			for url in [url for url, entry in self._entries.items() if _overlaps(entry.path, path)]:
+				del self._entries[url]
+
+	def clear(self):
+		""" Drops every cached response. """
+
+		with self._lock:
+			self._generation += 1
+			self._entries.clear()
+
+	def stats(self):
+		""" Counters of the cache.
+
+
+		:return: Number of ``hits`` served from the cache,
+			``revalidations`` confirmed by the server without sending
+			the data, ``unchanged`` responses sent again with the same
+			ETag, ``misses`` downloaded, ``evictions`` and the current
+			``size``.
+		:rtype: dict
+		"""
+
+		with self._lock:
+			return {
+				'hits': self.hits,
+				'revalidations': self.revalidations,
+				'unchanged': self.unchanged,
+				'misses': self.misses,
+				'evictions': self.evictions,
+				'size': len(self._entries),
+			}
+
+
+def _overlaps(path, other):
+	""" Whether one of the paths is the same as, or below, the other. """
+
+	path = path.strip("/")
+	other = other.strip("/")
+
+	if not path or not other or path == other:
+		return True
+
+	return path.startswith(other + "/") or other.startswith(path + "/")
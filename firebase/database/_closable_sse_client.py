@@ -25,6 +25,11 @@ class ClosableSSEClient(SSEClient):
 	def close(self):
 		self.should_connect = False
 		self.retry = 0
-
-		self.resp.raw._fp.fp.raw._sock.shutdown(socket.SHUT_RDWR)
-		self.resp.raw._fp.fp.raw._sock.close()
+		self._closing.set()
+
+		# the connection may already be closed, e.g. by a cancel event
+		try:
+			self.resp.raw._fp.fp.raw._sock.shutdown(socket.SHUT_RDWR)
+			self.resp.raw._fp.fp.raw._sock.close()
+		except (AttributeError, OSError):
+			self.resp.close()
@@ -0,0 +1,221 @@
+#   Copyright (c) 2022 Asif Arman Rahman
+#   Licensed under MIT (https://github.com/AsifArmanRahman/firebase/blob/main/LICENSE)
+
+# --------------------------------------------------------------------------------------
+
+
+import time
+import threading
+
+
+# number of queued events a put looks back at for the ones it replaces
+_LOOKBACK = 32
+
+
+class EventCoalescer:
+	""" Queue of stream events, merged while they wait, which calls the
+	handler with a batch of them at most once per ``window``.
+
+	Consecutive ``patch`` events to the same path are merged into one,
+	and a ``put`` replaces the queued events at or below its path, so
+	the batch leaves the data in the same state as the events it was
+	made of.
+
+
+	:type handler: function
+	:param handler: Function called with each batch of events.
+
+	:type window: int or float
+	:param window: Seconds an event waits for others to be merged with.
+	"""
+
+	def __init__(self, handler, window):
+		""" Constructor """
+
+		self.handler = handler
+		self.window = window
+
+		self.received = 0
+		self.batches = 0
+
+		self._pending = []
+		self._below = {}
+		self._closed = False
+		self._condition = threading.Condition()
+
+		self._thread = threading.Thread(target=self._run, daemon=True)
+		self._thread.start()
+
+	def add(self, message):
+		""" Queue an event, merged with the queued ones if possible. """
+
+		with self._condition:
+			self.received += 1
+
+			self._below = _merge(self._pending, message, self._below)
+
+			self._condition.notify()
+
+	def close(self, wait=True):
+		""" Call the handler with the queued events, then stop.
+
+
+		:type wait: bool
+		:param wait: (Optional) Whether to wait for the handler to
+			return, defaults to :data:`True`.
+		"""
+
+		with self._condition:
+			self._closed = True
+			self._condition.notify()
+
+		if wait and self._thread is not threading.current_thread():
+			self._thread.join()
+
+	def stats(self):
+		""" Number of events ``received``, and of ``batches`` the handler
+		was called with.
+		"""
+
+		return {
+			'received': self.received,
+			'batches': self.batches,
+		}
+
+	def _run(self):
+		while True:
+			with self._condition:
+				while not self._pending and not self._closed:
+					self._condition.wait()
+
+				if not self._pending:
+					return
+
+				# events arriving within the window join the batch
+				deadline = time.monotonic() + self.window
+
+				while not self._closed and self._pending[-1]["event"] != 'cancel':
+					remaining = deadline - time.monotonic()
+
+					if remaining <= 0:
+						break
+
+					self._condition.wait(remaining)
+
+				batch, self._pending = self._pending, []
+				self._below = {}
+				self.batches += 1
+
+			self.handler(batch)
+
+
+def _merge(pending, message, below):
+	""" Adds ``message`` to the ``pending`` events, merging it with the
+	last one or replacing those it overwrites.
+
+	``below`` maps each path to the keys below it of the last event,
+	if it is a ``patch``, and is returned updated for the new last one.
+	"""
+
+	event = message["event"]
+	path = message.get("path")
+	data = message.get("data")
+
+	# deletes also remove the parents left empty, which depends on the
+	# events before, so only values replace queued events
+	if event == 'put' and path is not None and data is not None:
+		path = path.strip("/")
+		start = max(len(pending) - _LOOKBACK, 0)
+
+		pending[start:] = [queued for queued in pending[start:] if not _covers(path, queued)]
+
+	elif event == 'patch' and pending and isinstance(data, dict):
+		last = pending[-1]
+
+		if last["event"] == 'patch' and last["path"] == path and _can_merge(last["data"], data, below):
+			merged = last["data"]
+
+			for new_key in data:
+				for key in list(below.get(new_key, ())):
+					del merged[key]
+					_unindex(below, key)
+
+			for new_key in data:
+				if new_key not in merged:
+					_index(below, new_key)
+
+			merged.update(data)
+
+			pending[-1] = dict(message, data=merged)
+			return below
+
+	pending.append(message)
+
+	below = {}
+
+	if event == 'patch' and isinstance(data, dict):
+		for key in data:
+			_index(below, key)
+
+	return below
+
+
+def _index(below, key):
+	segments = key.split("/")
+
+	for end in range(1, len(segments)):
+		below.setdefault("/".join(segments[:end]), set()).add(key)
+
+
+def _unindex(below, key):
+	segments = key.split("/")
+
+	for end in range(1, len(segments)):
+		below["/".join(segments[:end])].discard(key)
+
+
+def _covers(path, queued):
+	""" Whether a ``put`` at ``path`` overwrites all of ``queued``. """
+
+	if queued["event"] not in ('put', 'patch') or queued.get("path") is None:
+		return False
+
+	if queued["event"] == 'put':
+		return _is_within(queued["path"], path)
+
+	return all(_is_within(_join(queued["path"], key), path) for key in queued["data"])
+
+
+def _can_merge(data, new_data, below):
+	""" Whether applying ``new_data`` after ``data`` is the same as
+	applying both as one patch, i.e. no key of ``new_data`` is below a
+	key of ``data``, nor deletes one.
+	"""
+
+	if not isinstance(data, dict):
+		return False
+
+	for new_key, value in new_data.items():
+		segments = new_key.split("/")
+
+		for end in range(1, len(segments)):
+			if "/".join(segments[:end]) in data:
+				return False
+
+		if value is None and (new_key in data or below.get(new_key)):
+			return False
+
+	return True
+
+
+def _is_within(path, parent):
+	""" Whether ``path`` is ``parent`` itself or below it. """
+
+	path = path.strip("/")
+	parent = parent.strip("/")
+
+	return not parent or path == parent or path.startswith(parent + "/")
+
+
+def _join(path, key):
+	return "{0}/{1}".format(path.strip("/"), key.strip("/")).strip("/")
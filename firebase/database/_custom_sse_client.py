@@ -8,23 +8,41 @@
 import re
 import six
 import time
+import urllib3
 import requests
 import warnings
+import threading
 
+from ._backoff import ReconnectBackoff
 
-# Technically, we should support streams that mix line endings.  This regex,
+
+# Technically, we should support streams that mix line endings.  This parser,
 # however, assumes that a system will provide consistent line endings.
-end_of_field = re.compile(r'\r\n\r\n|\r\r|\n\n')
+end_of_field = (b'\r\n\r\n', b'\r\r', b'\n\n')
+
+# bytes a separator can span, so it can start before the unsearched data
+_SEPARATOR_OVERLAP = 3
 
 
 class SSEClient(object):
 
-	def __init__(self, url, session, build_headers, last_id=None, retry=3000, **kwargs):
+	def __init__(self, url, session, build_headers, last_id=None, retry=3000, chunk_size=64 * 1024, backoff=None, on_reconnect=None, **kwargs):
 		self.url = url
 		self.last_id = last_id
 		self.retry = retry
+		self.chunk_size = chunk_size
 		self.running = True
 
+		# delays between reconnections, and function told of each one
+		self.backoff = backoff or ReconnectBackoff()
+		self.on_reconnect = on_reconnect
+		self._closing = threading.Event()
+
+		self.reconnects = 0
+		self.reconnect_seconds = 0.0
+		self.discarded_bytes = 0
+		self._failures = 0
+
 		# Optional support for passing in a requests.Session()
 		self.session = session
 
@@ -44,8 +62,10 @@ class SSEClient(object):
 		# The 'Accept' header is not required, but explicit > implicit
 		self.requests_kwargs['headers']['Accept'] = 'text/event-stream'
 
-		# Keep data here as it streams in
-		self.buf = u''
+		# Keep data here as it streams in, events are only decoded once
+		# complete, and the buffer is never searched twice
+		self.buf = bytearray()
+		self._search_start = 0
 
 		self._connect()
 
@@ -60,46 +80,61 @@ class SSEClient(object):
 		self.requester = self.session or requests
 		self.resp = self.requester.get(self.url, stream=True, **self.requests_kwargs)
 
-		self.resp_iterator = self.resp.iter_content(decode_unicode=True)
+		self.resp_iterator = _iter_chunks(self.resp, self.chunk_size)
 
 		# TODO: Ensure we're handling redirects.  Might also stick the 'origin'
 		# attribute on Events like the Javascript spec requires.
 		self.resp.raise_for_status()
 
-	def _event_complete(self):
-		return re.search(end_of_field, self.buf) is not None
+	def _event_end(self):
+		""" Returns where the first complete event of the buffer ends,
+		and the length of its separator, or ``-1`` if there is none.
+		"""
+
+		end = -1
+		separator_length = 0
+
+		for separator in end_of_field:
+			index = self.buf.find(separator, self._search_start)
+
+			if index != -1 and (end == -1 or index < end):
+				end = index
+				separator_length = len(separator)
+
+		return end, separator_length
 
 	def __iter__(self):
 		return self
 
 	def __next__(self):
-		while not self._event_complete():
+		end, separator_length = self._event_end()
+
+		while end == -1:
+			self._search_start = max(len(self.buf) - _SEPARATOR_OVERLAP, 0)
 
 			try:
-				nextchar = next(self.resp_iterator)
-				self.buf += nextchar
-			except (StopIteration, requests.RequestException):
-				time.sleep(self.retry / 1000.0)
-				self._connect()
+				self.buf += next(self.resp_iterator)
+			except (StopIteration, requests.RequestException) as e:
+				self._reconnect(e)
 
-				# The SSE spec only supports resuming from a whole message, so
-				# if we have half a message we should throw it out.
-				head, sep, tail = self.buf.rpartition('\n')
-				self.buf = head + sep
-				continue
+			end, separator_length = self._event_end()
 
-		split = re.split(end_of_field, self.buf)
-		head = split[0]
-		tail = "".join(split[1:])
+		with memoryview(self.buf) as view:
+			head = str(view[:end], 'utf-8')
+
+		del self.buf[:end + separator_length]
+		self._search_start = 0
+		self._failures = 0
 
-		self.buf = tail
 		msg = Event.parse(head)
 
-		if msg.data == "credential is no longer valid":
+		if msg.event == 'auth_revoked' or msg.data == "credential is no longer valid":
 			self._connect()
 			return None
 
-		if msg.data == 'null':
+		# keep-alive and other events without data are skipped, while
+		# cancel events, which have none either, are passed on
+		if msg.data == 'null' and msg.event != 'cancel':
 			return None
 
 		# If the server requests a specific retry delay, we need to honor it.
@@ -113,10 +148,97 @@ class SSEClient(object):
 
 		return msg
 
+	def _reconnect(self, error):
+		""" Connect again after waiting as long as the backoff requires,
+		until an attempt succeeds.
+		"""
+
+		started = time.monotonic()
+
+		# The SSE spec only supports resuming from a whole message, so
+		# if we have half a message we should throw it out.
+		discarded = len(self.buf)
+		self.buf.clear()
+		self._search_start = 0
+
+		attempts = 0
+
+		while True:
+
+			# the wait ends early when the client is closed
+			if self.running:
+				self._closing.wait(self.backoff.delay(self.retry, self._failures))
+
+			attempts += 1
+			self._failures += 1
+
+			try:
+				self._connect()
+				break
+			except requests.RequestException as e:
+				error = e
+
+		seconds = time.monotonic() - started
+
+		self.reconnects += 1
+		self.reconnect_seconds += seconds
+		self.discarded_bytes += discarded
+
+		if self.on_reconnect:
+			self.on_reconnect({
+				'reconnects': self.reconnects,
+				'attempts': attempts,
+				'seconds': seconds,
+				'discarded_bytes': discarded,
+				'error': error,
+			})
+
+	def stats(self):
+		""" Number of ``reconnects``, total ``reconnect_seconds`` spent
+		reconnecting and ``discarded_bytes`` of half received events.
+		"""
+
+		return {
+			'reconnects': self.reconnects,
+			'reconnect_seconds': self.reconnect_seconds,
+			'discarded_bytes': self.discarded_bytes,
+		}
+
 	if six.PY2:
 		next = __next__
 
 
+def _iter_chunks(resp, chunk_size):
+	""" Iterate over the bytes of a streamed response as they arrive,
+	up to ``chunk_size`` at once, without waiting for a full chunk.
+	"""
+
+	raw = resp.raw
+
+	# chunked responses are read one transfer chunk at a time
+	if getattr(raw, 'chunked', False):
+		return resp.iter_content(chunk_size=chunk_size)
+
+	if hasattr(raw, 'read1'):
+		return _read1_chunks(raw, chunk_size)
+
+	# older versions of urllib3 would wait for a whole chunk instead
+	return resp.iter_content(chunk_size=1)
+
+
+def _read1_chunks(raw, chunk_size):
+	while True:
+		try:
+			chunk = raw.read1(chunk_size, decode_content=True)
+		except (urllib3.exceptions.HTTPError, OSError) as e:
+			raise requests.exceptions.ConnectionError(e)
+
+		if not chunk:
+			return
+
+		yield chunk
+
+
 class Event(object):
 
 	sse_line_pattern = re.compile('(?P<name>[^:]*):?( ?(?P<value>.*))?')
@@ -152,7 +274,7 @@ class Event(object):
 		"""
 		msg = cls()
 
-		for line in raw.split('\n'):
+		for line in raw.replace('\r\n', '\n').replace('\r', '\n').split('\n'):
 			m = cls.sse_line_pattern.match(line)
 
 			if m is None:
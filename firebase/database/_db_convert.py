@@ -7,9 +7,13 @@
 
 from collections import OrderedDict
 
+from ._ordering import sort_items
+
 
 class FirebaseKeyValue:
 
+	__slots__ = ('item',)
+
 	def __init__(self, item):
 		self.item = item
 
@@ -21,59 +25,113 @@ class FirebaseKeyValue:
 
 
 class FirebaseResponse:
+	""" Response of a read request.
+
+	The decoded data is kept as it is, and the :class:`FirebaseKeyValue`
+	of each child are only created once :meth:`each` or
+	:meth:`__getitem__` is called.
+
+
+	:type data: dict or list or bool or int or float or str
+	:param data: Decoded data, or a list of :class:`FirebaseKeyValue`.
+
+	:type query_key: str
+	:param query_key: Last key of the requested path.
+	"""
+
+	__slots__ = ('_data', '_firebases', '_wrapped', 'query_key')
 
-	def __init__(self, firebases, query_key):
-		self.firebases = firebases
+	def __init__(self, data, query_key):
+		self._data = data
 		self.query_key = query_key
 
-	def __getitem__(self, index):
-		return self.firebases[index]
+		# data already converted with convert_to_firebase
+		self._wrapped = isinstance(data, list) and len(data) > 0 and isinstance(data[0], FirebaseKeyValue)
+		self._firebases = data if self._wrapped else None
 
-	def val(self):
-		if isinstance(self.firebases, list):
+	def __getitem__(self, index):
+		firebases = self.each()
 
-			# unpack firebases into OrderedDict
-			firebase_list = []
+		if firebases is None:
+			return self._data[index]
 
-			# if firebase response was a list
-			if isinstance(self.firebases[0].key(), int):
+		return firebases[index]
 
-				for firebase in self.firebases:
-					firebase_list.append(firebase.val())
+	def val(self):
+		if self._wrapped:
 
-				return firebase_list
+			# if firebase response was a list
+			if isinstance(self._firebases[0].key(), int):
+				return [firebase.val() for firebase in self._firebases]
 
 			# if firebase response was a dict with keys
-			for firebase in self.firebases:
-				firebase_list.append((firebase.key(), firebase.val()))
+			return OrderedDict(firebase.item for firebase in self._firebases)
 
-			return OrderedDict(firebase_list)
+		if isinstance(self._data, dict):
+			return OrderedDict(self._data)
 
-		else:
+		if isinstance(self._data, list):
+			return list(self._data)
 
-			return self.firebases
+		return self._data
 
 	def key(self):
 		return self.query_key
 
 	def each(self):
-		if isinstance(self.firebases, list):
-			return self.firebases
+		if self._firebases is None:
 
+			if isinstance(self._data, dict):
+				self._firebases = convert_to_firebase(self._data.items())
 
-def convert_to_firebase(items):
-	firebase_list = []
+			elif isinstance(self._data, list):
+				self._firebases = convert_list_to_firebase(self._data)
 
-	for item in items:
-		firebase_list.append(FirebaseKeyValue(item))
+		return self._firebases
 
-	return firebase_list
+
+def convert_to_firebase(items):
+	return [FirebaseKeyValue(item) for item in items]
 
 
 def convert_list_to_firebase(items):
-	firebase_list = []
+	return [FirebaseKeyValue(item) for item in enumerate(items)]
+
+
+def build_firebase_response(request_dict, build_query, query_key, ordered=True):
+	""" Wraps decoded data from a ``GET`` request in a
+	:class:`FirebaseResponse`, sorted as per the query.
+
+
+	:type request_dict: dict or list or bool or int or float or str
+	:param request_dict: Decoded response body.
+
+	:type build_query: dict
+	:param build_query: Query parameters the request was made with.
+
+	:type query_key: str
+	:param query_key: Last key of the requested path.
+
+	:type ordered: bool
+	:param ordered: (Optional) Whether children are sorted in the
+		order of the query, defaults to :data:`True`.
+
+
+	:return: Response wrapped for :meth:`FirebaseResponse.each`,
+		:meth:`FirebaseResponse.val` and :meth:`FirebaseResponse.key`.
+	:rtype: FirebaseResponse
+	"""
+
+	# if primitive, list or simple query return
+	if not isinstance(request_dict, dict) or not build_query:
+		return FirebaseResponse(request_dict, query_key)
+
+	# return keys if shallow
+	if build_query.get("shallow"):
+		return FirebaseResponse(request_dict.keys(), query_key)
 
-	for item in items:
-		firebase_list.append(FirebaseKeyValue([items.index(item), item]))
+	# otherwise sort, the server doesn't keep the order in JSON
+	if ordered and build_query.get("orderBy"):
+		request_dict = dict(sort_items(request_dict.items(), build_query["orderBy"]))
 
-	return firebase_list
+	return FirebaseResponse(request_dict, query_key)
@@ -0,0 +1,221 @@
+#   Copyright (c) 2022 Asif Arman Rahman
+#   Licensed under MIT (https://github.com/AsifArmanRahman/firebase/blob/main/LICENSE)
+
+# --------------------------------------------------------------------------------------
+
+
+import threading
+
+from ._cache import _overlaps
+
+
+class Mirror:
+	""" In-memory copy of the data at a path, kept up to date by a
+	stream of its changes.
+
+	The first ``put`` event of the stream holds the whole data, every
+	following ``put`` and ``patch`` is applied to the local copy, so
+	reads are answered from memory. When the stream is cancelled by
+	the server, e.g. after the security rules changed, the copy stops
+	being updated and :attr:`cancelled` is set.
+
+
+	:type reference: :class:`~firebase.database.Reference`
+	:param reference: Reference to the path to mirror.
+
+	:type token: str
+	:param token: (Optional) Firebase Auth User ID Token, defaults
+		to :data:`None`.
+	"""
+
+	def __init__(self, reference, token=None):
+		""" Constructor """
+
+		self.reference = reference
+		self.cancelled = False
+
+		self._data = None
+		self._lock = threading.Lock()
+		self._ready = threading.Event()
+		self._listeners = []
+
+		self._stream = reference.stream(self._handle_event, token=token)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	@property
+	def ready(self):
+		""" Whether the initial data has been received. """
+
+		return self._ready.is_set()
+
+	def wait(self, timeout=None):
+		""" Block until the initial data has been received.
+
+
+		:type timeout: int or float
+		:param timeout: (Optional) Maximum number of seconds to wait,
+			defaults to :data:`None` (no limit).
+
+
+		:return: Whether the initial data has been received.
+		:rtype: bool
+		"""
+
+		return self._ready.wait(timeout)
+
+	def get(self, path=""):
+		""" Read data from the local copy.
+
+
+		:type path: str
+		:param path: (Optional) Path relative to the mirrored path,
+			defaults to the mirrored path itself.
+
+
+		:return: A copy of the data at the path, :data:`None` if there
+			is none.
+		:rtype: dict or list or bool or int or float or str
+		"""
+
+		with self._lock:
+			node = self._data
+
+			for segment in _split_path(path):
+				node = _get_child(node, segment)
+
+				if node is None:
+					return None
+
+			return _copy(node)
+
+	def snapshot(self):
+		""" Copy of the whole mirrored data.
+
+
+		:return: A copy of the data at the mirrored path.
+		:rtype: dict or list or bool or int or float or str
+		"""
+
+		return self.get()
+
+	def listen(self, callback, path=""):
+		""" Call ``callback`` with each change applied to the data at
+		``path``, its ancestors or its descendants.
+
+		The callback receives the event of the stream, i.e. its
+		``event``, the ``path`` changed and the new ``data`` at that
+		path, after it has been applied to the local copy.
+
+
+		:type callback: function
+		:param callback: Function to call with each change.
+
+		:type path: str
+		:param path: (Optional) Path relative to the mirrored path,
+			defaults to the mirrored path itself.
+		"""
+
+		with self._lock:
+			self._listeners.append((callback, "/".join(_split_path(path))))
+
+	def unlisten(self, callback):
+		""" Stop calling ``callback`` with the changes of the data. """
+
+		with self._lock:
+			self._listeners = [listener for listener in self._listeners if listener[0] is not callback]
+
+	def close(self):
+		""" Stop updating the local copy. """
+
+		self._stream.close()
+
+	def _handle_event(self, message):
+		event = message["event"]
+
+		if event == 'cancel':
+			self.cancelled = True
+			self._ready.set()
+
+		elif event in ('put', 'patch'):
+			path = "/".join(_split_path(message["path"]))
+
+			with self._lock:
+				if event == 'put':
+					self._data = _set(self._data, _split_path(path), message["data"])
+
+				# a patch may hold multi-location updates
+				else:
+					for key, value in message["data"].items():
+						self._data = _set(self._data, _split_path(path) + _split_path(key), value)
+
+				listeners = [callback for callback, listener_path in self._listeners if _overlaps(listener_path, path)]
+
+			self._ready.set()
+
+			# the data is now part of the local copy, keep it from listeners
+			if listeners:
+				message = dict(message, data=_copy(message["data"]))
+
+			for callback in listeners:
+				callback(message)
+
+
+def _split_path(path):
+	return [segment for segment in str(path or "").split("/") if segment]
+
+
+def _get_child(node, segment):
+	if isinstance(node, dict):
+		return node.get(segment)
+
+	if isinstance(node, list) and segment.isdecimal() and int(segment) < len(node):
+		return node[int(segment)]
+
+	return None
+
+
+def _set(node, segments, value):
+	""" Returns ``node`` with ``value`` set at the path of ``segments``,
+	removing the children left empty when ``value`` is :data:`None`.
+	"""
+
+	if not segments:
+		return value
+
+	# writes below a list are applied to its children as keys
+	if isinstance(node, list):
+		node = {str(index): child for index, child in enumerate(node) if child is not None}
+
+	elif not isinstance(node, dict):
+		if value is None:
+			return node
+
+		node = {}
+
+	child = _set(node.get(segments[0]), segments[1:], value)
+
+	if child is None or child == {}:
+		node.pop(segments[0], None)
+	else:
+		node[segments[0]] = child
+
+	return node or None
+
+
+def _copy(node):
+	""" Copy of a decoded JSON tree, faster than :func:`copy.deepcopy`
+	as it doesn't track shared references.
+	"""
+
+	if isinstance(node, dict):
+		return {key: _copy(value) for key, value in node.items()}
+
+	if isinstance(node, list):
+		return [_copy(value) for value in node]
+
+	return node
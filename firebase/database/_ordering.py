@@ -0,0 +1,165 @@
+#   Copyright (c) 2022 Asif Arman Rahman
+#   Licensed under MIT (https://github.com/AsifArmanRahman/firebase/blob/main/LICENSE)
+
+# --------------------------------------------------------------------------------------
+
+
+from operator import eq, itemgetter
+from itertools import islice
+
+
+_MIN_INT32 = -2 ** 31
+_MAX_INT32 = 2 ** 31 - 1
+
+_NULL = 0
+_FALSE = 1
+_TRUE = 2
+_NUMBER = 3
+_STRING = 4
+_OBJECT = 5
+
+_NUMBER_TYPES = {int, float}
+_STRING_TYPES = {str}
+
+
+def sort_items(items, order_by):
+	""" Sort the children of a query response in the order the query
+	was made with.
+
+	The value each child is ordered by is extracted once, and
+	positions are sorted by those values. When every value has the
+	same type and no two are equal, no sort key is computed in Python
+	at all. Otherwise children are sorted by key first, so the stable
+	sort keeps the key order between equal values.
+
+
+	:type items: iterable
+	:param items: ``(key, value)`` of each child.
+
+	:type order_by: str
+	:param order_by: ``orderBy`` of the query, either ``$key``,
+		``$value``, ``$priority`` or a path to a child key.
+
+
+	:return: Sorted ``(key, value)`` of each child.
+	:rtype: list
+	"""
+
+	# priorities are not part of the data, so every child has none
+	if order_by == '$key' or order_by == '$priority':
+		return _sort_by_key(items)
+
+	items = list(items)
+	values = _ordered_values(items, order_by)
+	types = set(map(type, values))
+
+	if types <= _NUMBER_TYPES or types == _STRING_TYPES:
+		order = sorted(range(len(values)), key=values.__getitem__)
+		sorted_values = [values[index] for index in order]
+
+		if not any(map(eq, sorted_values, islice(sorted_values, 1, None))):
+			return [items[index] for index in order]
+
+	items = _sort_by_key(items)
+	values = _ordered_values(items, order_by)
+
+	ranks = ([], [], [], [], [], [])
+
+	for index, value in enumerate(values):
+		ranks[_value_rank(value)].append(index)
+
+	ranks[_NUMBER].sort(key=values.__getitem__)
+	ranks[_STRING].sort(key=values.__getitem__)
+
+	return [items[index] for rank in ranks for index in rank]
+
+
+def _ordered_values(items, order_by):
+	""" Returns the value each child is ordered by. """
+
+	if order_by == '$value':
+		return [item[1] for item in items]
+
+	segments = [segment for segment in order_by.split("/") if segment]
+
+	if len(segments) == 1:
+		child = segments[0]
+
+		return [value.get(child) if type(value) is dict else None for _, value in items]
+
+	return [_child_value(value, segments) for _, value in items]
+
+
+def _value_rank(value):
+	""" Rank of the type of a value, as ordered by the Realtime
+	Database: ``null``, ``false``, ``true``, numbers, strings and
+	objects.
+	"""
+
+	if value is None:
+		return _NULL
+
+	if value is False:
+		return _FALSE
+
+	if value is True:
+		return _TRUE
+
+	if isinstance(value, (int, float)):
+		return _NUMBER
+
+	if isinstance(value, str):
+		return _STRING
+
+	return _OBJECT
+
+
+def _child_value(value, segments):
+	for segment in segments:
+		value = value.get(segment) if isinstance(value, dict) else None
+
+	return value
+
+
+def _int32_key(key):
+	""" Returns the key as an integer if the Realtime Database orders
+	it as one, or :data:`None`.
+	"""
+
+	# most keys, such as push IDs, are not numbers at all
+	if not (key[1:] if key[:1] == '-' else key).isdecimal():
+		return None
+
+	number = int(key)
+
+	if _MIN_INT32 <= number <= _MAX_INT32 and str(number) == key:
+		return number
+
+	return None
+
+
+def _sort_by_key(items):
+	items = sorted(items, key=itemgetter(0))
+
+	# cheap filter first, most keys can't be integers at all
+	candidates = [item for item in items if item[0].lstrip('-').isdecimal()]
+
+	if not candidates:
+		return items
+
+	numbers = []
+
+	for item in candidates:
+		number = _int32_key(item[0])
+
+		if number is not None:
+			numbers.append((number, item))
+
+	if not numbers:
+		return items
+
+	numbers.sort(key=itemgetter(0))
+
+	integer_keys = {entry[1][0] for entry in numbers}
+
+	return [entry[1] for entry in numbers] + [item for item in items if item[0] not in integer_keys]
@@ -0,0 +1,145 @@
+#   Copyright (c) 2022 Asif Arman Rahman
+#   Licensed under MIT (https://github.com/AsifArmanRahman/firebase/blob/main/LICENSE)
+
+# --------------------------------------------------------------------------------------
+
+
+import time
+import threading
+from random import getrandbits
+
+
+PUSH_CHARS = '-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz'
+
+# every pair of characters, i.e. 12 bits encoded at once
+_PAIRS = [first + second for first in PUSH_CHARS for second in PUSH_CHARS]
+_VALUES = {char: value for value, char in enumerate(PUSH_CHARS)}
+
+_RANDOM_BITS = 72
+
+
+class PushIdGenerator:
+	""" Generator of Firebase's push IDs, which can be shared by many
+	threads.
+
+	An ID is made of 8 characters encoding the time in milliseconds,
+	followed by 12 characters encoding 72 random bits. IDs generated
+	within the same millisecond use the random bits of the previous one
+	plus one, so IDs sort in the order they were generated.
+
+	| For more details:
+	| |firebase-push-id|_
+
+	.. |firebase-push-id| replace::
+		Firebase Blog | The 2^120 Ways to Ensure Unique Identifiers
+
+	.. _firebase-push-id:
+		https://firebase.blog/posts/2015/02/the-2120-ways-to-ensure-unique_68
+	"""
+
+	def __init__(self):
+		""" Constructor """
+
+		self._last_time = 0
+		self._last_random = 0
+		self._lock = threading.Lock()
+
+	def generate(self):
+		""" Generate a push ID.
+
+
+		:return: Firebase's push ID.
+		:rtype: str
+		"""
+
+		return self.generate_many(1)[0]
+
+	def generate_many(self, n):
+		""" Generate push IDs, in ascending order.
+
+
+		:type n: int
+		:param n: Number of IDs to generate.
+
+
+		:return: Firebase's push IDs.
+		:rtype: list
+		"""
+
+		if n <= 0:
+			return []
+
+		now, first = self._reserve(n)
+
+		prefix = _PAIRS[now >> 36 & 4095] + _PAIRS[now >> 24 & 4095] + _PAIRS[now >> 12 & 4095] + _PAIRS[now & 4095]
+
+		high = first >> 24
+		low = first & 0xFFFFFF
+
+		# the random bits only carry into the upper 48 once per 2^24 IDs
+		ids = []
+		append = ids.append
+
+		while n:
+			count = min(n, 0x1000000 - low)
+			middle = prefix + _PAIRS[high >> 36 & 4095] + _PAIRS[high >> 24 & 4095] + _PAIRS[high >> 12 & 4095] + _PAIRS[high & 4095]
+
+			for value in range(low, low + count):
+				append(middle + _PAIRS[value >> 12] + _PAIRS[value & 4095])
+
+			n -= count
+			high += 1
+			low = 0
+
+		return ids
+
+	def _reserve(self, n):
+		""" Returns the time, and the first of ``n`` consecutive random
+		values to use with it.
+		"""
+
+		with self._lock:
+			now = int(time.time() * 1000)
+
+			# clocks may go backwards, IDs don't
+			if now <= self._last_time:
+				now = self._last_time
+				first = self._last_random + 1
+
+			else:
+				first = getrandbits(_RANDOM_BITS)
+
+			# not enough values left in this millisecond, use the next
+			if first + n > 1 << _RANDOM_BITS:
+				now += 1
+				first = getrandbits(_RANDOM_BITS - 1)
+
+			self._last_time = now
+			self._last_random = first + n - 1
+
+		return now, first
+
+
+def decode_timestamp(key):
+	""" Time a push ID was generated at.
+
+
+	:type key: str
+	:param key: Firebase's push ID.
+
+
+	:return: Milliseconds since the epoch.
+	:rtype: int
+
+	:raises ValueError: Raised when ``key`` is not a push ID.
+	"""
+
+	if not isinstance(key, str) or len(key) != 20 or not all(char in _VALUES for char in key):
+		raise ValueError("'{0}' is not a push ID".format(key))
+
+	timestamp = 0
+
+	for char in key[:8]:
+		timestamp = timestamp * 64 + _VALUES[char]
+
+	return timestamp
@@ -0,0 +1,55 @@
+#   Copyright (c) 2022 Asif Arman Rahman
+#   Licensed under MIT (https://github.com/AsifArmanRahman/firebase/blob/main/LICENSE)
+
+# --------------------------------------------------------------------------------------
+
+
+def server_timestamp():
+	""" Placeholder for the time the server receives the write at.
+
+	| For more details:
+	| |section-server-values|_
+
+	.. |section-server-values| replace::
+		Firebase Database REST API | Server Values
+
+	.. _section-server-values:
+		https://firebase.google.com/docs/reference/rest/database#section-server-values
+
+
+	:return: Value to write in place of a timestamp, which is stored as
+		milliseconds since the epoch.
+	:rtype: dict
+	"""
+
+	return {".sv": "timestamp"}
+
+
+def increment(delta=1):
+	""" Placeholder for the current value plus ``delta``, computed by
+	the server, so concurrent increments are never lost.
+
+	| For more details:
+	| |section-server-values|_
+
+
+	:type delta: int or float
+	:param delta: (Optional) Amount to add, negative to subtract,
+		defaults to ``1``.
+
+
+	:return: Value to write in place of a number. A missing or
+		non-numeric value is replaced by ``delta``.
+	:rtype: dict
+	"""
+
+	if isinstance(delta, bool) or not isinstance(delta, (int, float)):
+		raise TypeError("delta must be a number, not {0}".format(type(delta).__name__))
+
+	return {".sv": {"increment": delta}}
+
+
+def is_server_value(value):
+	""" Whether ``value`` is a placeholder computed by the server. """
+
+	return isinstance(value, dict) and ".sv" in value
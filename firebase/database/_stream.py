@@ -9,20 +9,29 @@ import json
 import time
 import threading
 
+from ._coalescer import EventCoalescer
 from ._keep_auth_session import KeepAuthSession
 from ._closable_sse_client import ClosableSSEClient
 
 
 class Stream:
 
-	def __init__(self, url, stream_handler, build_headers, stream_id, is_async):
+	def __init__(self, url, stream_handler, build_headers, stream_id, is_async, backoff=None, on_reconnect=None, coalesce_window=None):
 		self.build_headers = build_headers
 		self.url = url
 		self.stream_handler = stream_handler
 		self.stream_id = stream_id
+		self.backoff = backoff
+		self.on_reconnect = on_reconnect
 		self.sse = None
 		self.thread = None
 
+		# events are queued and merged, and handled in batches
+		self.coalescer = None
+
+		if coalesce_window is not None:
+			self.coalescer = EventCoalescer(stream_handler, coalesce_window)
+
 		if is_async:
 			self.start()
 		else:
@@ -43,17 +52,51 @@ class Stream:
 		return self
 
 	def start_stream(self):
-		self.sse = ClosableSSEClient(self.url, session=self.make_session(), build_headers=self.build_headers)
+		self.sse = ClosableSSEClient(self.url, session=self.make_session(), build_headers=self.build_headers, backoff=self.backoff, on_reconnect=self.on_reconnect)
 
 		for msg in self.sse:
 			if msg:
 				msg_data = json.loads(msg.data)
+
+				# only put and patch events carry a path
+				if not isinstance(msg_data, dict):
+					msg_data = {"path": None, "data": msg_data}
+
 				msg_data["event"] = msg.event
 
 				if self.stream_id:
 					msg_data["stream_id"] = self.stream_id
 
-				self.stream_handler(msg_data)
+				if self.coalescer:
+					self.coalescer.add(msg_data)
+				else:
+					self.stream_handler(msg_data)
+
+				# the server closes a cancelled stream, don't reconnect
+				if msg.event == 'cancel':
+					self.sse.should_connect = False
+					self.sse.resp.close()
+					break
+
+		# handle the events still queued, in the background unless the
+		# stream runs in the calling thread
+		if self.coalescer:
+			self.coalescer.close(wait=self.thread is None)
+
+	def stats(self):
+		"""
+		Return the reconnection counters of the stream, and the number
+		of events received and batches handled when coalescing.
+		"""
+		if self.sse is None:
+			stats = {'reconnects': 0, 'reconnect_seconds': 0.0, 'discarded_bytes': 0}
+		else:
+			stats = self.sse.stats()
+
+		if self.coalescer:
+			stats.update(self.coalescer.stats())
+
+		return stats
 
 	def close(self):
 		while not self.sse and not hasattr(self.sse, 'resp'):
@@ -63,4 +106,7 @@ class Stream:
 		self.sse.close()
 		self.thread.join()
 
+		if self.coalescer:
+			self.coalescer.close()
+
 		return self
@@ -0,0 +1,505 @@
+#   Copyright (c) 2022 Asif Arman Rahman
+#   Licensed under MIT (https://github.com/AsifArmanRahman/firebase/blob/main/LICENSE)
+
+# --------------------------------------------------------------------------------------
+
+
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ._custom_sse_client import Event
+from ._backoff import ReconnectBackoff
+from firebase._exception import raise_detailed_async_error
+
+
+# marks the end of the events of a stream in its queue
+_CLOSED = object()
+
+# maximum number of queued events passed to a handler thread at once
+_DISPATCH_BATCH = 64
+
+_MAX_REDIRECTS = 5
+
+
+class ManagedStream:
+	""" A stream of changes to a path, driven by a
+	:class:`StreamManager`.
+
+	Events are queued as they are received, and the stream stops
+	reading from its connection while its queue is full, so a slow
+	handler only delays its own stream.
+
+
+	:type manager: StreamManager
+	:param manager: Manager driving the stream.
+
+	:type reference: :class:`~firebase.database.Reference`
+	:param reference: Reference to the streamed path.
+
+	:type stream_handler: function
+	:param stream_handler: Function called with each event.
+
+	:type token: str
+	:param token: Firebase Auth User ID Token.
+
+	:type stream_id: str
+	:param stream_id: ID added to each event to identify the stream.
+	"""
+
+	def __init__(self, manager, reference, stream_handler, token, stream_id):
+		""" Constructor """
+
+		self.manager = manager
+		self.reference = reference
+		self.stream_handler = stream_handler
+		self.token = token
+		self.stream_id = stream_id
+
+		self.retry = 3000
+		self.closed = False
+		self.connected = False
+		self.last_error = None
+
+		self.received = 0
+		self.dispatched = 0
+		self.handler_errors = 0
+		self.reconnects = 0
+		self.reconnect_seconds = 0.0
+		self.discarded_bytes = 0
+		self._failures = 0
+		self.backpressure_waits = 0
+		self.backpressure_seconds = 0.0
+		self.max_queue_depth = 0
+
+		self._queue = None
+		self._task = None
+
+	def close(self):
+		""" Stop the stream, events still queued are dropped.
+
+
+		:return: A reference to the instance object.
+		:rtype: ManagedStream
+		"""
+
+		self.manager._close_stream(self)
+
+		return self
+
+	def stats(self):
+		""" Counters of the stream.
+
+
+		:return: The ``path`` and ``stream_id`` of the stream, whether
+			it is ``connected``, the number of events ``received``,
+			``dispatched`` to the handler, and currently queued
+			(``queue_depth``), the ``max_queue_depth`` reached, the
+			number of ``handler_errors`` and ``reconnects``, the total
+			``reconnect_seconds`` spent reconnecting and
+			``discarded_bytes`` of half received events, and how many
+			times and for how long reading was paused by a full queue
+			(``backpressure_waits`` and ``backpressure_seconds``).
+		:rtype: dict
+		"""
+
+		return {
+			'path': self.reference.path,
+			'stream_id': self.stream_id,
+			'connected': self.connected,
+			'received': self.received,
+			'dispatched': self.dispatched,
+			'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+			'max_queue_depth': self.max_queue_depth,
+			'handler_errors': self.handler_errors,
+			'reconnects': self.reconnects,
+			'reconnect_seconds': self.reconnect_seconds,
+			'discarded_bytes': self.discarded_bytes,
+			'backpressure_waits': self.backpressure_waits,
+			'backpressure_seconds': self.backpressure_seconds,
+		}
+
+
+class StreamManager:
+	""" Drives any number of streams from a single event loop thread,
+	and calls their handlers from a bounded pool of threads.
+
+	Unlike :meth:`~firebase.database.Reference.stream`, which runs a
+	thread and a connection for each stream, all connections are read
+	by one :mod:`asyncio` loop through a pooled
+	:class:`httpx.AsyncClient`. Events of a stream are handled in the
+	order they are received, while events of different streams are
+	handled concurrently by up to ``max_workers`` threads.
+
+	.. note::
+		Requires the ``async`` extra, i.e.
+		``pip install firebase-rest-api[async]``.
+
+
+	:type database: :class:`~firebase.database.Database`
+	:param database: Database the streams are opened on.
+
+	:type max_workers: int
+	:param max_workers: (Optional) Number of threads calling the
+		stream handlers, defaults to ``8``.
+
+	:type max_queue_size: int
+	:param max_queue_size: (Optional) Number of events each stream
+		queues before it stops reading from its connection, defaults
+		to ``1000``.
+
+	:type backoff: :class:`~firebase.database.ReconnectBackoff`
+	:param backoff: (Optional) Delays between attempts to reconnect,
+		shared by every stream of the manager, defaults to
+		:data:`None` (exponential with jitter, from the retry delay
+		requested by the server up to a minute).
+	"""
+
+	def __init__(self, database, max_workers=8, max_queue_size=1000, backoff=None):
+		""" Constructor """
+
+		try:
+			import httpx
+		except ImportError:
+			raise ImportError("StreamManager requires httpx, install it with 'pip install firebase-rest-api[async]'")
+
+		self._httpx = httpx
+		self._database = database
+		self._max_queue_size = max_queue_size
+		self._backoff = backoff or ReconnectBackoff()
+
+		self._streams = []
+		self._lock = threading.Lock()
+		self._closed = False
+
+		self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='firebase-stream')
+
+		# every stream holds a connection, so the pool isn't bounded
+		limits = httpx.Limits(max_connections=None, max_keepalive_connections=0)
+
+		# the server sends a keep-alive event every 30 seconds
+		timeout = httpx.Timeout(10.0, read=90.0)
+
+		self._client = httpx.AsyncClient(limits=limits, timeout=timeout)
+
+		self._loop = asyncio.new_event_loop()
+		self._thread = threading.Thread(target=self._loop.run_forever, name='firebase-stream-manager', daemon=True)
+		self._thread.start()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def stream(self, reference, stream_handler, token=None, stream_id=None):
+		""" Start streaming the changes of a path.
+
+
+		:type reference: :class:`~firebase.database.Reference`
+		:param reference: Reference to the path to stream.
+
+		:type stream_handler: function
+		:param stream_handler: Function called with each event, from
+			one of the threads of the manager.
+
+		:type token: str
+		:param token: (Optional) Firebase Auth User ID Token, defaults
+			to :data:`None`.
+
+		:type stream_id: str
+		:param stream_id: (Optional) ID added to each event to identify
+			the stream, defaults to :data:`None`.
+
+
+		:return: The started stream.
+		:rtype: ManagedStream
+		"""
+
+		stream = ManagedStream(self, reference, stream_handler, token, stream_id)
+
+		with self._lock:
+			if self._closed:
+				raise RuntimeError("StreamManager is closed")
+
+			self._streams.append(stream)
+
+		asyncio.run_coroutine_threadsafe(self._start_stream(stream), self._loop).result()
+
+		return stream
+
+	def streams(self):
+		""" Streams currently driven by the manager.
+
+
+		:return: The open streams.
+		:rtype: list
+		"""
+
+		with self._lock:
+			return list(self._streams)
+
+	def stats(self):
+		""" Counters of the manager, and of each of its streams.
+
+
+		:return: Number of ``streams`` and of ``connected`` ones, total
+			``queue_depth``, ``received`` and ``dispatched`` events,
+			``handler_errors``, ``reconnects`` and
+			``backpressure_waits``, along with the :meth:`stats
+			<ManagedStream.stats>` of each stream in ``per_stream``.
+		:rtype: dict
+		"""
+
+		per_stream = [stream.stats() for stream in self.streams()]
+
+		totals = {
+			'streams': len(per_stream),
+			'connected': sum(1 for stats in per_stream if stats['connected']),
+		}
+
+		for key in ('queue_depth', 'received', 'dispatched', 'handler_errors', 'reconnects', 'backpressure_waits'):
+			totals[key] = sum(stats[key] for stats in per_stream)
+
+		totals['per_stream'] = per_stream
+
+		return totals
+
+	def close(self):
+		""" Stop every stream, and the threads of the manager.
+
+		.. note::
+			Must not be called from a stream handler, as it waits for
+			the handlers to return.
+		"""
+
+		with self._lock:
+			if self._closed:
+				return
+
+			self._closed = True
+			streams = list(self._streams)
+
+		asyncio.run_coroutine_threadsafe(self._shutdown(streams), self._loop).result()
+
+		self._loop.call_soon_threadsafe(self._loop.stop)
+		self._thread.join()
+		self._loop.close()
+
+		self._executor.shutdown(wait=True)
+
+	def _close_stream(self, stream):
+		with self._lock:
+			if stream not in self._streams:
+				return
+
+			self._streams.remove(stream)
+
+		asyncio.run_coroutine_threadsafe(self._stop_stream(stream), self._loop).result()
+
+	async def _start_stream(self, stream):
+		stream._queue = asyncio.Queue(self._max_queue_size)
+		stream._task = self._loop.create_task(self._run_stream(stream))
+
+	async def _stop_stream(self, stream):
+		stream.closed = True
+
+		if stream._task is not None:
+			stream._task.cancel()
+			await asyncio.gather(stream._task, return_exceptions=True)
+
+	async def _shutdown(self, streams):
+		await asyncio.gather(*[self._stop_stream(stream) for stream in streams])
+		await self._client.aclose()
+
+	async def _run_stream(self, stream):
+		dispatcher = self._loop.create_task(self._dispatch(stream))
+
+		try:
+			await self._read(stream)
+
+			# the server cancelled the stream, let queued events through
+			await stream._queue.put(_CLOSED)
+			await dispatcher
+
+		finally:
+			stream.connected = False
+			dispatcher.cancel()
+
+			with self._lock:
+				if stream in self._streams:
+					self._streams.remove(stream)
+
+	async def _read(self, stream):
+		""" Reads the events of a stream, reconnecting whenever the
+		connection is lost, until the stream is closed or cancelled.
+		"""
+
+		url = stream.reference.build_request_url(stream.token)
+		redirects = 0
+		disconnected_at = None
+
+		while not stream.closed:
+			try:
+				headers = await self._loop.run_in_executor(None, self._database.build_headers, stream.token)
+				headers['Accept'] = 'text/event-stream'
+				headers['Cache-Control'] = 'no-cache'
+
+				async with self._client.stream('GET', url, headers=headers) as response:
+
+					# the headers must be kept while following the redirect
+					if response.is_redirect and redirects < _MAX_REDIRECTS:
+						url = str(response.url.join(response.headers['location']))
+						redirects += 1
+						continue
+
+					if response.is_error:
+						await response.aread()
+						raise_detailed_async_error(response)
+
+					redirects = 0
+					stream.connected = True
+
+					if disconnected_at is not None:
+						stream.reconnects += 1
+						stream.reconnect_seconds += time.monotonic() - disconnected_at
+						disconnected_at = None
+
+					if await self._read_events(stream, response):
+						return
+
+			# closing the stream cancels its task, which must end it
+			except asyncio.CancelledError:
+				raise
+
+			# any other error only ends the connection
+			except Exception as e:
+				stream.last_error = e
+
+			stream.connected = False
+
+			if stream.closed:
+				return
+
+			if disconnected_at is None:
+				disconnected_at = time.monotonic()
+
+			await asyncio.sleep(self._backoff.delay(stream.retry, stream._failures))
+			stream._failures += 1
+
+	async def _read_events(self, stream, response):
+		""" Queues the events of a connection, and returns whether the
+		stream was cancelled by the server.
+		"""
+
+		lines = []
+
+		try:
+			async for line in response.aiter_lines():
+				if line:
+					lines.append(line)
+					continue
+
+				if not lines:
+					continue
+
+				event = Event.parse("\n".join(lines))
+				lines = []
+
+				stream._failures = 0
+
+				if event.retry:
+					stream.retry = event.retry
+
+				if event.event == 'keep-alive':
+					continue
+
+				# reconnect, which builds the headers again
+				if event.event == 'auth_revoked':
+					return False
+
+				if event.event == 'cancel':
+					msg_data = {"event": "cancel", "path": None, "data": None}
+
+				elif event.data == 'null':
+					continue
+
+				else:
+					msg_data = self._database.codec.loads(event.data)
+
+					# only put and patch events carry a path
+					if not isinstance(msg_data, dict):
+						msg_data = {"path": None, "data": msg_data}
+
+					msg_data["event"] = event.event
+
+				if stream.stream_id:
+					msg_data["stream_id"] = stream.stream_id
+
+				await self._enqueue(stream, msg_data)
+
+				if event.event == 'cancel':
+					return True
+
+		# the half received event is thrown out, as the SSE spec requires
+		finally:
+			stream.discarded_bytes += sum(len(line.encode("utf-8")) + 1 for line in lines)
+
+		return False
+
+	async def _enqueue(self, stream, msg_data):
+		queue = stream._queue
+
+		stream.received += 1
+
+		if queue.full():
+			stream.backpressure_waits += 1
+			started = time.monotonic()
+
+			await queue.put(msg_data)
+
+			stream.backpressure_seconds += time.monotonic() - started
+
+		else:
+			queue.put_nowait(msg_data)
+
+		stream.max_queue_depth = max(stream.max_queue_depth, queue.qsize())
+
+	async def _dispatch(self, stream):
+		""" Passes the queued events of a stream to its handler, in
+		batches so a burst of events takes a single trip to the pool.
+		"""
+
+		queue = stream._queue
+
+		while True:
+			messages = [await queue.get()]
+
+			while len(messages) < _DISPATCH_BATCH and not queue.empty():
+				messages.append(queue.get_nowait())
+
+			closed = messages[-1] is _CLOSED
+
+			if closed:
+				messages.pop()
+
+			if messages:
+				await self._loop.run_in_executor(self._executor, _call_handler, stream, messages)
+
+			if closed:
+				return
+
+
+def _call_handler(stream, messages):
+	for msg_data in messages:
+		if stream.closed:
+			return
+
+		try:
+			stream.stream_handler(msg_data)
+		except Exception as e:
+			stream.handler_errors += 1
+			stream.last_error = e
+
+		stream.dispatched += 1
@@ -0,0 +1,168 @@
+#   Copyright (c) 2022 Asif Arman Rahman
+#   Licensed under MIT (https://github.com/AsifArmanRahman/firebase/blob/main/LICENSE)
+
+# --------------------------------------------------------------------------------------
+
+
+import time
+import threading
+from datetime import timezone
+from google.auth.transport.requests import Request
+
+
+# seconds before its expiry a token stops being used, as google-auth does
+_EXPIRY_SKEW = 225
+
+# seconds between attempts to refresh in the background after a failure
+_RETRY_DELAY = 10
+
+
+class TokenCache:
+	""" Request headers carrying the access token of service account
+	credentials, shared by every thread sending requests.
+
+	The headers are built once per token. The token is refreshed in the
+	background once it is about to expire, so requests only wait for a
+	refresh when there is no usable token at all, in which case a
+	single thread refreshes it while the others wait. Refreshes reuse
+	the connections of a single session.
+
+
+	:type credentials: :class:`~google.oauth2.service_account.Credentials`
+	:param credentials: Service account credentials.
+
+	:type headers: dict
+	:param headers: (Optional) Headers sent along with the token,
+		defaults to :data:`None`.
+
+	:type refresh_margin: int or float
+	:param refresh_margin: (Optional) Seconds before its expiry the token
+		is refreshed in the background, defaults to ``300``.
+	"""
+
+	def __init__(self, credentials, headers=None, refresh_margin=300):
+		""" Constructor """
+
+		self.credentials = credentials
+		self.refresh_margin = refresh_margin
+
+		self.refreshes = 0
+		self.background_refreshes = 0
+		self.last_error = None
+
+		self._base_headers = dict(headers or {})
+		self._request = Request()
+		self._lock = threading.Lock()
+		self._refreshing = False
+
+		# headers, time to refresh at, time the token expires at
+		self._state = (None, 0.0, 0.0)
+
+		if credentials.valid:
+			self._state = self._build_state()
+
+	def headers(self):
+		""" Request headers with a usable access token.
+
+
+		:return: A copy of the headers, which can be modified.
+		:rtype: dict
+		"""
+
+		headers, refresh_at, expires_at = self._state
+		now = time.monotonic()
+
+		if now < refresh_at:
+			return headers.copy()
+
+		if now < expires_at:
+			self._refresh_in_background()
+
+			return headers.copy()
+
+		return self.refresh().copy()
+
+	def expired(self):
+		""" Whether requests would have to wait for the token to be
+		refreshed.
+		"""
+
+		return time.monotonic() >= self._state[2]
+
+	def refresh(self, force=False):
+		""" Refresh the token, unless another thread did while waiting.
+
+
+		:type force: bool
+		:param force: (Optional) Whether to refresh a token which is
+			still usable, defaults to :data:`False`.
+
+
+		:return: The headers with the new token.
+		:rtype: dict
+		"""
+
+		with self._lock:
+			headers, refresh_at, expires_at = self._state
+
+			if not force and time.monotonic() < expires_at:
+				return headers
+
+			self.credentials.refresh(self._request)
+			self.refreshes += 1
+
+			self._state = self._build_state()
+
+			return self._state[0]
+
+	def stats(self):
+		""" Number of ``refreshes``, how many of them were made in the
+		``background``, and the ``last_error`` of a background refresh.
+		"""
+
+		return {
+			'refreshes': self.refreshes,
+			'background': self.background_refreshes,
+			'last_error': self.last_error,
+		}
+
+	def _refresh_in_background(self):
+		with self._lock:
+			if self._refreshing:
+				return
+
+			self._refreshing = True
+
+		threading.Thread(target=self._background_refresh, daemon=True).start()
+
+	def _background_refresh(self):
+		try:
+			self.refresh(force=True)
+			self.background_refreshes += 1
+			self.last_error = None
+
+		# the current token is used until it expires, try again later
+		except Exception as e:
+			self.last_error = e
+
+			headers, refresh_at, expires_at = self._state
+			self._state = (headers, min(time.monotonic() + _RETRY_DELAY, expires_at), expires_at)
+
+		finally:
+			self._refreshing = False
+
+	def _build_state(self):
+		""" Headers and refresh times for the current token. """
+
+		headers = dict(self._base_headers)
+		headers['Authorization'] = 'Bearer ' + self.credentials.token
+
+		# credentials without an expiry are valid until refreshed
+		if self.credentials.expiry is None:
+			return headers, float('inf'), float('inf')
+
+		# expiry is a naive UTC datetime, compared on the monotonic clock
+		remaining = self.credentials.expiry.replace(tzinfo=timezone.utc).timestamp() - time.time()
+		expires_at = time.monotonic() + remaining - _EXPIRY_SKEW
+
+		return headers, expires_at - self.refresh_margin, expires_at
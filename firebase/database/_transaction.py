@@ -0,0 +1,80 @@
+#   Copyright (c) 2022 Asif Arman Rahman
+#   Licensed under MIT (https://github.com/AsifArmanRahman/firebase/blob/main/LICENSE)
+
+# --------------------------------------------------------------------------------------
+
+
+import threading
+from collections import Counter
+
+
+class TransactionStats:
+	""" Contention counters of the transactions run through a database
+	instance, safe to update from many threads.
+	"""
+
+	def __init__(self):
+		""" Constructor """
+
+		self.started = 0
+		self.committed = 0
+		self.aborted = 0
+		self.conflicts = 0
+		self.max_conflicts = 0
+
+		self._paths = Counter()
+		self._lock = threading.Lock()
+
+	def record(self, path, conflicts, committed):
+		""" Count a finished transaction.
+
+
+		:type path: str
+		:param path: Path the transaction was run on.
+
+		:type conflicts: int
+		:param conflicts: Number of attempts rejected as the data had
+			changed.
+
+		:type committed: bool
+		:param committed: Whether the transaction was committed.
+		"""
+
+		with self._lock:
+			self.started += 1
+			self.conflicts += conflicts
+
+			if committed:
+				self.committed += 1
+				self.max_conflicts = max(self.max_conflicts, conflicts)
+			else:
+				self.aborted += 1
+
+			if conflicts:
+				self._paths["/" + path.strip("/")] += conflicts
+
+	def stats(self, top=10):
+		""" Counters of the transactions.
+
+
+		:type top: int
+		:param top: (Optional) Number of most contended paths reported,
+			defaults to ``10``.
+
+
+		:return: Number of transactions ``started``, ``committed`` and
+			``aborted``, total number of ``conflicts``, the most a
+			committed transaction had (``max_conflicts``), and the
+			paths with the most conflicts (``contended_paths``).
+		:rtype: dict
+		"""
+
+		with self._lock:
+			return {
+				'started': self.started,
+				'committed': self.committed,
+				'aborted': self.aborted,
+				'conflicts': self.conflicts,
+				'max_conflicts': self.max_conflicts,
+				'contended_paths': self._paths.most_common(top),
+			}
@@ -14,14 +14,20 @@ A simple python wrapper for Google's `Firebase Cloud Firestore REST API`_
 
 from math import ceil
 from proto.message import Message
+from concurrent.futures import ThreadPoolExecutor
 from google.cloud.firestore import Client
 from google.cloud.firestore_v1._helpers import *
 from google.cloud.firestore_v1.query import Query
+from google.cloud.firestore_v1.types import StructuredQuery
+from google.cloud.firestore_v1.field_path import parse_field_path
 from google.cloud.firestore_v1.collection import CollectionReference
-from google.cloud.firestore_v1.base_query import _enum_from_direction
+from google.cloud.firestore_v1.base_query import _enum_from_direction, _INEQUALITY_OPERATORS
 
-from ._utils import _from_datastore, _to_datastore
+from ._batch import WriteBatch
+from ._utils import _document_path, _from_datastore, _to_datastore
+from firebase._json_codec import JSONCodec
 from firebase._exception import raise_detailed_error
+from firebase._json_stream import iter_json_items
 
 
 class Firestore:
@@ -38,15 +44,150 @@ class Firestore:
 
 	:type requests: :class:`~requests.Session`
 	:param requests: Session to make HTTP requests
+
+	:type codec: :class:`~firebase._json_codec.JSONCodec`
+	:param codec: (Optional) Serializer of request and response
+		bodies, defaults to :data:`None` (standard :mod:`json`).
 	"""
 
-	def __init__(self, api_key, credentials, project_id, requests):
+	def __init__(self, api_key, credentials, project_id, requests, codec=None):
 		""" Constructor method """
 
 		self._api_key = api_key
 		self._credentials = credentials
 		self._project_id = project_id
 		self._requests = requests
+		self._codec = codec or JSONCodec()
+
+	def batch(self, max_writes=500):
+		""" Collect writes to many documents, and send them as few
+		``commit`` requests as possible.
+
+		| For more details:
+		| |batched_writes|_
+
+		.. |batched_writes| replace::
+			Firebase Documentation | Transactions and batched writes |
+			Batched writes
+
+		.. _batched_writes:
+			https://firebase.google.com/docs/firestore/manage-data/transactions#batched-writes
+
+
+		:type max_writes: int
+		:param max_writes: (Optional) Maximum number of writes sent in
+			a single request, defaults to ``500``, the most Firestore
+			accepts.
+
+
+		:return: A new, empty batch of writes.
+		:rtype: WriteBatch
+		"""
+
+		client = None
+
+		if self._credentials:
+			client = Client(credentials=self._credentials, project=self._project_id)
+
+		return WriteBatch(self._api_key, self._credentials, self._project_id, self._requests, codec=self._codec, client=client, max_writes=max_writes)
+
+	def get_all(self, documents, field_paths=None, token=None):
+		""" Read data from many documents in a single request.
+
+		| For more details:
+		| |batch_get|_
+
+		.. |batch_get| replace::
+			Firebase Documentation | REST Resource:
+			projects.databases.documents | batchGet
+
+		.. _batch_get:
+			https://firebase.google.com/docs/firestore/reference/rest/v1/projects.databases.documents/batchGet
+
+
+		:type documents: list
+		:param documents: Paths to the documents, e.g.
+			``"users/Edward"``, or references to them
+			(:class:`Document`).
+
+		:type field_paths: list
+		:param field_paths: (Optional) A list of field paths
+			(``.``-delimited list of field names) to filter data, and
+			return the filtered values only, defaults
+			to :data:`None`.
+
+		:type token: str
+		:param token: (Optional) Firebase Auth User ID Token, defaults
+			to :data:`None`.
+
+
+		:return: The data stored in each document, in the order of
+			``documents``, with :data:`None` for a document that does
+			not exist.
+		:rtype: list
+		"""
+
+		paths = ['/'.join(_document_path(document)) for document in documents]
+
+		if not paths:
+			return []
+
+		# the documents are returned in any order, with duplicates once
+		positions = {}
+
+		for position, path in enumerate(paths):
+			positions.setdefault(path, []).append(position)
+
+		results = [None] * len(paths)
+
+		if self._credentials:
+			client = Client(credentials=self._credentials, project=self._project_id)
+
+			references = [client.document(path) for path in positions]
+
+			for snapshot in client.get_all(references, field_paths=field_paths):
+				for position in positions.get(snapshot.reference.path, ()):
+					results[position] = snapshot.to_dict()
+
+		else:
+			base_path = f"projects/{self._project_id}/databases/(default)/documents"
+			prefix_length = len(base_path) + 1
+
+			req_ref = f"https://firestore.googleapis.com/v1/{base_path}:batchGet?key={self._api_key}"
+
+			body = {
+				"documents": [f"{base_path}/{path}" for path in positions]
+			}
+
+			if field_paths:
+				body["mask"] = {"fieldPaths": field_paths}
+
+			headers = {"content-type": "application/json; charset=UTF-8"}
+
+			if token:
+				headers["Authorization"] = "Firebase " + token
+
+			response = self._requests.post(req_ref, headers=headers, data=self._codec.dumps(body), stream=True)
+
+			try:
+				raise_detailed_error(response)
+
+				# each document is decoded as soon as it is received
+				for _, result in iter_json_items(response.iter_content(chunk_size=8192)):
+					found = result.get('found')
+
+					if found is None:
+						continue
+
+					data = _from_datastore({'fields': found.get('fields', {})})
+
+					for position in positions.get(found['name'][prefix_length:], ()):
+						results[position] = data
+
+			finally:
+				response.close()
+
+		return results
 
 	def collection(self, collection_id):
 		""" Get reference to a collection in a Firestore database.
@@ -60,7 +201,7 @@ class Firestore:
 		:rtype: Collection
 		"""
 
-		return Collection([collection_id], api_key=self._api_key, credentials=self._credentials, project_id=self._project_id, requests=self._requests)
+		return Collection([collection_id], api_key=self._api_key, credentials=self._credentials, project_id=self._project_id, requests=self._requests, codec=self._codec)
 
 
 class Collection:
@@ -81,9 +222,13 @@ class Collection:
 
 	:type requests: :class:`~requests.Session`
 	:param requests: Session to make HTTP requests
+
+	:type codec: :class:`~firebase._json_codec.JSONCodec`
+	:param codec: (Optional) Serializer of request and response
+		bodies, defaults to :data:`None` (standard :mod:`json`).
 	"""
 
-	def __init__(self, collection_path, api_key, credentials, project_id, requests):
+	def __init__(self, collection_path, api_key, credentials, project_id, requests, codec=None):
 		""" Constructor method """
 
 		self._path = collection_path
@@ -92,6 +237,7 @@ class Collection:
 		self._credentials = credentials
 		self._project_id = project_id
 		self._requests = requests
+		self._codec = codec or JSONCodec()
 
 		self._base_path = f"projects/{self._project_id}/databases/(default)/documents"
 		self._base_url = f"https://firestore.googleapis.com/v1/{self._base_path}"
@@ -157,6 +303,58 @@ class Collection:
 
 		return _query
 
+	def _run_query(self, req_ref, headers, body, chunk_size, reverse):
+		""" Sends a ``runQuery`` request, and decodes each document of
+		the response as it is received.
+		"""
+
+		response = self._requests.post(req_ref, headers=headers, data=self._codec.dumps(body), stream=True)
+
+		try:
+			raise_detailed_error(response)
+
+			docs = []
+
+			# each element holds a document, or only progress details
+			for _, result in iter_json_items(response.iter_content(chunk_size=chunk_size)):
+				document = result.get('document')
+
+				if document is None:
+					continue
+
+				doc = {document['name'].rsplit('/', 1)[-1]: _from_datastore(document)}
+
+				if reverse:
+					docs.append(doc)
+				else:
+					yield doc
+
+			for doc in reversed(docs):
+				yield doc
+
+		finally:
+			response.close()
+
+	def _paginate(self, fetch_page, page_size):
+		""" Yields the pages returned by ``fetch_page``, requesting the
+		next page in the background.
+		"""
+
+		with ThreadPoolExecutor(max_workers=1) as executor:
+			page = executor.submit(fetch_page, None)
+
+			while page is not None:
+				docs, cursor = page.result()
+
+				# a short page is the last one
+				if len(docs) < page_size:
+					page = None
+				else:
+					page = executor.submit(fetch_page, cursor)
+
+				if docs:
+					yield docs
+
 	def add(self, data, token=None):
 		""" Create a document in the Firestore database with the
 		provided data using an auto generated ID for the document.
@@ -188,16 +386,16 @@ class Collection:
 		else:
 			req_ref = f"{self._base_url}/{'/'.join(path)}?key={self._api_key}"
 
+			headers = {"content-type": "application/json; charset=UTF-8"}
+
 			if token:
-				headers = {"Authorization": "Firebase " + token}
-				response = self._requests.post(req_ref, headers=headers, json=_to_datastore(data))
+				headers["Authorization"] = "Firebase " + token
 
-			else:
-				response = self._requests.post(req_ref, json=_to_datastore(data))
+			response = self._requests.post(req_ref, headers=headers, data=self._codec.dumps(_to_datastore(data)))
 
 			raise_detailed_error(response)
 
-			doc_id = response.json()['name'].split('/')
+			doc_id = self._codec.loads(response.content)['name'].split('/')
 
 			return doc_id.pop()
 
@@ -214,7 +412,7 @@ class Collection:
 		"""
 
 		self._path.append(document_id)
-		return Document(self._path, api_key=self._api_key, credentials=self._credentials, project_id=self._project_id, requests=self._requests)
+		return Document(self._path, api_key=self._api_key, credentials=self._credentials, project_id=self._project_id, requests=self._requests, codec=self._codec)
 
 	def end_at(self, document_fields):
 		""" End query at a cursor with this collection as parent.
@@ -290,30 +488,27 @@ class Collection:
 			else:
 				req_ref = f"{self._base_url}/{'/'.join(self._path)}?key={self._api_key}"
 
-			if token:
-				headers = {"Authorization": "Firebase " + token}
+			headers = {"content-type": "application/json; charset=UTF-8"}
 
-				if body:
-					response = self._requests.post(req_ref, headers=headers, json=body)
-				else:
-					response = self._requests.get(req_ref, headers=headers)
+			if token:
+				headers["Authorization"] = "Firebase " + token
 
+			if body:
+				response = self._requests.post(req_ref, headers=headers, data=self._codec.dumps(body))
 			else:
-
-				if body:
-					response = self._requests.post(req_ref, json=body)
-				else:
-					response = self._requests.get(req_ref)
+				response = self._requests.get(req_ref, headers=headers)
 
 			raise_detailed_error(response)
 
-			if isinstance(response.json(), dict):
-				for doc in response.json()['documents']:
+			response_json = self._codec.loads(response.content)
+
+			if isinstance(response_json, dict):
+				for doc in response_json['documents']:
 					doc_id = doc['name'].split('/')
 					docs.append({doc_id.pop(): _from_datastore({'fields': doc['fields']})})
 
-			elif isinstance(response.json(), list):
-				for doc in response.json():
+			elif isinstance(response_json, list):
+				for doc in response_json:
 					fields = {}
 
 					if doc.get('document'):
@@ -367,8 +562,10 @@ class Collection:
 
 			raise_detailed_error(response)
 
-			if response.json().get('documents'):
-				for doc in response.json()['documents']:
+			response_json = self._codec.loads(response.content)
+
+			if response_json.get('documents'):
+				for doc in response_json['documents']:
 					doc_id = doc['name'].split('/')
 					docs.append(doc_id.pop())
 
@@ -464,6 +661,115 @@ class Collection:
 
 		return self
 
+	def paginate(self, page_size=100, token=None):
+		""" Read all documents of the query, a page at a time.
+
+		Each page starts after the last document of the previous one,
+		with a cursor on the fields the query is ordered by, so unlike
+		pages read with :meth:`offset`, documents of previous pages are
+		not scanned again. The next page is requested in the background
+		while the current one is processed.
+
+			.. note::
+				Only :meth:`where`, :meth:`order_by` and :meth:`select`
+				can be used with `paginate`. Results are also ordered
+				by document ID, which breaks ties between documents,
+				and by the fields of inequality filters, all of which
+				must be part of a :meth:`select`.
+
+
+		:type page_size: int
+		:param page_size: (Optional) Maximum number of documents in a
+			page, defaults to ``100``.
+
+		:type token: str
+		:param token: (Optional) Firebase Auth User ID Token, defaults
+			to :data:`None`.
+
+
+		:return: A list of dict's of the document ID with the data it
+			possesses, for each page of the query.
+		:rtype: generator
+
+		:raises ValueError: Raised when ``page_size`` is not positive,
+			or the query has limits, offsets or cursors.
+		"""
+
+		if page_size <= 0:
+			raise ValueError("page_size must be positive")
+
+		unsupported = set(self._query) - {'where', 'orderBy', 'select'}
+
+		if unsupported:
+			raise ValueError("paginate can't be used with {0}".format(", ".join(sorted(unsupported))))
+
+		if self._credentials:
+			query = self._build_query().limit(page_size)
+
+			def fetch_page(cursor):
+				page_query = query if cursor is None else query.start_after(cursor)
+
+				snapshots = list(page_query.stream())
+
+				# the client orders by document ID from a snapshot cursor
+				docs = [{snapshot.id: snapshot.to_dict()} for snapshot in snapshots]
+
+				return docs, snapshots[-1] if snapshots else None
+
+			return self._paginate(fetch_page, page_size)
+
+		parent = '/'.join([self._base_url] + self._path[:-1])
+		req_ref = f"{parent}:runQuery?key={self._api_key}"
+
+		query = self._build_query()
+
+		# order by the same fields as the client does with a snapshot
+		# cursor, so each document has a distinct position
+		order_paths = [order.field.field_path for order in query._orders]
+		direction = query._orders[-1].direction if query._orders else Query.ASCENDING
+
+		for field_filter in query._field_filters:
+			if isinstance(field_filter.op, StructuredQuery.FieldFilter.Operator) and field_filter.op in _INEQUALITY_OPERATORS and field_filter.field.field_path not in order_paths:
+				query = query.order_by(field_filter.field.field_path, direction=direction)
+				order_paths.append(field_filter.field.field_path)
+
+		if '__name__' not in order_paths:
+			query = query.order_by('__name__', direction=direction)
+			order_paths.append('__name__')
+
+		structured_query = json.loads(Message.to_json(query.limit(page_size)._to_protobuf()))
+
+		headers = {"content-type": "application/json; charset=UTF-8"}
+
+		if token:
+			headers["Authorization"] = "Firebase " + token
+
+		def fetch_page(cursor):
+			body = {
+				"structuredQuery": dict(structured_query)
+			}
+
+			if cursor is not None:
+				body["structuredQuery"]["startAt"] = {"values": cursor, "before": False}
+
+			response = self._requests.post(req_ref, headers=headers, data=self._codec.dumps(body))
+
+			raise_detailed_error(response)
+
+			docs = []
+			last = None
+
+			for result in self._codec.loads(response.content):
+				document = result.get('document')
+
+				if document is not None:
+					docs.append({document['name'].rsplit('/', 1)[-1]: _from_datastore(document)})
+					last = document
+
+			return docs, _cursor_values(last, order_paths) if last else None
+
+		return self._paginate(fetch_page, page_size)
+
 	def select(self, field_paths):
 		""" Create a "select" query with this collection as parent.
 
@@ -517,6 +823,58 @@ class Collection:
 
 		return self
 
+	def stream(self, token=None, chunk_size=64 * 1024):
+		""" Read the documents of the query one after the other, while
+		the response is being received.
+
+		Unlike :meth:`get`, the results are never held in memory as a
+		whole, and the first document is available as soon as it is
+		received.
+
+			.. note::
+				Results of a query limited with `limit_to_last` are
+				returned by Firestore in reverse, so they are only
+				yielded once all of them are received.
+
+
+		:type token: str
+		:param token: (Optional) Firebase Auth User ID Token, defaults
+			to :data:`None`.
+
+		:type chunk_size: int
+		:param chunk_size: (Optional) Number of bytes read from the
+			response at once, defaults to ``64 KB``.
+
+
+		:return: A dict of the document ID with the data it possesses,
+			for each document of the query.
+		:rtype: generator
+		"""
+
+		if self._credentials:
+			query = self._build_query()
+
+			# the client can't stream queries limited from the end
+			if getattr(query, '_limit_to_last', False):
+				return ({result.id: result.to_dict()} for result in query.get())
+
+			return ({result.id: result.to_dict()} for result in query.stream())
+
+		# top-level collections are queried from the root of documents
+		parent = '/'.join([self._base_url] + self._path[:-1])
+		req_ref = f"{parent}:runQuery?key={self._api_key}"
+
+		body = {
+			"structuredQuery": json.loads(Message.to_json(self._build_query()._to_protobuf()))
+		}
+
+		headers = {"content-type": "application/json; charset=UTF-8"}
+
+		if token:
+			headers["Authorization"] = "Firebase " + token
+
+		return self._run_query(req_ref, headers, body, chunk_size, self._is_limited_to_last)
+
 	def where(self, field_path, op_string, value):
 		""" Create a "where" query with this collection as parent.
 
@@ -572,9 +930,13 @@ class Document:
 
 	:type requests: :class:`~requests.Session`
 	:param requests: Session to make HTTP requests
+
+	:type codec: :class:`~firebase._json_codec.JSONCodec`
+	:param codec: (Optional) Serializer of request and response
+		bodies, defaults to :data:`None` (standard :mod:`json`).
 	"""
 
-	def __init__(self, document_path, api_key, credentials, project_id, requests):
+	def __init__(self, document_path, api_key, credentials, project_id, requests, codec=None):
 		""" Constructor method """
 
 		self._path = document_path
@@ -583,6 +945,7 @@ class Document:
 		self._credentials = credentials
 		self._project_id = project_id
 		self._requests = requests
+		self._codec = codec or JSONCodec()
 
 		self._base_path = f"projects/{self._project_id}/databases/(default)/documents"
 		self._base_url = f"https://firestore.googleapis.com/v1/{self._base_path}"
@@ -603,7 +966,7 @@ class Document:
 		"""
 
 		self._path.append(collection_id)
-		return Collection(self._path, api_key=self._api_key, credentials=self._credentials, project_id=self._project_id, requests=self._requests)
+		return Collection(self._path, api_key=self._api_key, credentials=self._credentials, project_id=self._project_id, requests=self._requests, codec=self._codec)
 
 	def delete(self, token=None):
 		""" Deletes the current document from firestore.
@@ -692,7 +1055,7 @@ class Document:
 
 			raise_detailed_error(response)
 
-			return _from_datastore(response.json())
+			return _from_datastore(self._codec.loads(response.content))
 
 	def set(self, data, token=None):
 		""" Add data to a document in firestore.
@@ -734,12 +1097,12 @@ class Document:
 					]
 			}
 
+			headers = {"content-type": "application/json; charset=UTF-8"}
+
 			if token:
-				headers = {"Authorization": "Firebase " + token}
-				response = self._requests.post(req_ref, headers=headers, json=body)
+				headers["Authorization"] = "Firebase " + token
 
-			else:
-				response = self._requests.post(req_ref, json=body)
+			response = self._requests.post(req_ref, headers=headers, data=self._codec.dumps(body))
 
 			raise_detailed_error(response)
 
@@ -772,12 +1135,12 @@ class Document:
 				]
 			}
 
+			headers = {"content-type": "application/json; charset=UTF-8"}
+
 			if token:
-				headers = {"Authorization": "Firebase " + token}
-				response = self._requests.post(req_ref, headers=headers, json=body)
+				headers["Authorization"] = "Firebase " + token
 
-			else:
-				response = self._requests.post(req_ref, json=body)
+			response = self._requests.post(req_ref, headers=headers, data=self._codec.dumps(body))
 
 			raise_detailed_error(response)
 
@@ -809,3 +1172,42 @@ def _build_db(db, path):
 			db = db.document(path.pop(0))
 
 	return db
+
+
+def _cursor_values(document, field_paths):
+	""" Returns the values of a document, as received from the REST API,
+	for a cursor on the given fields.
+
+
+	:type document: dict
+	:param document: A Firestore document.
+
+	:type field_paths: list
+	:param field_paths: Field paths of the orders of the query.
+
+
+	:return: Firestore values of the fields, in order.
+	:rtype: list
+
+	:raises ValueError: Raised when the document lacks a field.
+	"""
+
+	values = []
+
+	for field_path in field_paths:
+		if field_path == '__name__':
+			values.append({'referenceValue': document['name']})
+			continue
+
+		value = {'mapValue': document}
+
+		try:
+			for part in parse_field_path(field_path):
+				value = value['mapValue']['fields'][part]
+
+		except KeyError:
+			raise ValueError("Document '{0}' has no field '{1}' to continue the query after, it must be selected".format(document['name'], field_path)) from None
+
+		values.append(value)
+
+	return values
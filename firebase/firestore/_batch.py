@@ -0,0 +1,251 @@
+#   Copyright (c) 2022 Asif Arman Rahman
+#   Licensed under MIT (https://github.com/AsifArmanRahman/firebase/blob/main/LICENSE)
+
+# --------------------------------------------------------------------------------------
+
+
+from proto.message import Message
+from concurrent.futures import ThreadPoolExecutor
+from google.api_core.exceptions import GoogleAPICallError
+from google.cloud.firestore_v1._helpers import pb_for_delete, pbs_for_set_no_merge, pbs_for_update
+from requests.exceptions import RequestException
+
+from ._utils import _document_path
+from firebase._json_codec import JSONCodec
+from firebase._exception import raise_detailed_error
+
+
+# most writes Firestore accepts in a single commit
+MAX_WRITES = 500
+
+
+class WriteBatch:
+	""" Collects writes to any number of documents, and sends them as
+	few ``commit`` requests as possible.
+
+	Writes are sent in chunks of up to ``max_writes``. The writes of a
+	chunk are applied atomically, but chunks are independent of each
+	other, so a batch larger than ``max_writes`` may be partly applied.
+
+
+	:type api_key: str
+	:param api_key: ``apiKey`` from Firebase configuration
+
+	:type credentials: :class:`~google.oauth2.service_account.Credentials`
+	:param credentials: Service Account Credentials
+
+	:type project_id: str
+	:param project_id: ``projectId`` from Firebase configuration
+
+	:type requests: :class:`~requests.Session`
+	:param requests: Session to make HTTP requests
+
+	:type codec: :class:`~firebase._json_codec.JSONCodec`
+	:param codec: (Optional) Serializer of request and response
+		bodies, defaults to :data:`None` (standard :mod:`json`).
+
+	:type client: :class:`~google.cloud.firestore.Client`
+	:param client: (Optional) Client used with service account
+		credentials, defaults to :data:`None`.
+
+	:type max_writes: int
+	:param max_writes: (Optional) Maximum number of writes sent in a
+		single request, defaults to ``500``.
+	"""
+
+	def __init__(self, api_key, credentials, project_id, requests, codec=None, client=None, max_writes=MAX_WRITES):
+		""" Constructor method """
+
+		if not 0 < max_writes <= MAX_WRITES:
+			raise ValueError("max_writes must be between 1 and {0}".format(MAX_WRITES))
+
+		self._api_key = api_key
+		self._credentials = credentials
+		self._project_id = project_id
+		self._requests = requests
+		self._codec = codec or JSONCodec()
+		self._client = client
+		self._max_writes = max_writes
+
+		self._base_path = f"projects/{self._project_id}/databases/(default)/documents"
+		self._base_url = f"https://firestore.googleapis.com/v1/{self._base_path}"
+
+		self._writes = []
+		self.results = None
+
+	def __len__(self):
+		return len(self._writes)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		if exc_type is None:
+			self.results = self.commit()
+
+	def set(self, document, data):
+		""" Add a write replacing the data of a document to the batch.
+
+
+		:type document: str or :class:`~firebase.firestore.Document`
+		:param document: Path to the document, e.g.
+			``"users/Edward"``, or a reference to it.
+
+		:type data: dict
+		:param data: Data to be stored in firestore.
+
+
+		:return: A reference to the instance object.
+		:rtype: WriteBatch
+		"""
+
+		self._writes.append(('set', _document_path(document), data))
+
+		return self
+
+	def update(self, document, data):
+		""" Add an update of fields of a document to the batch.
+
+
+		:type document: str or :class:`~firebase.firestore.Document`
+		:param document: Path to the document, e.g.
+			``"users/Edward"``, or a reference to it.
+
+		:type data: dict
+		:param data: Fields to be updated, keys may be field paths
+			(``.``-delimited list of field names).
+
+
+		:return: A reference to the instance object.
+		:rtype: WriteBatch
+		"""
+
+		self._writes.append(('update', _document_path(document), data))
+
+		return self
+
+	def delete(self, document):
+		""" Add a deletion of a document to the batch.
+
+
+		:type document: str or :class:`~firebase.firestore.Document`
+		:param document: Path to the document, e.g.
+			``"users/Edward"``, or a reference to it.
+
+
+		:return: A reference to the instance object.
+		:rtype: WriteBatch
+		"""
+
+		self._writes.append(('delete', _document_path(document), None))
+
+		return self
+
+	def commit(self, token=None, bulk=False, max_workers=10):
+		""" Send the writes of the batch, and empty it.
+
+		A failed chunk does not stop the remaining ones from being
+		sent, its error is reported in the results instead.
+
+
+		:type token: str
+		:param token: (Optional) Firebase Auth User ID Token, defaults
+			to :data:`None`.
+
+		:type bulk: bool
+		:param bulk: (Optional) Whether the chunks are sent concurrently,
+			in which case they may be applied in any order, defaults to
+			:data:`False`.
+
+		:type max_workers: int
+		:param max_workers: (Optional) Maximum number of chunks sent at
+			once in ``bulk`` mode, defaults to ``10``.
+
+
+		:return: A result for each request sent, containing the number
+			of ``writes`` it held, along with the ``response`` of a
+			successful attempt or the ``error`` of a failed one.
+		:rtype: list
+		"""
+
+		writes = self._writes
+		self._writes = []
+
+		chunks = [writes[i:i + self._max_writes] for i in range(0, len(writes), self._max_writes)]
+
+		if self._credentials:
+			send = self._commit_admin
+		else:
+			def send(chunk):
+				return self._commit_rest(chunk, token)
+
+		if bulk and len(chunks) > 1:
+			with ThreadPoolExecutor(max_workers=max_workers) as executor:
+				return list(executor.map(send, chunks))
+
+		return [send(chunk) for chunk in chunks]
+
+	def _commit_admin(self, chunk):
+		""" Commits a chunk through the client of the service account. """
+
+		result = {'writes': len(chunk), 'response': None, 'error': None}
+
+		batch = self._client.batch()
+
+		for operation, path, data in chunk:
+			db_ref = self._client.document(*path)
+
+			if operation == 'set':
+				batch.set(db_ref, data)
+			elif operation == 'update':
+				batch.update(db_ref, data)
+			else:
+				batch.delete(db_ref)
+
+		try:
+			result['response'] = batch.commit()
+		except GoogleAPICallError as e:
+			result['error'] = e
+
+		return result
+
+	def _commit_rest(self, chunk, token):
+		""" Commits a chunk through the REST API. """
+
+		result = {'writes': len(chunk), 'response': None, 'error': None}
+
+		pbs = []
+
+		for operation, path, data in chunk:
+			document_path = f"{self._base_path}/{'/'.join(path)}"
+
+			if operation == 'set':
+				pbs.extend(pbs_for_set_no_merge(document_path, data))
+			elif operation == 'update':
+				pbs.extend(pbs_for_update(document_path, data, None))
+			else:
+				pbs.append(pb_for_delete(document_path, None))
+
+		req_ref = f"{self._base_url}:commit?key={self._api_key}"
+
+		body = {
+			"writes": [Message.to_dict(pb) for pb in pbs]
+		}
+
+		headers = {"content-type": "application/json; charset=UTF-8"}
+
+		if token:
+			headers["Authorization"] = "Firebase " + token
+
+		try:
+			response = self._requests.post(req_ref, headers=headers, data=self._codec.dumps(body))
+
+			raise_detailed_error(response)
+
+			result['response'] = self._codec.loads(response.content)
+
+		except RequestException as e:
+			result['error'] = e
+
+		return result
+
@@ -15,6 +15,8 @@ from google.api_core.datetime_helpers import DatetimeWithNanoseconds
 def _from_datastore(data):
 	""" Converts a map of Firestore ``data``-s to Python dictionary.
 
+	The ``data`` is left unchanged.
+
 
 	:type data: dict
 	:param data: A map of firestore data.
@@ -23,32 +25,28 @@ def _from_datastore(data):
 	:return: A dictionary of native Python values converted
 		from the ``data``.
 	:rtype: dict
-	"""
-
-	data_to_restructure = data['fields']
 
-	for key, val in data_to_restructure.items():
-
-		if isinstance(val.get('mapValue'), dict):
+	:raises TypeError: For value types that are unsupported.
+	"""
 
-			if val['mapValue'].get('fields', False):
-				data_to_restructure[key] = _from_datastore(val['mapValue'])
-			else:
-				data_to_restructure[key] = {}
+	fields = data.get('fields')
 
-		elif isinstance(val.get('arrayValue'), dict):
-			arr = []
+	if not fields:
+		return {}
 
-			if val['arrayValue'].get('values'):
-				for x in val['arrayValue']['values']:
-					arr.append(_decode_datastore(x))
+	decoded = {}
 
-			data_to_restructure[key] = arr
+	# each value holds a single key naming its type, dispatched to its
+	# decoder inline, as this runs for every value of every document
+	try:
+		for key, value in fields.items():
+			for value_type in value:
+				decoded[key] = _DECODERS[value_type](value[value_type])
 
-		else:
-			data_to_restructure[key] = _decode_datastore(val)
+	except KeyError:
+		raise TypeError("Cannot convert to a Python Value", value, "Invalid type", type(value)) from None
 
-	return data_to_restructure
+	return decoded
 
 
 def _decode_datastore(value):
@@ -63,42 +61,62 @@ def _decode_datastore(value):
 	:return: A native Python value converted from the ``value``.
 	:rtype: :data:`None` or :class:`bool` or :class:`bytes`
 		or :class:`int` or :class:`float` or :class:`str` or
-		:class:`dict` or
+		:class:`dict` or :class:`list` or
 		:class:`~google.api_core.datetime_helpers.DatetimeWithNanoseconds`
 		or  :class:`~google.cloud.firestore_v1._helpers.GeoPoint`.
 
 	:raises TypeError: For value types that are unsupported.
 	"""
 
-	if value.get('nullValue', False) is None:
-		return value['nullValue']
+	for value_type in value:
+		decode = _DECODERS.get(value_type)
 
-	elif value.get('booleanValue') is not None:
-		return bool(value['booleanValue'])
+		if decode is not None:
+			return decode(value[value_type])
 
-	elif value.get('bytesValue'):
-		return b64decode(value['bytesValue'].encode('utf-8'))
+	raise TypeError("Cannot convert to a Python Value", value, "Invalid type", type(value))
 
-	elif value.get('integerValue'):
-		return int(value['integerValue'])
 
-	elif value.get('doubleValue'):
-		return float(value['doubleValue'])
+def _decode_array(array):
+	values = array.get('values')
 
-	elif isinstance(value.get('stringValue'), str):
-		return str(value['stringValue'])
+	if not values:
+		return []
 
-	elif value.get('mapValue'):
-		return _from_datastore(value['mapValue'])
+	decoded = []
 
-	elif value.get('timestampValue'):
-		return DatetimeWithNanoseconds.from_rfc3339(value['timestampValue'])
+	try:
+		for value in values:
+			for value_type in value:
+				decoded.append(_DECODERS[value_type](value[value_type]))
 
-	elif value.get('geoPointValue'):
-		return GeoPoint(float(value['timestampValue']['latitude']), float(value['timestampValue']['longitude']))
+	except KeyError:
+		raise TypeError("Cannot convert to a Python Value", value, "Invalid type", type(value)) from None
+
+	return decoded
+
+
+def _decode_geo_point(geo_point):
+	# zero coordinates are left out of the JSON encoding
+	return GeoPoint(float(geo_point.get('latitude', 0.0)), float(geo_point.get('longitude', 0.0)))
 
-	else:
-		raise TypeError("Cannot convert to a Python Value", value, "Invalid type", type(value))
+
+def _decode_null(null):
+	return None
+
+
+_DECODERS = {
+	'nullValue': _decode_null,
+	'booleanValue': bool,
+	'integerValue': int,
+	'doubleValue': float,
+	'stringValue': str,
+	'bytesValue': b64decode,
+	'timestampValue': DatetimeWithNanoseconds.from_rfc3339,
+	'geoPointValue': _decode_geo_point,
+	'mapValue': _from_datastore,
+	'arrayValue': _decode_array,
+}
 
 
 def _to_datastore(data):
@@ -192,3 +210,22 @@ def _encode_datastore_value(value):
 	else:
 
 		raise TypeError("Cannot convert to a Firestore Value", value, "Invalid type", type(value))
+
+
+def _document_path(document):
+	""" Segments of the path to a document, given as a string or a
+	:class:`~firebase.firestore.Document`.
+	"""
+
+	if isinstance(document, str):
+		path = [segment for segment in document.split("/") if segment]
+
+	# references are used up by each request, the same as Document.set
+	else:
+		path = document._path.copy()
+		document._path.clear()
+
+	if not path or len(path) % 2:
+		raise ValueError("'{0}' is not a path to a document".format("/".join(path)))
+
+	return path
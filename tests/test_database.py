@@ -5,12 +5,25 @@
 # --------------------------------------------------------------------------------------
 
 
+import json
 import time
 import random
 import pytest
+import asyncio
+import threading
+import httpx
 import datetime
+import requests
 from contextlib import contextmanager
 
+from tests.tools import make_db
+from firebase.database import Database, AsyncDatabase
+from firebase.database import server_timestamp
+from firebase.database._stream import Stream
+from firebase.database._db_convert import build_firebase_response
+from firebase.database._backoff import ReconnectBackoff
+from firebase.database._custom_sse_client import SSEClient, _iter_chunks
+
 
 @pytest.fixture(scope='function')
 def db_sa(db):
@@ -40,6 +53,77 @@ def make_append_stream(db):
 		yield s, l
 
 
+class FakeRaw:
+	""" Raw body of a streamed response, read one chunk at a time. """
+
+	def __init__(self, chunks, read1=True, chunked=False):
+		self.chunks = list(chunks)
+		self.chunked = chunked
+		self.sizes = []
+
+		if read1:
+			self.read1 = self._read1
+
+	def _read1(self, size, decode_content=True):
+		self.sizes.append(size)
+
+		chunk = self.chunks.pop(0) if self.chunks else b''
+
+		if isinstance(chunk, Exception):
+			raise chunk
+
+		return chunk
+
+
+class FakeResponse:
+	""" Streamed response made of the given chunks of bytes. """
+
+	def __init__(self, chunks, read1=True, chunked=False):
+		self.raw = FakeRaw(chunks, read1=read1, chunked=chunked)
+		self.chunk_sizes = []
+		self.closed = False
+
+	def iter_content(self, chunk_size=1):
+		self.chunk_sizes.append(chunk_size)
+
+		for chunk in self.raw.chunks:
+			if chunk_size == 1:
+				for i in range(len(chunk)):
+					yield chunk[i:i + 1]
+			else:
+				yield chunk
+
+	def raise_for_status(self):
+		pass
+
+	def close(self):
+		self.closed = True
+
+
+class FakeSession:
+	""" Session returning the given responses, or raising the given
+	exceptions, one per request.
+	"""
+
+	def __init__(self, responses):
+		self.responses = list(responses)
+		self.requests = 0
+
+	def get(self, url, stream=False, **kwargs):
+		self.requests += 1
+
+		response = self.responses.pop(0)
+
+		if isinstance(response, Exception):
+			raise response
+
+		return response
+
+
+def make_sse_client(*responses, **kwargs):
+	return SSEClient('https://example.firebaseio.com/.json', session=FakeSession(responses), build_headers=lambda: {}, **kwargs)
+
+
 class TestSimpleGetAndPut:
 	def test_simple_get(self, db_sa):
 		assert db_sa().get().val() is None
@@ -65,6 +149,19 @@ class TestSimpleGetAndPut:
 		# gives: assert [None, {'11': {'111': 42}}] == {'1': {'11': {'111': 42}}}
 		assert db_sa().get().val() == v
 
+	def test_silent_set(self, db_sa):
+		assert db_sa().set({"a": 1}, silent=True) is None
+		assert db_sa().get().val() == {"a": 1}
+
+		key = db_sa().push("b", silent=True)["name"]
+		assert db_sa().child(key).get().val() == "b"
+
+	def test_server_values(self, db_sa):
+		db_sa().set({"count": 1, "at": server_timestamp()})
+
+		assert db_sa().child("count").increment(2) == 3
+		assert abs(db_sa().child("at").get().val() - time.time() * 1000) < 60000
+
 
 class TestJsonKwargs:
 
@@ -121,6 +218,363 @@ class TestChildNavigation:
 		assert db_sa().child(1, '11', '111').get().val() == 42
 
 
+class TestIterChildren:
+	def test_iter_children(self, db_sa):
+		ref = db_sa()
+		ref.set({'a': 1, 'b': {'c': 2}})
+
+		assert dict(ref.iter_children()) == {'a': 1, 'b': {'c': 2}}
+
+	def test_iter_children_of_primitive(self, db_sa):
+		ref = db_sa()
+		ref.set(1)
+
+		assert list(ref.iter_children()) == []
+
+
+class TestScan:
+	def test_scan_pages(self, db_sa):
+		ref = db_sa()
+		ref.set({'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5})
+
+		assert list(ref.scan(page_size=2)) == [('a', 1), ('b', 2), ('c', 3), ('d', 4), ('e', 5)]
+
+	def test_scan_unsupported_order(self, db_sa):
+		with pytest.raises(ValueError):
+			db_sa().scan(order='value')
+
+
+class TestOrdering:
+	def test_order_by_key_integers_first(self, db_sa):
+		ref = db_sa()
+		ref.set({'b': 1, '10': 2, 'a': 3, '2': 4})
+
+		assert list(ref.order_by_key().get().val()) == ['2', '10', 'a', 'b']
+
+	def test_unordered_keeps_children(self, db_sa):
+		ref = db_sa()
+		ref.set({'b': 1, '10': 2, 'a': 3, '2': 4})
+
+		assert dict(ref.order_by_key().get(ordered=False).val()) == {'b': 1, '10': 2, 'a': 3, '2': 4}
+
+
+class TestFirebaseResponse:
+	def items(self, response):
+		return [(firebase.key(), firebase.val()) for firebase in response.each()]
+
+	def test_list_with_duplicates(self):
+		response = build_firebase_response([1, 2, 1], {}, 'numbers')
+
+		assert [firebase.key() for firebase in response.each()] == [0, 1, 2]
+		assert response.val() == [1, 2, 1]
+
+	def test_matches_eager_conversion(self):
+		# results of the conversion before it was made lazy
+		response = build_firebase_response({'b': 2, 'a': {'c': 1}}, {}, 'root')
+
+		assert response.val() == {'b': 2, 'a': {'c': 1}}
+		assert list(response.val()) == ['b', 'a']
+		assert self.items(build_firebase_response({'b': 2, 'a': {'c': 1}}, {}, 'root')) == [('b', 2), ('a', {'c': 1})]
+
+		response = build_firebase_response(['x', 'y'], {}, 'root')
+
+		assert response.val() == ['x', 'y']
+		assert self.items(build_firebase_response(['x', 'y'], {}, 'root')) == [(0, 'x'), (1, 'y')]
+
+		for primitive in (5, 'text', True, None):
+			response = build_firebase_response(primitive, {}, 'leaf')
+
+			assert response.val() == primitive
+			assert response.each() is None
+			assert response.key() == 'leaf'
+
+	def test_ordered_query(self):
+		data = {'b': 1, 'c': 3, 'a': 2}
+
+		assert list(build_firebase_response(data, {'orderBy': '$value'}, 'root').val()) == ['b', 'a', 'c']
+		assert self.items(build_firebase_response(data, {'orderBy': '$key'}, 'root')) == [('a', 2), ('b', 1), ('c', 3)]
+		assert build_firebase_response(data, {'orderBy': '$key'}, 'root')[0].key() == 'a'
+
+	def test_val_does_not_share_data(self):
+		data = {'a': 1}
+		value = build_firebase_response(data, {}, 'root').val()
+		value['b'] = 2
+
+		assert data == {'a': 1}
+
+
+class TestGetMany:
+	def test_get_many_keeps_order(self, db_sa):
+		ref = db_sa()
+		ref.set({'a': 1, 'b': 2, 'c': 3})
+
+		assert [response.val() for response in ref.get_many(['c', 'a', 'b', 'd'])] == [3, 1, 2, None]
+
+	# bodies served for each path, a broken one and a failed request
+	bodies = {'a': (200, b'1'), 'b': (200, b'{"broken'), 'c': (500, b'{"error": "internal"}'), 'd': (200, b'"d"')}
+
+	def check_results(self, results):
+		assert results[0].val() == 1
+		assert isinstance(results[1], ValueError)
+		assert isinstance(results[2], requests.exceptions.HTTPError)
+		assert results[3].val() == 'd'
+
+	def test_failed_paths_dont_stop_others(self):
+		bodies = self.bodies
+
+		class Session:
+			def get(self, url, headers=None):
+				response = requests.Response()
+				response.url = url
+				response.status_code, response._content = bodies[url.split('/')[-1][0]]
+
+				return response
+
+		db = Database(None, 'https://example.firebaseio.com', Session())
+
+		self.check_results(db.child('root').get_many(['a', 'b', 'c', 'd']))
+
+	def test_async_failed_paths_dont_stop_others(self):
+		def handler(request):
+			status, content = self.bodies[request.url.path.split('/')[-1][0]]
+
+			return httpx.Response(status, content=content)
+
+		async def scenario():
+			async with AsyncDatabase(None, 'https://example.firebaseio.com', None) as adb:
+				await adb.client.aclose()
+				adb.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+				return await adb.child('root').get_many(['a', 'b', 'c', 'd'])
+
+		self.check_results(asyncio.run(scenario()))
+
+
+class TestIncrement:
+	def test_increment_ignores_silent_writes(self):
+		class Session:
+			def __init__(self):
+				self.urls = []
+
+			def request(self, method, url, headers=None, data=None):
+				self.urls.append(url)
+
+				response = requests.Response()
+				response.url = url
+
+				if 'print=silent' in url:
+					response.status_code, response._content = 204, b''
+				else:
+					response.status_code, response._content = 200, b'3'
+
+				return response
+
+		session = Session()
+		db = Database(None, 'https://example.firebaseio.com', session, silent_writes=True)
+
+		assert db.child('counter').increment(2) == 3
+		assert db.increment() == 3
+		assert not any('print=silent' in url for url in session.urls)
+
+
+class TestCache:
+	def test_cache_hit_and_invalidate(self):
+		name = 'test_%05d' % random.randint(0, 99999)
+
+		db = make_db(service_account=True)
+		cache = db.enable_cache(ttl=60)
+		ref = db.child('firebase_tests', name)
+
+		ref.set({'a': 1})
+
+		assert ref.get().val() == {'a': 1}
+		assert ref.get().val() == {'a': 1}
+		assert cache.stats()['hits'] == 1
+
+		ref.child('a').set(2)
+
+		assert ref.get().val() == {'a': 2}
+
+	def test_cache_revalidate(self):
+		name = 'test_%05d' % random.randint(0, 99999)
+
+		db = make_db(service_account=True)
+		cache = db.enable_cache(ttl=0)
+		ref = db.child('firebase_tests', name)
+
+		ref.set({'a': 1})
+
+		assert ref.get().val() == {'a': 1}
+		assert ref.get().val() == {'a': 1}
+
+		# the server either honours if-none-match with a 304, or sends
+		# the data again with the same ETag
+		stats = cache.stats()
+
+		assert stats['hits'] == 0
+		assert stats['misses'] == 1
+		assert stats['revalidations'] + stats['unchanged'] == 1
+
+	def make_etag_session(self, honour_if_none_match):
+		class Session:
+			def __init__(self):
+				self.sent = []
+
+			def get(self, url, headers=None):
+				self.sent.append(dict(headers))
+
+				response = requests.Response()
+				response.url = url
+				response.headers['ETag'] = 'etag-1'
+
+				if honour_if_none_match and headers.get('if-none-match') == 'etag-1':
+					response.status_code, response._content = 304, b''
+				else:
+					response.status_code, response._content = 200, b'{"a": 1}'
+
+				return response
+
+		return Session()
+
+	def test_cache_304_revalidation(self):
+		session = self.make_etag_session(honour_if_none_match=True)
+		db = Database(None, 'https://example.firebaseio.com', session)
+		cache = db.enable_cache(ttl=0)
+
+		assert db.child('root').get().val() == {'a': 1}
+		assert db.child('root').get().val() == {'a': 1}
+
+		assert session.sent[1]['if-none-match'] == 'etag-1'
+		assert cache.stats()['misses'] == 1
+		assert cache.stats()['revalidations'] == 1
+		assert cache.stats()['unchanged'] == 0
+
+	def test_cache_same_etag_without_304(self):
+		session = self.make_etag_session(honour_if_none_match=False)
+		db = Database(None, 'https://example.firebaseio.com', session)
+		cache = db.enable_cache(ttl=0)
+
+		assert db.child('root').get().val() == {'a': 1}
+		assert db.child('root').get().val() == {'a': 1}
+
+		assert cache.stats()['misses'] == 1
+		assert cache.stats()['revalidations'] == 0
+		assert cache.stats()['unchanged'] == 1
+
+	def test_write_during_read_is_not_cached(self):
+		class Session:
+			def __init__(self):
+				self.data = {'a': 1}
+				self.on_get = None
+
+			def get(self, url, headers=None):
+				content = json.dumps(self.data).encode()
+
+				# the write completes while the read is running
+				if self.on_get is not None:
+					self.on_get, on_get = None, self.on_get
+					on_get()
+
+				response = requests.Response()
+				response.url = url
+				response.status_code, response._content = 200, content
+
+				return response
+
+			def request(self, method, url, headers=None, data=None):
+				self.data['a'] = json.loads(data)
+
+				response = requests.Response()
+				response.url = url
+				response.status_code, response._content = 200, data
+
+				return response
+
+		session = Session()
+		db = Database(None, 'https://example.firebaseio.com', session)
+		cache = db.enable_cache(ttl=60)
+
+		session.on_get = lambda: db.child('root', 'a').set(2)
+
+		# the response predates the write, so it is served but not cached
+		assert db.child('root').get().val() == {'a': 1}
+		assert len(cache) == 0
+
+		assert db.child('root').get().val() == {'a': 2}
+		assert db.child('root').get().val() == {'a': 2}
+		assert cache.stats()['hits'] == 1
+
+
+class TestBatch:
+	def test_batch_commit(self, db_sa):
+		ref = db_sa()
+
+		with ref.batch() as batch:
+			batch.set('a/name', 'A')
+			batch.update('b', {'name': 'B', 'age': 2})
+			batch.remove('c')
+
+		assert all(result['error'] is None for result in batch.results)
+		assert ref.get().val() == {'a': {'name': 'A'}, 'b': {'name': 'B', 'age': 2}}
+
+	def test_batch_chunks(self, db_sa):
+		ref = db_sa()
+
+		results = ref.update_many({str(i): i for i in range(10)}, max_writes=3)
+
+		assert len(results) == 4
+		assert ref.get().val() == list(range(10))
+
+
+class TestReference:
+	def test_child_does_not_mutate_reference(self, db_sa):
+		ref = db_sa()
+		child = ref.child('lorem')
+
+		assert child.path == ref.path + '/lorem'
+		assert ref.child('ipsum').path == ref.path + '/ipsum'
+
+	def test_query_does_not_mutate_reference(self, db_sa):
+		ref = db_sa()
+		query = ref.order_by_key().limit_to_first(1)
+
+		assert dict(query.query) == {'orderBy': '$key', 'limitToFirst': 1}
+		assert len(ref.query) == 0
+
+	def test_reuse_reference(self, db_sa):
+		ref = db_sa()
+		ref.set({'a': 1, 'b': 2})
+
+		query = ref.order_by_key().limit_to_first(1)
+
+		assert query.get().val() == {'a': 1}
+		assert query.get().val() == {'a': 1}
+		assert ref.get().val() == {'a': 1, 'b': 2}
+
+
+class TestTokenCache:
+	def test_headers_are_reused(self):
+		db = make_db(service_account=True)
+
+		headers = db.build_headers()
+		headers['x-test'] = '1'
+
+		assert 'x-test' not in db.build_headers()
+		assert db.build_headers()['Authorization'] == headers['Authorization']
+		assert db.token_cache.stats()['refreshes'] == 1
+
+
+class TestGenerateKeys:
+	def test_generate_keys(self):
+		db = make_db(service_account=True)
+		keys = db.generate_keys(1000)
+
+		assert keys == sorted(keys)
+		assert len(set(keys)) == 1000
+		assert db.generate_key() > keys[-1]
+		assert abs(db.key_timestamp(keys[0]) - time.time() * 1000) < 60000
+
+
 class TestStreaming:
 	def test_create_stream_succeed(self, db_sa):
 		with make_append_stream(db_sa()) as (stream, l):
@@ -151,6 +605,259 @@ class TestStreaming:
 				assert len(l) == 3
 				assert l[0]["data"] == testdata
 
+	def test_coalesces_patches(self, db_sa):
+		batches = []
+
+		db_sa().set({"n": 0})
+
+		stream = db_sa().stream(batches.append, coalesce_window=1)
+
+		try:
+			time.sleep(2)
+
+			for i in range(1, 6):
+				db_sa().update({"n": i})
+
+			time.sleep(3)
+
+		finally:
+			stream.close()
+
+		events = [event for batch in batches for event in batch]
+
+		assert events[-1]["data"] == {"n": 5}
+		assert len(events) < 6
+		assert stream.stats()['received'] == 6
+
+
+class TestSSEClient:
+	events = (
+		'event: put\ndata: {"path": "/", "data": {"name": "Caf\u00e9 \u20ac"}}\n\n'
+		'event: patch\r\ndata: {"path": "/a", "data": {"b": 1}}\r\n\r\n'
+		'event: put\ndata: {"path": "/c", "data": "\U0001f525"}\n\n'
+	).encode('utf-8')
+
+	expected = [
+		('put', '{"path": "/", "data": {"name": "Caf\u00e9 \u20ac"}}'),
+		('patch', '{"path": "/a", "data": {"b": 1}}'),
+		('put', '{"path": "/c", "data": "\U0001f525"}'),
+	]
+
+	def read_events(self, chunks):
+		client = make_sse_client(FakeResponse(chunks))
+
+		return [(event.event, event.data) for event in (next(client) for _ in self.expected)]
+
+	def test_event_split_across_chunks(self):
+		client = make_sse_client(FakeResponse([b'event: put\ndata: {"pa', b'th": "/", ', b'"data": 1}\n\n']))
+		event = next(client)
+
+		assert (event.event, event.data) == ('put', '{"path": "/", "data": 1}')
+
+	def test_every_split_point(self):
+		# covers separators and multibyte characters split between chunks
+		for i in range(1, len(self.events)):
+			assert self.read_events([self.events[:i], self.events[i:]]) == self.expected
+
+	def test_byte_by_byte(self):
+		assert self.read_events([self.events[i:i + 1] for i in range(len(self.events))]) == self.expected
+
+	def test_split_separators(self):
+		client = make_sse_client(FakeResponse([b'event: put\r\ndata: 1\r\n\r', b'\nevent: put\ndata: 2\n', b'\nevent: put\ndata: 3\r\n', b'\r\n']))
+
+		assert [next(client).data for _ in range(3)] == ['1', '2', '3']
+
+	def test_keep_alive_and_cancel(self):
+		client = make_sse_client(FakeResponse([b'event: keep-alive\ndata: null\n\nevent: cancel\ndata: null\n\n']))
+
+		assert next(client) is None
+
+		event = next(client)
+
+		assert (event.event, event.data) == ('cancel', 'null')
+
+	def test_auth_revoked_reconnects(self):
+		headers = []
+
+		def build_headers():
+			headers.append(len(headers))
+			return {}
+
+		session = FakeSession([
+			FakeResponse([b'event: auth_revoked\ndata: credential is no longer valid\n\n']),
+			FakeResponse([b'event: put\ndata: {"path": "/", "data": 1}\n\n']),
+		])
+		client = SSEClient('https://example.firebaseio.com/.json', session=session, build_headers=build_headers)
+
+		assert next(client) is None
+		assert next(client).data == '{"path": "/", "data": 1}'
+		assert session.requests == 2
+		assert len(headers) == 2
+
+	def test_retry_and_id(self):
+		client = make_sse_client(FakeResponse([b'id: 7\nretry: 10\ndata: 1\n\n']))
+
+		assert next(client).data == '1'
+		assert (client.last_id, client.retry) == ('7', 10)
+
+	def test_iter_chunks_read1(self):
+		response = FakeResponse([b'ab', b'cde'])
+
+		assert list(_iter_chunks(response, 1024)) == [b'ab', b'cde']
+		assert response.raw.sizes == [1024, 1024, 1024]
+		assert response.chunk_sizes == []
+
+	def test_iter_chunks_read1_error(self):
+		response = FakeResponse([b'ab', OSError('reset')])
+		chunks = _iter_chunks(response, 1024)
+
+		assert next(chunks) == b'ab'
+
+		with pytest.raises(requests.exceptions.ConnectionError):
+			next(chunks)
+
+	def test_iter_chunks_chunked(self):
+		response = FakeResponse([b'ab', b'cde'], chunked=True)
+
+		assert list(_iter_chunks(response, 1024)) == [b'ab', b'cde']
+		assert response.chunk_sizes == [1024]
+
+	def test_iter_chunks_without_read1(self):
+		response = FakeResponse([b'ab', b'c'], read1=False)
+
+		assert list(_iter_chunks(response, 1024)) == [b'a', b'b', b'c']
+		assert response.chunk_sizes == [1]
+
+
+class TestReconnectBackoff:
+	def test_exponential_growth_up_to_cap(self):
+		backoff = ReconnectBackoff(max_retry=10000, jitter=False)
+
+		assert [backoff.delay(1000, attempt) for attempt in range(6)] == [1, 2, 4, 8, 10, 10]
+		assert backoff.delay(1000, 10 ** 6) == 10
+
+	def test_jitter_within_delay(self):
+		backoff = ReconnectBackoff(max_retry=8000)
+		random.seed(1)
+
+		for attempt in range(6):
+			delays = [backoff.delay(1000, attempt) for _ in range(200)]
+
+			assert all(0 <= delay <= min(1000 * 2 ** attempt, 8000) / 1000 for delay in delays)
+			assert len(set(delays)) > 1
+
+	def test_shared_rate_limit(self):
+		# a tenth of a second between attempts, whichever stream makes them
+		backoff = ReconnectBackoff(jitter=False, max_reconnects_per_minute=600)
+
+		delays = [backoff.delay(0, 0) for _ in range(4)]
+
+		for i, delay in enumerate(delays):
+			assert abs(delay - 0.1 * i) < 0.05
+
+	def test_reconnect_stats(self):
+		partial = b'event: put\ndata: {"pa'
+
+		session = FakeSession([
+			FakeResponse([b'event: put\ndata: {"path": "/", "data": 1}\n\n' + partial]),
+			requests.exceptions.ConnectionError('refused'),
+			FakeResponse([b'event: put\ndata: {"path": "/", "data": 2}\n\nevent: cancel\ndata: null\n\n']),
+		])
+
+		class FakeStream(Stream):
+			def make_session(self):
+				return session
+
+		events = []
+		reconnects = []
+
+		stream = FakeStream('https://example.firebaseio.com/.json', events.append, lambda: {}, None, False, backoff=ReconnectBackoff(max_retry=1, jitter=False), on_reconnect=reconnects.append)
+
+		assert [event['data'] for event in events] == [1, 2, None]
+		assert events[-1]['event'] == 'cancel'
+
+		assert len(reconnects) == 1
+		assert reconnects[0]['reconnects'] == 1
+		assert reconnects[0]['attempts'] == 2
+		assert reconnects[0]['discarded_bytes'] == len(partial)
+		assert isinstance(reconnects[0]['error'], requests.exceptions.ConnectionError)
+
+		stats = stream.stats()
+
+		assert stats['reconnects'] == 1
+		assert stats['discarded_bytes'] == len(partial)
+		assert stats['reconnect_seconds'] == reconnects[0]['seconds']
+		assert 0 <= stats['reconnect_seconds'] < 1
+
+
+class TestMirror:
+	def test_mirror_applies_updates(self, db_sa):
+		db_sa().set({"a": {"b": 1}})
+
+		with db_sa().mirror() as mirror:
+			assert mirror.wait(5)
+			assert mirror.get("a/b") == 1
+
+			db_sa().child("a").update({"c": 2})
+			db_sa().child("a").child("b").remove()
+			time.sleep(2)
+
+			assert mirror.snapshot() == {"a": {"c": 2}}
+
+
+class TestStreamManager:
+	def test_responds_to_update_calls(self, db_sa):
+		l = []
+
+		with make_db(service_account=True).stream_manager(max_workers=2) as manager:
+			manager.stream(db_sa(), l.append, stream_id='managed')
+			time.sleep(2)
+
+			db_sa().set({"1": "a"})
+			time.sleep(2)
+
+			assert l[-1]["data"] == {"1": "a"}
+			assert l[-1]["stream_id"] == 'managed'
+			assert manager.stats()['connected'] == 1
+
+	def test_reconnects_after_any_error(self):
+		events = []
+		cancelled = threading.Event()
+
+		def handler(msg):
+			events.append(msg)
+
+			if msg['event'] == 'cancel':
+				cancelled.set()
+
+		attempts = []
+
+		def build_headers(token=None):
+			attempts.append(token)
+
+			if len(attempts) == 1:
+				raise OSError("headers failed")
+
+			return {}
+
+		def respond(request):
+			return httpx.Response(200, content=b'event: put\ndata: 5\n\nevent: cancel\ndata: null\n\n')
+
+		db = Database(None, 'https://example.firebaseio.com', requests.Session())
+		db.build_headers = build_headers
+
+		with db.stream_manager(backoff=ReconnectBackoff(max_retry=10)) as manager:
+			asyncio.run_coroutine_threadsafe(manager._client.aclose(), manager._loop).result()
+			manager._client = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+
+			stream = manager.stream(db.child('root'), handler)
+
+			assert cancelled.wait(5)
+
+		assert len(attempts) == 2
+		assert isinstance(stream.last_error, OSError)
+		assert events[0] == {'path': None, 'data': 5, 'event': 'put'}
+
 
 class TestConditionalRequest:
 	def test_conditional_set_succeed(self, db_sa):
@@ -176,3 +883,46 @@ class TestConditionalRequest:
 		result = db_sa().conditional_remove(etag)
 
 		assert 'ETag' in result
+
+	def test_transaction_under_contention(self, db_sa):
+		db_sa().child('counter').set(0)
+
+		def increment():
+			for _ in range(5):
+				db_sa().child('counter').transaction(lambda value: (value or 0) + 1)
+
+		threads = [threading.Thread(target=increment) for _ in range(4)]
+
+		for thread in threads:
+			thread.start()
+
+		for thread in threads:
+			thread.join()
+
+		assert db_sa().child('counter').get().val() == 20
+
+
+class TestAsyncDatabase:
+	def test_concurrent_set_then_get(self):
+		name = 'test_%05d' % random.randint(0, 99999)
+
+		async def scenario():
+			async with make_db(service_account=True, is_async=True) as adb:
+				await asyncio.gather(*[adb.child('firebase_tests', name, str(i)).set(i) for i in range(10)])
+
+				responses = await asyncio.gather(*[adb.child('firebase_tests', name, str(i)).get() for i in range(10)])
+
+				return [response.val() for response in responses]
+
+		assert asyncio.run(scenario()) == list(range(10))
+
+	def test_conditional_set_fail(self):
+		name = 'test_%05d' % random.randint(0, 99999)
+
+		async def scenario():
+			async with make_db(service_account=True, is_async=True) as adb:
+				etag = await adb.child('firebase_tests', name).get_etag()
+
+				return await adb.child('firebase_tests', name).conditional_set({'1': 'a'}, '{}123'.format(etag))
+
+		assert 'ETag' in asyncio.run(scenario())
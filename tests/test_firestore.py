@@ -80,6 +80,13 @@ class TestFirestoreAdmin:
 		assert ds_admin.collection('Marvels').document('Movies').collection('PhaseOne').where('lead.name', 'in',  ['Benedict Cumberbatch', 'Robert Downey Jr.']).get() == [{'001': self.__class__.movies1}]
 		assert ds_admin.collection('Marvels').document('Movies').collection('PhaseOne').where('rating', '<=', 8.0).order_by('rating', direction='DESCENDING').get() == [{'001': self.__class__.movies1}, {self.__class__.auto_doc_id: self.__class__.movies2}]
 
+	def test_collection_stream(self, ds_admin):
+		assert list(ds_admin.collection('Marvels').document('Movies').collection('PhaseOne').where('rating', '<=', 8.0).order_by('rating', direction='DESCENDING').stream()) == [{'001': self.__class__.movies1}, {self.__class__.auto_doc_id: self.__class__.movies2}]
+		assert list(ds_admin.collection('Marvels').document('Movies').collection('PhaseOne').order_by('rating').limit_to_last(1).stream()) == [{'001': self.__class__.movies1}]
+
+	def test_collection_paginate(self, ds_admin):
+		assert list(ds_admin.collection('Marvels').document('Movies').collection('PhaseOne').where('rating', '<=', 8.0).order_by('rating', direction='DESCENDING').paginate(1)) == [[{'001': self.__class__.movies1}], [{self.__class__.auto_doc_id: self.__class__.movies2}]]
+
 	def test_manual_doc_update(self, ds_admin):
 		update_data = {'released': True}
 
@@ -89,10 +96,28 @@ class TestFirestoreAdmin:
 		assert ds_admin.collection('Marvels').document('Movies').collection('PhaseOne').document(self.__class__.auto_doc_id).update(update_data) is None
 		assert ds_admin.collection('Marvels').document('Movies').collection('PhaseOne').document(self.__class__.auto_doc_id).get(field_paths=['released']) == update_data
 
+	def test_get_all(self, ds_admin):
+		assert ds_admin.get_all(['Marvels/Movies/PhaseOne/001', 'Marvels/Movies/PhaseOne/000', ds_admin.collection('Marvels').document('Movies').collection('PhaseOne').document(self.__class__.auto_doc_id)], field_paths=['name']) == [{'name': self.__class__.movies1['name']}, None, {'name': self.__class__.movies2['name']}]
+
 	def test_manual_doc_get_filtered(self, ds_admin):
 		assert ds_admin.collection('Marvels').document('Movies').collection('PhaseOne').document('001').get(field_paths=['name']) == {'name': self.__class__.movies1['name']}
 		assert ds_admin.collection('Marvels').document('Movies').collection('PhaseOne').document(self.__class__.auto_doc_id).get(field_paths=['name']) == {'name': self.__class__.movies2['name']}
 
+	def test_batch_write(self, ds_admin):
+		with ds_admin.batch() as batch:
+			batch.set('Marvels/Movies/PhaseTwo/001', {'name': 'Iron Man 3', 'released': False})
+			batch.set(ds_admin.collection('Marvels').document('Movies').collection('PhaseTwo').document('002'), {'name': 'Thor: The Dark World'})
+			batch.update('Marvels/Movies/PhaseTwo/001', {'released': True})
+
+		assert [result['error'] for result in batch.results] == [None]
+		assert ds_admin.collection('Marvels').document('Movies').collection('PhaseTwo').document('001').get() == {'name': 'Iron Man 3', 'released': True}
+
+		with ds_admin.batch() as batch:
+			batch.delete('Marvels/Movies/PhaseTwo/001').delete('Marvels/Movies/PhaseTwo/002')
+
+		assert [result['error'] for result in batch.results] == [None]
+		assert ds_admin.collection('Marvels').document('Movies').collection('PhaseTwo').list_of_documents() == []
+
 	def test_manual_doc_delete(self, ds_admin):
 		assert ds_admin.collection('Marvels').document('Movies').collection('PhaseOne').document('001').delete() is None
 		assert ds_admin.collection('Marvels').document('Movies').collection('PhaseOne').document(self.__class__.auto_doc_id).delete() is None
@@ -186,6 +211,9 @@ class TestFirestoreAuth:
 		assert ds.collection('Marvels').document('Movies').collection('PhaseThree').where('lead.name', 'in',  ['Benedict Cumberbatch', 'Robert Downey Jr.']).get(token=self.__class__.user.get('idToken')) == [{'014': self.__class__.movies1}]
 		assert ds.collection('Marvels').document('Movies').collection('PhaseThree').where('rating', '<=', 8.0).order_by('rating', direction='DESCENDING').get(token=self.__class__.user.get('idToken')) == [{'014': self.__class__.movies1}, {self.__class__.auto_doc_id: self.__class__.movies2}]
 
+	def test_collection_stream(self, ds):
+		assert list(ds.collection('Marvels').document('Movies').collection('PhaseThree').where('rating', '<=', 8.0).order_by('rating', direction='DESCENDING').stream(token=self.__class__.user.get('idToken'))) == [{'014': self.__class__.movies1}, {self.__class__.auto_doc_id: self.__class__.movies2}]
+
 	def test_manual_doc_update(self, ds):
 		update_data = {'released': True}
 
@@ -245,6 +273,9 @@ class TestFirestore:
 	def test_collection_list_documents(self, ds):
 		assert ds.collection('Marvels').document('Series').collection('PhaseFour').list_of_documents() == ['003', self.__class__.auto_doc_id]
 
+	def test_get_all(self, ds):
+		assert ds.get_all(['Marvels/Series/PhaseFour/003', 'Marvels/Series/PhaseFour/000', ds.collection('Marvels').document('Series').collection('PhaseFour').document(self.__class__.auto_doc_id)], field_paths=['name']) == [{'name': self.__class__.series1['name']}, None, {'name': self.__class__.series2['name']}]
+
 	def test_manual_doc_get_filtered(self, ds):
 		assert ds.collection('Marvels').document('Series').collection('PhaseFour').document('003').get(field_paths=['name']) == {'name': self.__class__.series1['name']}
 		assert ds.collection('Marvels').document('Series').collection('PhaseFour').document(self.__class__.auto_doc_id).get(field_paths=['name']) == {'name': self.__class__.series2['name']}
@@ -282,6 +313,14 @@ class TestFirestore:
 		assert ds.collection('Marvels').document('Series').collection('PhaseFour').where('lead.name', 'in',  ['Benedict Cumberbatch', 'Robert Downey Jr.']).get() == []
 		assert ds.collection('Marvels').document('Series').collection('PhaseFour').where('rating', '<=', 8.0).get() == [{self.__class__.auto_doc_id: self.__class__.series2}]
 
+	def test_collection_stream(self, ds):
+		assert list(ds.collection('Marvels').document('Series').collection('PhaseFour').where('rating', '<=', 8.0).stream()) == [{self.__class__.auto_doc_id: self.__class__.series2}]
+		assert list(ds.collection('Marvels').document('Series').collection('PhaseFour').order_by('rating').limit_to_last(1).stream()) == [{'003': self.__class__.series1}]
+
+	def test_collection_paginate(self, ds):
+		assert list(ds.collection('Marvels').document('Series').collection('PhaseFour').order_by('rating').paginate(1)) == [[{self.__class__.auto_doc_id: self.__class__.series2}], [{'003': self.__class__.series1}]]
+		assert list(ds.collection('Marvels').document('Series').collection('PhaseFour').where('rating', '>=', 7.0).paginate(2)) == [[{self.__class__.auto_doc_id: self.__class__.series2}, {'003': self.__class__.series1}]]
+
 	def test_manual_doc_update(self, ds):
 		update_data = {'released': True}
 
@@ -291,6 +330,28 @@ class TestFirestore:
 		assert ds.collection('Marvels').document('Series').collection('PhaseFour').document(self.__class__.auto_doc_id).update(update_data) is None
 		assert ds.collection('Marvels').document('Series').collection('PhaseFour').document(self.__class__.auto_doc_id).get(field_paths=['released']) == update_data
 
+	def test_batch_write(self, ds):
+		with ds.batch() as batch:
+			batch.set('Marvels/Series/PhaseFive/001', {'name': 'Echo', 'released': False})
+			batch.set(ds.collection('Marvels').document('Series').collection('PhaseFive').document('002'), {'name': 'Daredevil: Born Again'})
+			batch.update('Marvels/Series/PhaseFive/001', {'released': True})
+
+		assert [result['error'] for result in batch.results] == [None]
+		assert ds.collection('Marvels').document('Series').collection('PhaseFive').document('001').get() == {'name': 'Echo', 'released': True}
+
+		with ds.batch() as batch:
+			batch.delete('Marvels/Series/PhaseFive/001').delete('Marvels/Series/PhaseFive/002')
+
+		assert [result['error'] for result in batch.results] == [None]
+		assert ds.collection('Marvels').document('Series').collection('PhaseFive').list_of_documents() == []
+
+	def test_zero_values(self, ds):
+		zeros = {'episodes': 0, 'rating': 0.0, 'poster': b'', 'cast': [], 'crew': {'producers': [0]}}
+
+		assert ds.collection('Marvels').document('Series').collection('PhaseFour').document('004').set(zeros) is None
+		assert ds.collection('Marvels').document('Series').collection('PhaseFour').document('004').get() == zeros
+		assert ds.collection('Marvels').document('Series').collection('PhaseFour').document('004').delete() is None
+
 	def test_manual_doc_delete(self, ds):
 		assert ds.collection('Marvels').document('Series').collection('PhaseFour').document('003').delete() is None
 		assert ds.collection('Marvels').document('Series').collection('PhaseFour').document(self.__class__.auto_doc_id).delete() is None
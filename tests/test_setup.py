@@ -5,8 +5,12 @@
 # --------------------------------------------------------------------------------------
 
 
+import json
 import pytest
+from decimal import Decimal
 
+from firebase import initialize_app
+from firebase._json_codec import JSONCodec, get_json_codec
 from tests.tools import initiate_app_with_service_account_file, make_auth, make_db, make_storage
 
 
@@ -48,3 +52,72 @@ def test_setup_storage_admin():
 	storage = make_storage(True)
 
 	assert storage.list_files()
+
+
+class TestJsonCodec:
+	data = {'name': 'Caf\u00e9', 'count': 2, 'ratio': 0.5, 'tags': ['a', None, True]}
+
+	def test_json(self):
+		codec = get_json_codec('json')
+
+		assert type(codec) is JSONCodec
+		assert get_json_codec(None).name == 'json'
+		assert codec.loads(codec.dumps(self.data)) == self.data
+
+	def test_orjson(self):
+		pytest.importorskip('orjson')
+
+		codec = get_json_codec('orjson')
+
+		assert codec.name == 'orjson'
+		assert isinstance(codec.dumps(self.data), bytes)
+		assert codec.loads(codec.dumps(self.data)) == self.data
+
+		# integers beyond 64 bits are left to the standard module
+		assert codec.loads(codec.dumps({'big': 2 ** 70})) == {'big': 2 ** 70}
+
+	def test_auto(self):
+		pytest.importorskip('orjson')
+
+		assert get_json_codec('auto').name == 'orjson'
+
+	def test_json_kwargs_use_standard_module(self):
+		codec = get_json_codec('auto')
+
+		assert codec.loads(b'{"ratio": 0.5}', parse_float=Decimal) == {'ratio': Decimal('0.5')}
+		assert codec.dumps(self.data, indent=2, sort_keys=True) == json.dumps(self.data, indent=2, sort_keys=True).encode('utf-8')
+
+	def test_custom(self):
+		codec = get_json_codec(json)
+
+		assert codec.name == 'custom'
+		assert codec.dumps(self.data) == json.dumps(self.data).encode('utf-8')
+		assert codec.loads(b'{"ratio": 0.5}', parse_float=Decimal) == {'ratio': Decimal('0.5')}
+
+		instance = JSONCodec()
+		assert get_json_codec(instance) is instance
+
+	def test_unsupported(self):
+		with pytest.raises(ValueError) as exc_info:
+			get_json_codec('simplejson')
+		assert "Unsupported JSON codec 'simplejson'" in str(exc_info.value)
+
+		with pytest.raises(ValueError):
+			get_json_codec(object())
+
+	def test_config_reaches_services(self):
+		pytest.importorskip('orjson')
+
+		app = initialize_app({
+			'apiKey': 'key',
+			'authDomain': 'example.firebaseapp.com',
+			'databaseURL': 'https://example.firebaseio.com',
+			'projectId': 'example',
+			'storageBucket': 'example.appspot.com',
+			'jsonCodec': 'orjson',
+		})
+
+		assert app.codec.name == 'orjson'
+		assert app.database().codec is app.codec
+		assert app.auth().codec is app.codec
+		assert app.firestore()._codec is app.codec
@@ -22,13 +22,13 @@ def make_auth(service_account=False):
 	return initialize_app(c).auth()
 
 
-def make_db(service_account=False):
+def make_db(service_account=False, is_async=False):
 	if service_account:
 		c = config.SERVICE_CONFIG
 	else:
 		c = config.SIMPLE_CONFIG
 
-	return initialize_app(c).database()
+	return initialize_app(c).database(is_async=is_async)
 
 
 def make_ds(service_account=False):